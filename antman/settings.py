@@ -76,6 +76,9 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    # 요청별 처리 시간 예산 (REQUEST_DEADLINE_SECONDS / REQUEST_DEADLINE_ROUTES)
+    # 세션 저장 등 응답 단계의 DB 쓰기가 만료된 예산에 막히지 않도록 가장 안쪽에 둔다
+    'core.middleware.deadline.DeadlineMiddleware',
 ]
 
 ROOT_URLCONF = 'antman.urls'
@@ -160,3 +163,9 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Auth 사용자 모델 설정
 AUTH_USER_MODEL = 'users.User'
+
+# 요청 처리 시간 예산 (core.middleware.deadline.DeadlineMiddleware)
+# 경로 접두사별 예산: {'/api/reports/': 120}
+REQUEST_DEADLINE_SECONDS = 30
+REQUEST_DEADLINE_MAX_SECONDS = 300
+REQUEST_DEADLINE_ROUTES = {}
@@ -66,3 +66,6 @@ LOGGING = {
         },
     },
 }
+
+# 테스트에서 코드 품질 결과 캐시 비활성화
+CODE_QUALITY_CACHE = False
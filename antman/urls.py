@@ -42,4 +42,5 @@ urlpatterns = [
     path('', home, name='home'),  # 홈페이지 URL 추가
     path('admin/', admin.site.urls),
     path('health/', health_check, name='health_check'),
+    path('code-generation/', include('core.code_generation.urls')),
 ]
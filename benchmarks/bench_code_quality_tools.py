@@ -0,0 +1,65 @@
+"""
+Per-snippet latency of CodeFormatter and ImportSorter.
+
+Compares the command-line fallback (a temporary file and a black/isort
+process per call) with the in-process engine (black.format_str and
+isort.code with cached Mode/Config objects), using the module-level
+convenience functions' pattern of a new tool instance per call.
+
+Usage:
+    python benchmarks/bench_code_quality_tools.py [--snippets N] [--sample N]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.code_quality.tools import CodeFormatter, ImportSorter  # noqa: E402
+
+
+SNIPPET = '''import sys
+import os
+from typing import Dict,List
+
+
+def summarize(rows:List[Dict[str,int]],key='total'):
+    totals={}
+    for row in rows:
+        totals[row['name']]=totals.get(row['name'],0)+row[key]
+    return sorted(totals.items(),key=lambda item:item[1],reverse=True)
+'''
+
+
+def latencies(in_process, count):
+    timings = []
+    for index in range(count):
+        snippet = SNIPPET.replace('summarize', f'summarize_{index}')
+        start = time.perf_counter()
+        code = ImportSorter(in_process=in_process).sort_imports(snippet)
+        CodeFormatter(in_process=in_process).format_code(code)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--snippets', type=int, default=500, help='Snippets formatted in process')
+    parser.add_argument('--sample', type=int, default=20, help='Snippets formatted through subprocesses')
+    args = parser.parse_args()
+
+    latencies(True, 1)  # warm up black's and isort's caches
+    rows = [
+        ('subprocess fallback', latencies(False, args.sample)),
+        ('in-process engine', latencies(True, args.snippets)),
+    ]
+    for label, timings in rows:
+        print(f"{label:<20} median {statistics.median(timings) * 1000:8.2f} ms  "
+              f"p95 {sorted(timings)[int(len(timings) * 0.95) - 1] * 1000:8.2f} ms  ({len(timings)} snippets)")
+    print(f"{'speedup (median)':<20} {statistics.median(rows[0][1]) / statistics.median(rows[1][1]):8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
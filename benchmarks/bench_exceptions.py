@@ -0,0 +1,57 @@
+"""
+Microbenchmarks for the Antman exception hierarchy.
+
+Measures construct, construct+raise+catch and construct+to_dict for the
+exceptions used on validation-heavy paths (bulk imports, serializers).
+
+Usage:
+    python benchmarks/bench_exceptions.py [--number N]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.error_handling.exceptions import (  # noqa: E402
+    AntmanBaseException,
+    ValidationError,
+    ResourceNotFoundError,
+)
+
+
+def construct():
+    ValidationError("Invalid value")
+
+
+def construct_raise_catch():
+    try:
+        raise ValidationError("Invalid value", field_errors={'email': ['Invalid email format']})
+    except AntmanBaseException:
+        pass
+
+
+def construct_to_dict():
+    ResourceNotFoundError("User not found", resource_type="User", resource_id=1).to_dict()
+
+
+BENCHMARKS = [
+    ('construct', construct),
+    ('construct+raise+catch', construct_raise_catch),
+    ('construct+to_dict', construct_to_dict),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--number', type=int, default=200_000, help='Iterations per benchmark')
+    args = parser.parse_args()
+
+    for name, func in BENCHMARKS:
+        best = min(timeit.repeat(func, number=args.number, repeat=5))
+        print(f"{name:<24} {best / args.number * 1e9:8.1f} ns/op")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Per-file cost of formatting generated modules.
+
+Compares CodeQualityManager.process_code (isort, black and two ruff
+subprocesses plus temporary files per module) with the in-process
+CodeFormattingStage (isort and black as libraries, one ruff run per batch)
+on a run of generated models, views and serializers.
+
+The subprocess path is slow, so it is timed on a sample and reported per
+file.
+
+Usage:
+    python benchmarks/bench_formatting.py [--modules N] [--sample N]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'antman.test_settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from core.code_generation.formatting import CodeFormattingStage  # noqa: E402
+from core.code_generation.generators import CodeGeneratorManager, build_crud_configs  # noqa: E402
+from core.code_quality.tools import CodeQualityManager  # noqa: E402
+
+
+def generated_modules(count):
+    manager = CodeGeneratorManager()
+    modules = []
+    index = 0
+    while len(modules) < count:
+        configs = build_crud_configs({
+            'name': f'Model{index}',
+            'fields': [
+                {'name': 'title', 'type': 'CharField', 'max_length': 200},
+                {'name': 'price', 'type': 'DecimalField'},
+                {'name': 'created_at', 'type': 'DateTimeField', 'auto_now_add': True},
+            ]
+        }, 'shop')
+        for kind, config in configs.items():
+            modules.append(manager.generate_code(kind, config))
+        index += 1
+    return modules[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--modules', type=int, default=1000, help='Generated modules to format')
+    parser.add_argument('--sample', type=int, default=20, help='Modules timed through subprocesses')
+    args = parser.parse_args()
+
+    modules = generated_modules(args.modules)
+
+    quality = CodeQualityManager()
+    start = time.perf_counter()
+    for code in modules[:args.sample]:
+        quality.process_code(code)
+    subprocess_per_file = (time.perf_counter() - start) / args.sample
+
+    stage = CodeFormattingStage()
+    stage.format(modules[0])  # warm up black's caches
+    start = time.perf_counter()
+    stage.format_many(modules)
+    in_process_total = time.perf_counter() - start
+    in_process_per_file = in_process_total / len(modules)
+
+    print(f"{'subprocess pipeline':<22} {subprocess_per_file * 1000:8.2f} ms/file  (sample of {args.sample})")
+    print(f"{'in-process stage':<22} {in_process_per_file * 1000:8.2f} ms/file  "
+          f"({len(modules)} modules in {in_process_total:.2f}s)")
+    print(f"{'speedup':<22} {subprocess_per_file / in_process_per_file:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
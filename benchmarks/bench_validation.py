@@ -0,0 +1,100 @@
+"""
+Per-file cost of validating generated modules.
+
+Compares one ``ruff check`` subprocess per module with validate_batch
+(compile() and ast in process, cross-module import and model checks) on a
+batch of generated CRUD apps, serially and in a process pool.
+
+The subprocess path is slow, so it is timed on a sample and reported per
+file.
+
+Usage:
+    python benchmarks/bench_validation.py [--models N] [--sample N] [--jobs N]
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'antman.test_settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from core.code_generation.specs import expand_spec  # noqa: E402
+from core.code_generation.generators import CodeGeneratorManager  # noqa: E402
+from core.code_generation.validation import validate_batch  # noqa: E402
+
+
+def generated_items(models):
+    spec = {
+        'app_name': 'shop',
+        'crud': {'performance_tests': True},
+        'models': [
+            {
+                'name': f'Model{index}',
+                'fields': [
+                    {'name': 'title', 'type': 'CharField', 'max_length': 200},
+                    {'name': 'price', 'type': 'DecimalField'},
+                    {'name': 'created_at', 'type': 'DateTimeField', 'auto_now_add': True},
+                ]
+            }
+            for index in range(models)
+        ]
+    }
+    manager = CodeGeneratorManager()
+    return [
+        {
+            'code': manager.generate_code(item['type'], item['config']),
+            'output': item['output'],
+            'app_name': 'shop'
+        }
+        for item in expand_spec(spec)
+    ]
+
+
+def ruff_per_file(ruff, items):
+    with tempfile.TemporaryDirectory(prefix='antman-bench-') as temp_dir:
+        path = os.path.join(temp_dir, 'module.py')
+        start = time.perf_counter()
+        for item in items:
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(item['code'])
+            subprocess.run([ruff, 'check', '--no-cache', '--exit-zero', path], capture_output=True)
+        return (time.perf_counter() - start) / len(items)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--models', type=int, default=250, help='Models in the generated app (6 modules each)')
+    parser.add_argument('--sample', type=int, default=50, help='Modules checked through ruff subprocesses')
+    parser.add_argument('--jobs', type=int, help='Process pool size (default: CPU count)')
+    args = parser.parse_args()
+
+    items = generated_items(args.models)
+    rows = []
+
+    ruff = shutil.which('ruff')
+    if ruff:
+        rows.append(('ruff per file', ruff_per_file(ruff, items[:args.sample]), f"sample of {args.sample}"))
+
+    for label, use_processes in (('validate_batch serial', False), ('validate_batch pool', True)):
+        start = time.perf_counter()
+        results = validate_batch(items, max_workers=args.jobs, use_processes=use_processes)
+        total = time.perf_counter() - start
+        invalid = sum(not result['success'] for result in results)
+        rows.append((label, total / len(items), f"{len(items)} modules in {total:.2f}s, {invalid} invalid"))
+
+    for label, per_file, note in rows:
+        print(f"{label:<24} {per_file * 1000:8.3f} ms/file  ({note})")
+    if ruff:
+        print(f"{'speedup (serial)':<24} {rows[0][1] / rows[1][1]:8.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,18 @@
+"""
+App configuration for the code generation package.
+"""
+from django.apps import AppConfig
+from django.conf import settings
+
+
+class CodeGenerationConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core.code_generation'
+    label = 'code_generation'
+
+    def ready(self):
+        # Compile the shared generator templates once per worker process
+        from .templates import get_template_manager
+
+        if getattr(settings, 'CODE_GENERATION_PRECOMPILE_TEMPLATES', True):
+            get_template_manager().precompile()
@@ -9,6 +9,8 @@ import os
 import logging
 from abc import ABC, abstractmethod
 
+from .writers import write_if_changed
+
 logger = logging.getLogger(__name__)
 
 
@@ -36,6 +38,9 @@ class BaseGenerator(ABC):
         # 로깅 설정
         self.verbose = self.config.get('verbose', False)
         
+        # 저장 통계 (내용이 같아 건너뛴 파일 포함)
+        self.write_stats = {'written': 0, 'skipped': 0}
+        
     def _validate_config(self):
         """
         구성 옵션의 유효성을 검사합니다.
@@ -72,6 +77,9 @@ class BaseGenerator(ABC):
         """
         생성된 코드를 파일로 저장합니다.
         
+        파일은 임시 파일을 거쳐 원자적으로 교체되며, 기존 내용과 같으면
+        다시 쓰지 않습니다 (수정 시각이 유지되어 autoreloader가 동작하지 않음).
+        
         Args:
             content (str): 저장할 코드 내용
             filename (str, optional): 저장할 파일 이름
@@ -91,17 +99,15 @@ class BaseGenerator(ABC):
         else:
             filepath = filename
             
-        # 디렉토리가 존재하는지 확인
-        directory = os.path.dirname(filepath)
-        if directory and not os.path.exists(directory):
-            os.makedirs(directory, exist_ok=True)
-            
-        # 파일 저장
-        with open(filepath, 'w', encoding=self.encoding) as f:
-            f.write(content)
+        # 파일 저장 (디렉토리는 필요 시 생성됨)
+        written = write_if_changed(filepath, content, encoding=self.encoding)
+        self.write_stats['written' if written else 'skipped'] += 1
             
         if self.verbose:
-            logger.info(f"파일이 저장됨: {filepath}")
+            if written:
+                logger.info(f"파일이 저장됨: {filepath}")
+            else:
+                logger.info(f"내용이 같아 저장을 건너뜀: {filepath}")
             
         return filepath
     
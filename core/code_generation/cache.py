@@ -0,0 +1,236 @@
+"""
+Memoization of rendered generator output.
+
+Generators are called repeatedly with the same configs (preview, save, CI
+regeneration). RenderCache keeps rendered code in an in-process LRU and,
+optionally, in a directory shared between processes. Keys are the SHA-256 of
+the template name, the template's source hash and the canonical JSON of the
+normalized template context, so entries rendered from an older template are
+never returned. Since every template edit or context change adds new keys,
+the directory is bounded by entry count and size: reads refresh an entry's
+mtime and writes that cross a limit evict the least recently used entries.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+from .writers import atomic_write
+
+
+CACHE_KEY_VERSION = 1
+
+# Evict down to this fraction of the limits, so pruning is not triggered on every write
+PRUNE_TARGET = 0.8
+
+
+def scan_cache_dir(cache_dir: str, suffix: str) -> List[Tuple[int, int, str]]:
+    """Return ``(mtime_ns, size, path)`` for every ``suffix`` file under ``cache_dir``."""
+    entries = []
+    for root, dirs, files in os.walk(cache_dir):
+        for file in files:
+            if not file.endswith(suffix):
+                continue
+            path = os.path.join(root, file)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime_ns, stat.st_size, path))
+    return entries
+
+
+def prune_cache_dir(cache_dir: str, suffix: str, max_entries: int, max_bytes: int) -> Tuple[int, int, int]:
+    """
+    Evict the least recently used ``suffix`` files of ``cache_dir``.
+
+    Files are removed oldest mtime first until the directory is within
+    ``PRUNE_TARGET`` of both limits.
+
+    Returns:
+        tuple: ``(evicted, entries, bytes)`` after pruning
+    """
+    files = scan_cache_dir(cache_dir, suffix)
+    entries, size = len(files), sum(file_size for _, file_size, _ in files)
+    max_entries = int(max_entries * PRUNE_TARGET)
+    max_bytes = int(max_bytes * PRUNE_TARGET)
+    evicted = 0
+    for mtime, file_size, path in sorted(files):
+        if entries <= max_entries and size <= max_bytes:
+            break
+        try:
+            os.unlink(path)
+        except OSError:
+            continue
+        entries -= 1
+        size -= file_size
+        evicted += 1
+    return evicted, entries, size
+
+
+class RenderCache:
+    """LRU cache of rendered code with an optional, size-bounded on-disk second level."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        cache_dir: Optional[str] = None,
+        disk_max_entries: int = 10000,
+        disk_max_bytes: int = 64 * 1024 * 1024
+    ):
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self.disk_max_entries = disk_max_entries
+        self.disk_max_bytes = disk_max_bytes
+        self._entries: 'OrderedDict[str, str]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0, 'disk_evictions': 0}
+        # Disk entry count and size, scanned on first write and tracked afterwards
+        self._disk_usage: Optional[List[int]] = None
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(template_name: str, template_hash: str, context: Dict[str, Any]) -> str:
+        """Return the cache key of a render."""
+        canonical = json.dumps(
+            [CACHE_KEY_VERSION, template_name, template_hash, context],
+            sort_keys=True,
+            separators=(',', ':'),
+            default=repr
+        )
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + '.py')
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached code for ``key``, or None."""
+        with self._lock:
+            code = self._entries.get(key)
+            if code is not None:
+                self._entries.move_to_end(key)
+                self._stats['hits'] += 1
+                return code
+
+        if self.cache_dir:
+            path = self._disk_path(key)
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    code = f.read()
+                # Recency for eviction
+                os.utime(path)
+            except OSError:
+                code = None
+            if code is not None:
+                with self._lock:
+                    self._stats['disk_hits'] += 1
+                self._remember(key, code)
+                return code
+
+        with self._lock:
+            self._stats['misses'] += 1
+        return None
+
+    def set(self, key: str, code: str) -> None:
+        """Store rendered code under ``key``."""
+        self._remember(key, code)
+        if self.cache_dir:
+            try:
+                self._write_disk(key, code)
+            except OSError:
+                # The disk level is best effort
+                pass
+
+    def _write_disk(self, key: str, code: str) -> None:
+        path = self._disk_path(key)
+        replaced = os.path.getsize(path) if os.path.exists(path) else None
+        atomic_write(path, code)
+        size = len(code.encode('utf-8'))
+        with self._lock:
+            if self._disk_usage is None:
+                files = scan_cache_dir(self.cache_dir, '.py')
+                self._disk_usage = [len(files), sum(file_size for _, file_size, _ in files)]
+            else:
+                self._disk_usage[0] += replaced is None
+                self._disk_usage[1] += size - (replaced or 0)
+            over = self._disk_usage[0] > self.disk_max_entries or self._disk_usage[1] > self.disk_max_bytes
+        if over:
+            self.prune()
+
+    def prune(self) -> int:
+        """Evict least recently used disk entries until the directory is within its limits."""
+        if not self.cache_dir:
+            return 0
+        with self._lock:
+            evicted, entries, size = prune_cache_dir(
+                self.cache_dir, '.py', self.disk_max_entries, self.disk_max_bytes
+            )
+            self._disk_usage = [entries, size]
+            self._stats['disk_evictions'] += evicted
+        return evicted
+
+    def _remember(self, key: str, code: str) -> None:
+        with self._lock:
+            self._entries[key] = code
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def invalidate(self) -> None:
+        """Drop every cached render, in memory and on disk."""
+        with self._lock:
+            self._entries.clear()
+            self._disk_usage = None
+        if self.cache_dir and os.path.isdir(self.cache_dir):
+            for root, dirs, files in os.walk(self.cache_dir):
+                for file in files:
+                    if file.endswith('.py'):
+                        try:
+                            os.unlink(os.path.join(root, file))
+                        except OSError:
+                            pass
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current number of entries."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        lookups = stats['hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_rate'] = (stats['hits'] + stats['disk_hits']) / lookups if lookups else 0.0
+        return stats
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_render_cache() -> Optional[RenderCache]:
+    """
+    Return the process-wide RenderCache, or None when it is disabled.
+
+    Configured by ``CODE_GENERATION_RENDER_CACHE`` (default True),
+    ``CODE_GENERATION_RENDER_CACHE_SIZE``, ``CODE_GENERATION_RENDER_CACHE_DIR``
+    (no disk level by default) and, for the directory,
+    ``CODE_GENERATION_RENDER_CACHE_DIR_MAX_ENTRIES`` and
+    ``CODE_GENERATION_RENDER_CACHE_DIR_MAX_BYTES``.
+    """
+    global _shared_cache
+    options = settings if settings.configured else None
+    if not getattr(options, 'CODE_GENERATION_RENDER_CACHE', True):
+        return None
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                _shared_cache = RenderCache(
+                    max_entries=getattr(options, 'CODE_GENERATION_RENDER_CACHE_SIZE', 1024),
+                    cache_dir=getattr(options, 'CODE_GENERATION_RENDER_CACHE_DIR', None),
+                    disk_max_entries=getattr(options, 'CODE_GENERATION_RENDER_CACHE_DIR_MAX_ENTRIES', 10000),
+                    disk_max_bytes=getattr(options, 'CODE_GENERATION_RENDER_CACHE_DIR_MAX_BYTES', 64 * 1024 * 1024)
+                )
+    return _shared_cache
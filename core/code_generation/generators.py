@@ -2,33 +2,116 @@
 Code generators for Django models, views, and serializers.
 """
 import os
-from typing import Dict, Any, List
-from jinja2 import Template
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Dict, Any, Iterable, Iterator, List, Optional, Tuple
+from .cache import RenderCache, get_render_cache
 from .exceptions import CodeGenerationError, InvalidConfigurationError
-from .templates import TemplateManager, MODEL_TEMPLATE, VIEW_TEMPLATE, SERIALIZER_TEMPLATE
+from .indexing import apply_index_plan, validate_query_patterns
+from .templates import TemplateManager, get_template_manager
+from .writers import stream_write, write_if_changed
+
+if TYPE_CHECKING:
+    # Imported lazily at runtime: black and isort are slow to import
+    from .formatting import CodeFormattingStage
 
 
 class BaseGenerator:
-    """Base class for code generators."""
+    """
+    Base class for code generators.
     
-    def __init__(self):
-        self.template_manager = TemplateManager()
+    Subclasses set ``template_name`` to the built-in template they render and
+    implement ``validate_config`` and ``get_context``. Rendered code is
+    memoized in the shared RenderCache, keyed by the normalized context and
+    the template's source hash.
+    """
+    
+    template_name = None
+    
+    def __init__(self, template_manager: TemplateManager = None, render_cache: RenderCache = None):
+        self.template_manager = template_manager or get_template_manager()
+        self.render_cache = render_cache or get_render_cache()
     
     def validate_config(self, config: Dict[str, Any]) -> None:
         """Validate configuration dictionary."""
         raise NotImplementedError("Subclasses must implement validate_config")
     
+    def get_context(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the template context from a validated configuration."""
+        raise NotImplementedError("Subclasses must implement get_context")
+    
     def generate(self, config: Dict[str, Any]) -> str:
         """Generate code based on configuration."""
-        raise NotImplementedError("Subclasses must implement generate")
+        self.validate_config(config)
+        context = self.get_context(config)
+        
+        key = None
+        if self.render_cache is not None:
+            key = self.render_cache.make_key(
+                self.template_name,
+                self.template_manager.get_template_hash(self.template_name),
+                context
+            )
+            code = self.render_cache.get(key)
+            if code is not None:
+                return code
+        
+        try:
+            template = self.template_manager.get_builtin_template(self.template_name)
+            code = template.render(**context)
+        except Exception as e:
+            raise CodeGenerationError(f"Error generating {self.template_name}: {str(e)}")
+        
+        if key is not None:
+            self.render_cache.set(key, code)
+        return code
     
-    def save_to_file(self, config: Dict[str, Any], file_path: str) -> None:
-        """Save generated code to file."""
+    def generate_stream(self, config: Dict[str, Any]) -> Iterator[str]:
+        """
+        Generate code as an iterator of text chunks.
+        
+        The configuration is validated immediately; the template is rendered
+        lazily as the iterator is consumed, so very large modules are never
+        held in memory as one string. The chunks join to ``generate(config)``.
+        """
+        self.validate_config(config)
+        context = self.get_context(config)
+        
+        try:
+            template = self.template_manager.get_builtin_template(self.template_name)
+        except Exception as e:
+            raise CodeGenerationError(f"Error generating {self.template_name}: {str(e)}")
+        return self._render_chunks(template.generate(**context))
+    
+    def _render_chunks(self, chunks: Iterator[str]) -> Iterator[str]:
+        try:
+            yield from chunks
+        except Exception as e:
+            raise CodeGenerationError(f"Error generating {self.template_name}: {str(e)}")
+    
+    def save_to_file(self, config: Dict[str, Any], file_path: str, stream: bool = False) -> bool:
+        """
+        Save generated code to file.
+        
+        The file is replaced atomically and left untouched when it already
+        holds the generated code. With ``stream`` the code is written to the
+        temporary file chunk by chunk instead of being rendered to a string
+        first.
+        
+        Returns:
+            bool: True if the file was written, False if it was unchanged
+        """
+        if stream:
+            chunks = self.generate_stream(config)
+            try:
+                return stream_write(file_path, chunks)
+            except CodeGenerationError:
+                raise
+            except Exception as e:
+                raise CodeGenerationError(f"Error saving to file '{file_path}': {str(e)}")
+        
         code = self.generate(config)
         try:
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(code)
+            return write_if_changed(file_path, code)
         except Exception as e:
             raise CodeGenerationError(f"Error saving to file '{file_path}': {str(e)}")
 
@@ -36,6 +119,8 @@ class BaseGenerator:
 class ModelGenerator(BaseGenerator):
     """Generator for Django models."""
     
+    template_name = 'model'
+    
     def validate_config(self, config: Dict[str, Any]) -> None:
         """Validate model configuration."""
         if not config.get('name'):
@@ -64,35 +149,48 @@ class ModelGenerator(BaseGenerator):
                     raise InvalidConfigurationError("ForeignKey field requires 'to' parameter")
                 if not field.get('on_delete'):
                     field['on_delete'] = 'CASCADE'
+        
+        if 'query_patterns' in config:
+            validate_query_patterns(config['query_patterns'])
     
-    def generate(self, config: Dict[str, Any]) -> str:
-        """Generate Django model code."""
-        self.validate_config(config)
+    def get_context(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the model template context.
         
-        context = {
+        Indexes planned from ``query_patterns`` are added to the fields and
+        ``Meta.indexes``; see ``core.code_generation.indexing``.
+        """
+        fields, indexes = config['fields'], config.get('indexes', [])
+        if config.get('query_patterns'):
+            fields, indexes = apply_index_plan(config)
+        return {
             'model_name': config['name'],
             'model_description': config.get('description', f"{config['name']} model."),
-            'fields': config['fields'],
+            'fields': fields,
             'str_field': config.get('str_field'),
             'verbose_name': config.get('verbose_name'),
             'verbose_name_plural': config.get('verbose_name_plural'),
             'ordering': config.get('ordering'),
             'db_table': config.get('db_table'),
+            'managed': config.get('managed', True),
+            'indexes': indexes,
+            'unique_together': config.get('unique_together', []),
             'imports': config.get('imports', [])
         }
-        
-        try:
-            template = Template(MODEL_TEMPLATE)
-            return template.render(**context)
-        except Exception as e:
-            raise CodeGenerationError(f"Error generating model: {str(e)}")
 
 
 class ViewGenerator(BaseGenerator):
     """Generator for Django views."""
     
+    template_name = 'view'
+    
     SUPPORTED_VIEW_TYPES = ['ListView', 'DetailView', 'CreateView', 'UpdateView', 'DeleteView', 'APIView']
     
+    PAGINATION_STYLES = ['limit_offset', 'keyset']
+    
+    SELECT_RELATED_TYPES = ('ForeignKey', 'OneToOneField')
+    PREFETCH_RELATED_TYPES = ('ManyToManyField',)
+    
     def validate_config(self, config: Dict[str, Any]) -> None:
         """Validate view configuration."""
         if not config.get('name'):
@@ -113,11 +211,18 @@ class ViewGenerator(BaseGenerator):
         # Set defaults for API views
         if config['type'] == 'APIView' and not config.get('methods'):
             config['methods'] = ['GET', 'POST']
-    
-    def generate(self, config: Dict[str, Any]) -> str:
-        """Generate Django view code."""
-        self.validate_config(config)
         
+        pagination = config.get('pagination')
+        if pagination and pagination not in self.PAGINATION_STYLES:
+            raise InvalidConfigurationError(f"Unsupported pagination style: {pagination}")
+        
+        for option in ('page_size', 'max_page_size', 'max_batch_size'):
+            value = config.get(option)
+            if value is not None and (not isinstance(value, int) or value < 1):
+                raise InvalidConfigurationError(f"'{option}' must be a positive integer")
+    
+    def get_context(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the view template context."""
         context = {
             'view_name': config['name'],
             'view_type': config['type'],
@@ -129,17 +234,105 @@ class ViewGenerator(BaseGenerator):
             'form_class': config.get('form_class'),
             'fields': config.get('fields', "'__all__'")
         }
+        if config['type'] == 'APIView':
+            context.update(self.get_query_context(config))
+        return context
+    
+    def get_relations(self, config: Dict[str, Any]) -> Tuple[List[str], List[str]]:
+        """Return the ``select_related`` and ``prefetch_related`` names of an APIView config."""
+        model_fields = config.get('model_fields') or []
+        select_related = config.get('select_related')
+        if select_related is None:
+            select_related = [field['name'] for field in model_fields
+                              if field.get('type') in self.SELECT_RELATED_TYPES]
+        prefetch_related = config.get('prefetch_related')
+        if prefetch_related is None:
+            prefetch_related = [field['name'] for field in model_fields
+                                if field.get('type') in self.PREFETCH_RELATED_TYPES]
+        return list(select_related), list(prefetch_related)
+    
+    def get_query_context(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the pagination, eager loading, bulk and read serializer options of an APIView.
         
-        try:
-            template = Template(VIEW_TEMPLATE)
-            return template.render(**context)
-        except Exception as e:
-            raise CodeGenerationError(f"Error generating view: {str(e)}")
+        ``select_related`` and ``prefetch_related`` default to the
+        ForeignKey/OneToOneField and ManyToManyField entries of
+        ``model_fields`` (the model's field specs). With ``read_serializer``
+        the list endpoint reads ``values()`` rows through the model's
+        ReadSerializer (see SerializerGenerator). Without any of these
+        options the APIView is rendered exactly as before.
+        """
+        select_related, prefetch_related = self.get_relations(config)
+        m2m_fields = [field['name'] for field in config.get('model_fields') or []
+                      if field.get('type') in self.PREFETCH_RELATED_TYPES]
+        
+        pagination = config.get('pagination')
+        methods = config.get('methods', [])
+        bulk = bool(config.get('bulk')) and ('POST' in methods or 'PUT' in methods)
+        
+        keyset_ordering = config.get('keyset_field', 'pk')
+        keyset_field = keyset_ordering.lstrip('-')
+        keyset_sign = '-' if keyset_ordering.startswith('-') else ''
+        keyset_op = 'lt' if keyset_sign else 'gt'
+        # Rows sharing a non-unique keyset value are ordered and paged by pk
+        keyset_tiebreak = keyset_field not in ('pk', 'id')
+        keyset_columns = [keyset_field, 'pk'] if keyset_tiebreak else [keyset_field]
+        
+        ordering = config.get('ordering') or ['pk']
+        if isinstance(ordering, str):
+            ordering = [ordering]
+        
+        # A deferred field that select_related() follows or that the keyset
+        # cursor reads would cost one extra query per row
+        only = list(config.get('only') or [])
+        if only:
+            for name in list(select_related) + ([keyset_field] if pagination == 'keyset' else []):
+                if name not in only and name != 'pk':
+                    only.append(name)
+        defer = [name for name in config.get('defer') or []
+                 if name not in select_related and name != keyset_field]
+        projection = ''
+        if only:
+            projection += f'.only({_format_names(only)})'
+        if defer:
+            projection += f'.defer({_format_names(defer)})'
+        
+        page_size = config.get('page_size') or config.get('paginate_by') or 20
+        
+        read_serializer = bool(config.get('read_serializer'))
+        
+        return {
+            'optimized': bool(
+                pagination or select_related or prefetch_related or projection or bulk or read_serializer
+            ),
+            'pagination': pagination,
+            'page_size': page_size,
+            'max_page_size': config.get('max_page_size') or max(page_size, 100),
+            'ordering': _format_names(ordering),
+            'keyset_field': keyset_field,
+            'keyset_op': keyset_op,
+            'keyset_tiebreak': keyset_tiebreak,
+            'keyset_order_by': _format_names([keyset_ordering] + ([f'{keyset_sign}pk'] if keyset_tiebreak else [])),
+            'keyset_columns': _format_names(keyset_columns),
+            'select_related': _format_names(select_related),
+            'prefetch_related': _format_names(prefetch_related),
+            'projection': projection,
+            'bulk': bulk,
+            'max_batch_size': config.get('max_batch_size', 1000),
+            'm2m_fields': repr(tuple(m2m_fields)) if m2m_fields else '',
+            'read_serializer': read_serializer,
+            'list_serializer': f"{config['model']}{'ReadSerializer' if read_serializer else 'Serializer'}"
+        }
 
 
 class SerializerGenerator(BaseGenerator):
     """Generator for DRF serializers."""
     
+    template_name = 'serializer'
+    
+    # Fields a values() projection cannot reproduce
+    UNPROJECTED_TYPES = ('ManyToManyField', 'FileField', 'ImageField')
+    
     def validate_config(self, config: Dict[str, Any]) -> None:
         """Validate serializer configuration."""
         if not config.get('name'):
@@ -153,11 +346,17 @@ class SerializerGenerator(BaseGenerator):
         
         if not config.get('fields'):
             config['fields'] = "'__all__'"
-    
-    def generate(self, config: Dict[str, Any]) -> str:
-        """Generate DRF serializer code."""
-        self.validate_config(config)
         
+        if config.get('read_serializer'):
+            field_types = {field['name']: field.get('type') for field in config.get('model_fields') or []}
+            for name in self.get_read_fields(config):
+                if field_types.get(name) in self.UNPROJECTED_TYPES:
+                    raise InvalidConfigurationError(
+                        f"{field_types[name]} '{name}' cannot be read through values()"
+                    )
+    
+    def get_context(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the serializer template context."""
         context = {
             'serializer_name': config['name'],
             'model_name': config['model'],
@@ -170,12 +369,120 @@ class SerializerGenerator(BaseGenerator):
             'nested_serializers': config.get('nested_serializers', []),
             'custom_methods': config.get('custom_methods', [])
         }
+        if config.get('read_serializer'):
+            read_fields = self.get_read_fields(config)
+            specs = {field['name']: field for field in config.get('model_fields') or []}
+            context['read_fields'] = repr(tuple(read_fields))
+            context['read_converters'] = [
+                (name, self.get_converter(specs[name])) for name in read_fields
+                if name in specs and self.get_converter(specs[name])
+            ]
+        return context
+    
+    def get_read_fields(self, config: Dict[str, Any]) -> List[str]:
+        """
+        Return the fields of the read serializer.
         
-        try:
-            template = Template(SERIALIZER_TEMPLATE)
-            return template.render(**context)
-        except Exception as e:
-            raise CodeGenerationError(f"Error generating serializer: {str(e)}")
+        ``read_fields`` wins, then a list of serializer ``fields``; for
+        ``'__all__'`` the id and every ``model_fields`` entry except
+        many-to-many and file fields are used.
+        """
+        if config.get('read_fields'):
+            return list(config['read_fields'])
+        if isinstance(config['fields'], (list, tuple)):
+            return list(config['fields'])
+        return ['id'] + [field['name'] for field in config.get('model_fields') or []
+                         if field.get('type') not in self.UNPROJECTED_TYPES]
+    
+    @staticmethod
+    def get_converter(field: Dict[str, Any]) -> Optional[str]:
+        """
+        Return the expression converting a ``values()`` value like the ModelSerializer does.
+        
+        Strings, numbers, booleans, JSON and foreign key ids are returned
+        as they are.
+        """
+        field_type = field.get('type')
+        if field_type == 'DecimalField':
+            return (
+                f"serializers.DecimalField(max_digits={field.get('max_digits', 10)}, "
+                f"decimal_places={field.get('decimal_places', 2)}).to_representation"
+            )
+        if field_type in ('DateTimeField', 'DateField', 'TimeField', 'DurationField', 'UUIDField'):
+            return f"serializers.{field_type}().to_representation"
+        return None
+
+
+class SerializerBenchmarkGenerator(BaseGenerator):
+    """Generator for scripts comparing a ModelSerializer with its read serializer."""
+    
+    template_name = 'serializer_benchmark'
+    
+    def validate_config(self, config: Dict[str, Any]) -> None:
+        """Validate serializer benchmark configuration."""
+        for key, label in (('name', 'Serializer name'), ('model', 'Model name'), ('app_name', 'App name')):
+            if not config.get(key):
+                raise InvalidConfigurationError(f"{label} is required")
+    
+    def get_context(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the serializer benchmark template context."""
+        return {
+            'serializer_name': config['name'],
+            'model_name': config['model'],
+            'app_name': config['app_name'],
+            'script_name': config.get('script_name', f"bench_{config['model'].lower()}_serializers.py")
+        }
+
+
+class PerformanceTestGenerator(BaseGenerator):
+    """
+    Generator for pytest performance guardrails of a generated APIView.
+    
+    The expected query counts are derived from the APIView config
+    (``view_config``): one query for the list page or the object, plus one
+    per ``prefetch_related`` relation, or exactly one for a list served by
+    the read serializer. A many-to-many field of ``model_fields`` that is
+    not prefetched costs the detail endpoint one more query and fails the
+    list check, which is the N+1 the guardrail is there to catch.
+    """
+    
+    template_name = 'performance_test'
+    
+    def validate_config(self, config: Dict[str, Any]) -> None:
+        """Validate performance test configuration."""
+        for key, label in (('view', 'View name'), ('model', 'Model name'), ('app_name', 'App name')):
+            if not config.get(key):
+                raise InvalidConfigurationError(f"{label} is required")
+        
+        rows = config.get('rows', 200)
+        if not isinstance(rows, int) or rows < 1:
+            raise InvalidConfigurationError("'rows' must be a positive integer")
+    
+    def get_context(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the performance test template context."""
+        view_config = dict(config.get('view_config') or {})
+        view_generator = ViewGenerator()
+        prefetch_related = []
+        if view_generator.get_query_context(dict(view_config, model=config['model']))['optimized']:
+            prefetch_related = view_generator.get_relations(view_config)[1]
+        unprefetched = [field['name'] for field in view_config.get('model_fields') or []
+                        if field.get('type') in ViewGenerator.PREFETCH_RELATED_TYPES
+                        and field['name'] not in prefetch_related]
+        list_queries = 1 if view_config.get('read_serializer') else 1 + len(prefetch_related)
+        detail_queries = 1 + len(prefetch_related) + len(unprefetched)
+        
+        return {
+            'view_name': config['view'],
+            'model_name': config['model'],
+            'app_name': config['app_name'],
+            'methods': view_config.get('methods') or ['GET', 'POST'],
+            'rows': config.get('rows', 200),
+            'list_queries': config.get('list_queries', list_queries),
+            'detail_queries': config.get('detail_queries', detail_queries),
+            'latency_runs': config.get('latency_runs', 20),
+            'tolerance': config.get('tolerance', 1.5),
+            'baseline_file': config.get('baseline_file', '.perf-baselines.json')
+        }
 
 
 class CodeGeneratorManager:
@@ -185,7 +492,9 @@ class CodeGeneratorManager:
         self.generators = {
             'model': ModelGenerator(),
             'view': ViewGenerator(),
-            'serializer': SerializerGenerator()
+            'serializer': SerializerGenerator(),
+            'serializer_benchmark': SerializerBenchmarkGenerator(),
+            'performance_test': PerformanceTestGenerator()
         }
     
     def get_generator(self, generator_type: str) -> BaseGenerator:
@@ -199,14 +508,141 @@ class CodeGeneratorManager:
         generator = self.get_generator(generator_type)
         return generator.generate(config)
     
-    def save_code(self, generator_type: str, config: Dict[str, Any], file_path: str) -> None:
-        """Generate and save code to file."""
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
+        """Return render cache statistics, or None when the cache is disabled."""
+        cache = get_render_cache()
+        return cache.stats() if cache is not None else None
+    
+    def generate_stream(self, generator_type: str, config: Dict[str, Any]) -> Iterator[str]:
+        """Generate code as text chunks using specified generator."""
+        generator = self.get_generator(generator_type)
+        return generator.generate_stream(config)
+    
+    def save_code(self, generator_type: str, config: Dict[str, Any], file_path: str, stream: bool = False) -> bool:
+        """
+        Generate and save code to file; returns False if the file was unchanged.
+        
+        With ``stream`` the code is rendered straight into the file with
+        bounded memory (see ``BaseGenerator.generate_stream``).
+        """
         generator = self.get_generator(generator_type)
-        generator.save_to_file(config, file_path)
+        return generator.save_to_file(config, file_path, stream=stream)
     
     def get_supported_types(self) -> List[str]:
         """Get list of supported generator types."""
         return list(self.generators.keys())
+    
+    def generate_batch(
+        self,
+        specs: Iterable[Dict[str, Any]],
+        max_workers: Optional[int] = None,
+        use_processes: bool = False,
+        chunk_size: Optional[int] = None,
+        format_code: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Generate many artifacts in parallel, yielding results as they finish.
+        
+        Each spec is a dict with ``type`` ('model', 'view' or 'serializer'),
+        ``config`` and an optional ``output`` path. Outputs are written
+        atomically by the worker that rendered them, unless they already
+        hold the rendered code. A failing spec yields a
+        result with ``success`` False and does not stop the batch.
+        
+        Args:
+            specs: Generation specs
+            max_workers: Worker count, defaults to the CPU count
+            use_processes: Render in a process pool instead of a thread pool
+            chunk_size: Specs per task; defaults to 1 for threads and to an
+                even split for processes to amortize pickling overhead
+            format_code: Run isort and black (in process, see
+                ``CodeFormattingStage``) on each module before it is written
+        
+        Yields:
+            dict: ``index``, ``type``, ``name``, ``success``, ``code``,
+            ``file_path``, ``written`` and ``error`` for each spec, in
+            completion order
+        """
+        specs = list(specs)
+        if not specs:
+            return
+        
+        max_workers = max_workers or os.cpu_count() or 1
+        if chunk_size is None:
+            chunk_size = max(1, len(specs) // (max_workers * 4)) if use_processes else 1
+        indexed = list(enumerate(specs))
+        chunks = [indexed[start:start + chunk_size] for start in range(0, len(indexed), chunk_size)]
+        
+        executor_class = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+        with executor_class(max_workers=max_workers) as executor:
+            futures = [executor.submit(_generate_chunk, chunk, format_code) for chunk in chunks]
+            for future in as_completed(futures):
+                yield from future.result()
+
+
+def _generate_chunk(chunk: List[Tuple[int, Dict[str, Any]]], format_code: bool = False) -> List[Dict[str, Any]]:
+    """Render (and write) one chunk of batch specs; runs inside a pool worker."""
+    manager = _get_worker_manager()
+    formatter = _get_worker_formatter() if format_code else None
+    return [_generate_spec(manager, index, spec, formatter) for index, spec in chunk]
+
+
+def _generate_spec(
+    manager: CodeGeneratorManager,
+    index: int,
+    spec: Dict[str, Any],
+    formatter: Optional['CodeFormattingStage'] = None
+) -> Dict[str, Any]:
+    config = spec.get('config') or {}
+    result = {
+        'index': index,
+        'type': spec.get('type'),
+        'name': config.get('name'),
+        'success': False,
+        'code': None,
+        'file_path': spec.get('output'),
+        'written': False,
+        'error': None
+    }
+    try:
+        code = manager.generate_code(spec.get('type'), config)
+        if formatter is not None:
+            code = formatter.format(code)
+        if spec.get('output'):
+            result['written'] = write_if_changed(spec['output'], code)
+        result['code'] = code
+        result['success'] = True
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+
+_worker_manager = None
+
+
+def _get_worker_manager() -> CodeGeneratorManager:
+    """Return the CodeGeneratorManager of the current worker process."""
+    global _worker_manager
+    if _worker_manager is None:
+        _worker_manager = CodeGeneratorManager()
+    return _worker_manager
+
+
+_worker_formatter = None
+
+
+def _get_worker_formatter() -> 'CodeFormattingStage':
+    """Return the CodeFormattingStage of the current worker process."""
+    global _worker_formatter
+    if _worker_formatter is None:
+        from .formatting import CodeFormattingStage
+        _worker_formatter = CodeFormattingStage()
+    return _worker_formatter
+
+
+def _format_names(names: Iterable[str]) -> str:
+    """Render names as quoted positional arguments."""
+    return ', '.join(repr(str(name)) for name in names)
 
 
 # Convenience functions
@@ -228,34 +664,88 @@ def generate_serializer(config: Dict[str, Any]) -> str:
     return generator.generate(config)
 
 
-def generate_crud_set(model_config: Dict[str, Any], app_name: str) -> Dict[str, str]:
-    """Generate complete CRUD set (model, views, serializer)."""
+def build_crud_configs(
+    model_config: Dict[str, Any],
+    app_name: str,
+    view_options: Optional[Dict[str, Any]] = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Build the model, API view and serializer configs of a CRUD set.
+
+    The API view paginates its list endpoint (limit/offset unless
+    ``view_options`` says otherwise) and eager-loads the model's relations.
+    With ``read_serializer`` in ``view_options`` the serializer module also
+    holds the read serializer the list endpoint uses, and a
+    ``serializer_benchmark`` config is added. ``performance_tests`` (True
+    or the number of rows to seed) adds a ``performance_test`` config.
+    """
     model_name = model_config['name']
-    
-    # Generate model
-    model_code = generate_model(model_config)
-    
-    # Generate API view
+    # Only relations shape the view, so other field changes keep its spec hash
+    relation_types = ViewGenerator.SELECT_RELATED_TYPES + ViewGenerator.PREFETCH_RELATED_TYPES
     view_config = {
         'name': f'{model_name}APIView',
         'type': 'APIView',
         'model': model_name,
         'app_name': app_name,
-        'methods': ['GET', 'POST', 'PUT', 'DELETE']
+        'methods': ['GET', 'POST', 'PUT', 'DELETE'],
+        'pagination': 'limit_offset',
+        'model_fields': [field for field in model_config.get('fields', [])
+                         if field.get('type') in relation_types]
     }
-    view_code = generate_view(view_config)
-    
-    # Generate serializer
+    view_config.update(view_options or {})
+    performance_tests = view_config.pop('performance_tests', None)
     serializer_config = {
         'name': f'{model_name}Serializer',
         'model': model_name,
         'app_name': app_name,
         'fields': "'__all__'"
     }
-    serializer_code = generate_serializer(serializer_config)
     
-    return {
-        'model': model_code,
-        'view': view_code,
-        'serializer': serializer_code
+    configs = {
+        'model': model_config,
+        'view': view_config,
+        'serializer': serializer_config
     }
+    if view_config.get('read_serializer'):
+        serializer_config['read_serializer'] = True
+        serializer_config['model_fields'] = model_config.get('fields', [])
+        configs['serializer_benchmark'] = {
+            'name': serializer_config['name'],
+            'model': model_name,
+            'app_name': app_name,
+            'script_name': f'bench_{model_name.lower()}_serializers.py'
+        }
+    if performance_tests:
+        configs['performance_test'] = {
+            'name': f'Test{model_name}Performance',
+            'view': view_config['name'],
+            'model': model_name,
+            'app_name': app_name,
+            'view_config': {key: value for key, value in view_config.items() if key != 'name'}
+        }
+        if performance_tests is not True:
+            configs['performance_test']['rows'] = performance_tests
+    return configs
+
+
+def generate_crud_set(
+    model_config: Dict[str, Any],
+    app_name: str,
+    view_options: Optional[Dict[str, Any]] = None
+) -> Dict[str, str]:
+    """
+    Generate complete CRUD set (model, views, serializer).
+    
+    ``view_options`` are passed to ``build_crud_configs``; the optional
+    read serializer benchmark and performance tests are returned under
+    ``serializer_benchmark`` and ``performance_test``.
+    """
+    configs = build_crud_configs(model_config, app_name, view_options)
+    manager = CodeGeneratorManager()
+    return {kind: manager.generate_code(kind, config) for kind, config in configs.items()}
+
+
+def generate_serializer_benchmark(config: Dict[str, Any]) -> str:
+    """Generate a script comparing a ModelSerializer with its read serializer."""
+    generator = SerializerBenchmarkGenerator()
+    return generator.generate(config)
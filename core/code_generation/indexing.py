@@ -0,0 +1,230 @@
+"""
+Index planning from declared query patterns.
+
+A model config may declare how its views query it::
+
+    'query_patterns': [
+        {'view': 'ProductListView', 'filter': ['category', 'is_active'], 'order_by': ['-created_at']},
+        {'view': 'ProductSearchView', 'filter': ['sku']},
+        {'filter': ['price__gte'], 'include': ['title']},
+    ]
+
+``plan_indexes`` turns the patterns into ``db_index=True`` on single fields
+and ``Meta.indexes`` entries for composite ones: equality filters first,
+then one range filter or the ordering, so a page of a filtered, ordered list
+is read straight from the index. Indexes made redundant by a longer index
+with the same leading columns are dropped, and patterns that no index on
+this model can serve (ForeignKeys with ``db_index=False``, lookups across
+relations, ``contains``-style lookups) produce warnings.
+"""
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from .exceptions import InvalidConfigurationError
+
+
+EQUALITY_LOOKUPS = {'exact', 'in', 'isnull'}
+RANGE_LOOKUPS = {'gt', 'gte', 'lt', 'lte', 'range', 'startswith', 'date', 'year', 'month', 'day'}
+UNINDEXABLE_LOOKUPS = {
+    'iexact', 'contains', 'icontains', 'istartswith', 'endswith', 'iendswith', 'regex', 'iregex'
+}
+LOOKUPS = EQUALITY_LOOKUPS | RANGE_LOOKUPS | UNINDEXABLE_LOOKUPS
+
+RELATION_TYPES = ('ForeignKey', 'OneToOneField')
+
+
+def validate_query_patterns(patterns: Any) -> None:
+    """Raise InvalidConfigurationError unless ``patterns`` is a list of query patterns."""
+    if not isinstance(patterns, list):
+        raise InvalidConfigurationError("'query_patterns' must be a list")
+    for pattern in patterns:
+        if not isinstance(pattern, dict):
+            raise InvalidConfigurationError("Every query pattern must be a mapping")
+        for key in ('filter', 'order_by', 'include'):
+            value = pattern.get(key, [])
+            if not isinstance(value, list) or not all(isinstance(name, str) for name in value):
+                raise InvalidConfigurationError(f"Query pattern '{key}' must be a list of field names")
+        if not pattern.get('filter') and not pattern.get('order_by'):
+            raise InvalidConfigurationError("A query pattern needs 'filter' or 'order_by'")
+
+
+def index_name(model_name: str, fields: List[str]) -> str:
+    """Return a deterministic index name within Django's 30-character limit."""
+    digest = hashlib.sha256(f"{model_name}:{','.join(fields)}".encode('utf-8')).hexdigest()[:6]
+    return f"{model_name.lower()[:11]}_{fields[0].lstrip('-')[:7]}_{digest}_idx"
+
+
+def _is_indexed(field: Dict[str, Any]) -> bool:
+    if field.get('primary_key') or field.get('unique') or field.get('db_index'):
+        return True
+    arguments = field.get('arguments', '')
+    if 'primary_key=True' in arguments or 'unique=True' in arguments or 'db_index=True' in arguments:
+        return True
+    return field.get('type') in RELATION_TYPES and not _index_disabled(field)
+
+
+def _index_disabled(field: Dict[str, Any]) -> bool:
+    return field.get('db_index') is False or 'db_index=False' in field.get('arguments', '')
+
+
+def _resolve(
+    lookup: str,
+    fields: Dict[str, Dict[str, Any]],
+    label: str,
+    warnings: List[str]
+) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Resolve a filter such as ``price__gte`` or ``owner_id``.
+
+    Returns:
+        tuple: ``(field_name, kind)`` with kind 'eq' or 'range', or
+        ``(None, None)`` when no index on this model serves the lookup
+    """
+    parts = lookup.split('__')
+    name = parts[0]
+    if name in ('pk', 'id'):
+        return None, None
+    if name not in fields and name.endswith('_id') and name[:-3] in fields:
+        name = name[:-3]
+    if name not in fields:
+        warnings.append(f"{label}: '{lookup}' does not name a field of this model")
+        return None, None
+
+    rest = parts[1:]
+    if rest and rest[0] not in LOOKUPS:
+        if fields[name].get('type') in RELATION_TYPES + ('ManyToManyField',):
+            warnings.append(
+                f"{label}: '{lookup}' filters across '{name}'; index '{'__'.join(rest)}' "
+                f"on the related model"
+            )
+        else:
+            warnings.append(f"{label}: unknown lookup in '{lookup}'")
+        return None, None
+    if fields[name].get('type') == 'ManyToManyField':
+        return None, None
+
+    lookup_type = rest[0] if rest else 'exact'
+    if lookup_type in UNINDEXABLE_LOOKUPS:
+        warnings.append(f"{label}: '{lookup}' cannot use a B-tree index")
+        return None, None
+    return name, 'range' if lookup_type in RANGE_LOOKUPS else 'eq'
+
+
+def plan_indexes(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Plan the indexes that serve a model config's ``query_patterns``.
+
+    Returns:
+        dict: ``db_index`` (field names to index on their own), ``indexes``
+        (``Meta.indexes`` entries, including the config's own) and
+        ``warnings``
+    """
+    patterns = config.get('query_patterns') or []
+    validate_query_patterns(patterns)
+    model_name = config['name']
+    fields = {field.get('name'): field for field in config.get('fields', [])}
+    warnings: List[str] = []
+    candidates: List[Tuple[List[str], List[str]]] = []
+
+    for number, pattern in enumerate(patterns, 1):
+        label = pattern.get('view') or f"query pattern {number}"
+        equality: List[str] = []
+        ranges: List[str] = []
+        for lookup in pattern.get('filter', []):
+            name, kind = _resolve(lookup, fields, label, warnings)
+            if name is None:
+                continue
+            if kind == 'eq' and name not in equality:
+                equality.append(name)
+            elif kind == 'range' and name not in ranges:
+                ranges.append(name)
+            field = fields[name]
+            if field.get('type') in RELATION_TYPES and _index_disabled(field):
+                warnings.append(f"{label}: ForeignKey '{name}' is filtered on but has db_index=False")
+
+        ordering = []
+        for name in pattern.get('order_by', []):
+            if name.lstrip('-') in fields or name.lstrip('-') in ('pk', 'id'):
+                ordering.append(name)
+            else:
+                warnings.append(f"{label}: cannot order by unknown field '{name}'")
+
+        columns = list(equality)
+        ranges = [name for name in ranges if name not in equality]
+        if ranges:
+            # Only the first range column can use the index; an ordering on
+            # that same column is served by it too
+            first_range = ranges[0]
+            if ordering and ordering[0].lstrip('-') == first_range:
+                columns.append(ordering[0])
+            else:
+                columns.append(first_range)
+                if ordering:
+                    warnings.append(
+                        f"{label}: ordering by {', '.join(ordering)} after a range filter on "
+                        f"'{first_range}' needs a sort"
+                    )
+        else:
+            columns.extend(name for name in ordering if name.lstrip('-') not in equality)
+
+        # A trailing primary key only repeats what every index already holds
+        while len(columns) > 1 and columns[-1].lstrip('-') in ('pk', 'id'):
+            columns.pop()
+        if not columns or columns[0].lstrip('-') in ('pk', 'id'):
+            continue
+        include = [name for name in pattern.get('include', []) if name not in columns]
+        candidates.append((columns, include))
+
+    indexes: List[Dict[str, Any]] = [dict(index) for index in config.get('indexes') or []]
+    for columns, include in candidates:
+        if len(columns) == 1 and not include:
+            continue
+        if any(index.get('fields') == columns for index in indexes):
+            continue
+        index = {'fields': columns, 'name': index_name(model_name, columns)}
+        if include:
+            index['include'] = include
+        indexes.append(index)
+
+    # Drop planned indexes whose columns lead a longer index
+    planned = [index for index in indexes if index not in (config.get('indexes') or [])]
+    indexes = [
+        index for index in indexes
+        if index not in planned or index.get('include') or not any(
+            other is not index and other['fields'][:len(index['fields'])] == index['fields']
+            and len(other['fields']) > len(index['fields'])
+            for other in indexes
+        )
+    ]
+
+    db_index = []
+    for columns, include in candidates:
+        if len(columns) != 1 or include:
+            continue
+        name = columns[0].lstrip('-')
+        if name in db_index or _is_indexed(fields[name]) or _index_disabled(fields[name]):
+            continue
+        if any(index['fields'][0].lstrip('-') == name for index in indexes):
+            continue
+        db_index.append(name)
+
+    return {'db_index': db_index, 'indexes': indexes, 'warnings': warnings}
+
+
+def apply_index_plan(config: Dict[str, Any]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Return the config's fields and ``Meta.indexes`` with the planned indexes applied.
+
+    The config itself is left unchanged.
+    """
+    plan = plan_indexes(config)
+    fields = []
+    for field in config['fields']:
+        if field['name'] in plan['db_index']:
+            field = dict(field)
+            if 'arguments' in field:
+                field['arguments'] = ', '.join(filter(None, [field['arguments'], 'db_index=True']))
+            else:
+                field['db_index'] = True
+        fields.append(field)
+    return fields, plan['indexes']
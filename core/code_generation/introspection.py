@@ -0,0 +1,491 @@
+"""
+Model generation from live database schemas.
+
+SchemaIntrospector reads the catalog of a whole database in three bulk
+queries - columns, constraints (primary key, unique, foreign key) and
+indexes - instead of Django's per-table introspection calls, which cost
+several round trips per table. ``build_model_configs`` maps the result to
+ModelGenerator configs (unmanaged models, like ``inspectdb``) so thousands of
+tables can be rendered in one batch.
+
+Supported backends: SQLite, PostgreSQL and Oracle.
+"""
+import fnmatch
+import keyword
+import re
+from collections import OrderedDict, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.db import connections
+
+from .exceptions import CodeGenerationError
+
+
+# Column rows: (table, column, data_type, length, precision, scale, nullable, default, autoincrement)
+# Constraint rows: (table, kind, name, column, ref_table, ref_column, position), kind in 'p', 'u', 'f'
+# Index rows: (table, index_name, unique, column, position); column is None for expressions
+
+SQLITE_COLUMNS_SQL = """
+    SELECT m.name, p.name, p.type, p."notnull", p.dflt_value, p.pk
+    FROM sqlite_master AS m
+    JOIN pragma_table_info(m.name) AS p
+    WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite_%'
+    ORDER BY m.name, p.cid
+"""
+
+SQLITE_FOREIGN_KEYS_SQL = """
+    SELECT m.name, f.id, f."from", f."table", f."to", f.seq
+    FROM sqlite_master AS m
+    JOIN pragma_foreign_key_list(m.name) AS f
+    WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite_%'
+    ORDER BY m.name, f.id, f.seq
+"""
+
+SQLITE_INDEXES_SQL = """
+    SELECT m.name, il.name, il."unique", il.origin, ii.name, ii.seqno
+    FROM sqlite_master AS m
+    JOIN pragma_index_list(m.name) AS il
+    JOIN pragma_index_info(il.name) AS ii
+    WHERE m.type = 'table' AND m.name NOT LIKE 'sqlite_%'
+    ORDER BY m.name, il.name, ii.seqno
+"""
+
+POSTGRESQL_COLUMNS_SQL = """
+    SELECT c.table_name, c.column_name, c.data_type, c.character_maximum_length,
+           c.numeric_precision, c.numeric_scale, c.is_nullable = 'YES', c.column_default,
+           c.is_identity = 'YES' OR COALESCE(c.column_default, '') LIKE 'nextval(%%'
+    FROM information_schema.columns AS c
+    JOIN information_schema.tables AS t
+      ON t.table_schema = c.table_schema AND t.table_name = c.table_name
+    WHERE c.table_schema = %s AND t.table_type = 'BASE TABLE'
+    ORDER BY c.table_name, c.ordinal_position
+"""
+
+POSTGRESQL_CONSTRAINTS_SQL = """
+    SELECT cl.relname, con.contype, con.conname, att.attname, fcl.relname, fatt.attname, u.ord
+    FROM pg_constraint AS con
+    JOIN pg_class AS cl ON cl.oid = con.conrelid
+    JOIN pg_namespace AS ns ON ns.oid = cl.relnamespace
+    CROSS JOIN LATERAL unnest(con.conkey) WITH ORDINALITY AS u(attnum, ord)
+    JOIN pg_attribute AS att ON att.attrelid = con.conrelid AND att.attnum = u.attnum
+    LEFT JOIN pg_class AS fcl ON fcl.oid = con.confrelid
+    LEFT JOIN pg_attribute AS fatt ON fatt.attrelid = con.confrelid AND fatt.attnum = con.confkey[u.ord]
+    WHERE ns.nspname = %s AND con.contype IN ('p', 'u', 'f')
+    ORDER BY cl.relname, con.conname, u.ord
+"""
+
+POSTGRESQL_INDEXES_SQL = """
+    SELECT t.relname, i.relname, ix.indisunique, a.attname, k.ord
+    FROM pg_index AS ix
+    JOIN pg_class AS t ON t.oid = ix.indrelid
+    JOIN pg_class AS i ON i.oid = ix.indexrelid
+    JOIN pg_namespace AS ns ON ns.oid = t.relnamespace
+    CROSS JOIN LATERAL unnest(ix.indkey::int2[]) WITH ORDINALITY AS k(attnum, ord)
+    LEFT JOIN pg_attribute AS a ON a.attrelid = t.oid AND a.attnum = k.attnum
+    WHERE ns.nspname = %s AND t.relkind IN ('r', 'p') AND NOT ix.indisprimary
+      AND NOT EXISTS (SELECT 1 FROM pg_constraint AS c WHERE c.conindid = ix.indexrelid)
+    ORDER BY t.relname, i.relname, k.ord
+"""
+
+ORACLE_COLUMNS_SQL = """
+    SELECT c.table_name, c.column_name, c.data_type, c.char_length, c.data_precision,
+           c.data_scale, CASE WHEN c.nullable = 'Y' THEN 1 ELSE 0 END, NULL,
+           CASE WHEN c.identity_column = 'YES' THEN 1 ELSE 0 END
+    FROM user_tab_columns c
+    JOIN user_tables t ON t.table_name = c.table_name
+    ORDER BY c.table_name, c.column_id
+"""
+
+ORACLE_CONSTRAINTS_SQL = """
+    SELECT c.table_name, LOWER(c.constraint_type), c.constraint_name, cc.column_name,
+           r.table_name, rcc.column_name, cc.position
+    FROM user_constraints c
+    JOIN user_cons_columns cc ON cc.constraint_name = c.constraint_name
+    LEFT JOIN user_constraints r ON r.constraint_name = c.r_constraint_name
+    LEFT JOIN user_cons_columns rcc
+      ON rcc.constraint_name = r.constraint_name AND rcc.position = cc.position
+    WHERE c.constraint_type IN ('P', 'U', 'R')
+    ORDER BY c.table_name, c.constraint_name, cc.position
+"""
+
+ORACLE_INDEXES_SQL = """
+    SELECT i.table_name, i.index_name, CASE WHEN i.uniqueness = 'UNIQUE' THEN 1 ELSE 0 END,
+           ic.column_name, ic.column_position
+    FROM user_indexes i
+    JOIN user_ind_columns ic ON ic.index_name = i.index_name
+    WHERE NOT EXISTS (SELECT 1 FROM user_constraints c WHERE c.index_name = i.index_name)
+    ORDER BY i.table_name, i.index_name, ic.column_position
+"""
+
+TYPE_PATTERN = re.compile(r'^\s*([a-z][a-z0-9_ ]*?)\s*(?:\(\s*(\d+)\s*(?:,\s*(\d+)\s*)?\))?\s*$')
+
+# Normalized database type -> Django field type
+FIELD_TYPES = {
+    'integer': 'IntegerField', 'int': 'IntegerField', 'int4': 'IntegerField', 'mediumint': 'IntegerField',
+    'bigint': 'BigIntegerField', 'int8': 'BigIntegerField',
+    'smallint': 'SmallIntegerField', 'int2': 'SmallIntegerField', 'tinyint': 'SmallIntegerField',
+    'varchar': 'CharField', 'character varying': 'CharField', 'nvarchar': 'CharField',
+    'varchar2': 'CharField', 'nvarchar2': 'CharField', 'char': 'CharField', 'character': 'CharField',
+    'nchar': 'CharField',
+    'text': 'TextField', 'clob': 'TextField', 'nclob': 'TextField', 'long': 'TextField',
+    'bool': 'BooleanField', 'boolean': 'BooleanField',
+    'date': 'DateField',
+    'datetime': 'DateTimeField', 'timestamp': 'DateTimeField',
+    'timestamp with time zone': 'DateTimeField', 'timestamp without time zone': 'DateTimeField',
+    'time': 'TimeField', 'time without time zone': 'TimeField',
+    'decimal': 'DecimalField', 'numeric': 'DecimalField', 'number': 'DecimalField',
+    'real': 'FloatField', 'float': 'FloatField', 'double': 'FloatField', 'double precision': 'FloatField',
+    'binary_float': 'FloatField', 'binary_double': 'FloatField',
+    'uuid': 'UUIDField',
+    'json': 'JSONField', 'jsonb': 'JSONField',
+    'blob': 'BinaryField', 'bytea': 'BinaryField', 'raw': 'BinaryField',
+    'interval': 'DurationField',
+    'inet': 'GenericIPAddressField',
+}
+
+
+class SchemaIntrospector:
+    """Bulk catalog reader for one database connection."""
+
+    def __init__(self, using: str = 'default', schema: Optional[str] = None):
+        self.connection = connections[using]
+        self.schema = schema
+
+    def get_schema(self, include: Iterable[str] = None, exclude: Iterable[str] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        Read every table of the database in three queries.
+
+        Args:
+            include: Glob patterns of table names to keep (default: all)
+            exclude: Glob patterns of table names to drop
+
+        Returns:
+            dict: table name -> ``columns`` (ordered dict of column dicts),
+            ``primary_key`` (column list), ``foreign_keys`` (column ->
+            (table, column)), ``unique`` (list of column tuples) and
+            ``indexes`` (list of dicts with ``name``, ``columns``, ``unique``)
+        """
+        vendor = self.connection.vendor
+        reader = getattr(self, f'_read_{vendor}', None)
+        if reader is None:
+            raise CodeGenerationError(f"Schema introspection is not supported for '{vendor}'")
+
+        with self.connection.cursor() as cursor:
+            columns, constraints, indexes = reader(cursor)
+
+        convert = self.connection.introspection.identifier_converter
+        include = list(include or [])
+        exclude = list(exclude or [])
+
+        def wanted(table):
+            return (
+                (not include or any(fnmatch.fnmatchcase(table, pattern) for pattern in include))
+                and not any(fnmatch.fnmatchcase(table, pattern) for pattern in exclude)
+            )
+
+        schema: Dict[str, Dict[str, Any]] = OrderedDict()
+        for table, column, data_type, length, precision, scale, nullable, default, autoincrement in columns:
+            table = convert(table)
+            if not wanted(table):
+                continue
+            info = schema.get(table)
+            if info is None:
+                info = schema[table] = {
+                    'columns': OrderedDict(),
+                    'primary_key': [],
+                    'foreign_keys': {},
+                    'unique': [],
+                    'indexes': []
+                }
+            info['columns'][convert(column)] = {
+                'data_type': data_type or '',
+                'length': length,
+                'precision': precision,
+                'scale': scale,
+                'nullable': bool(nullable),
+                'default': default,
+                'autoincrement': bool(autoincrement)
+            }
+
+        grouped = OrderedDict()
+        for table, kind, name, column, ref_table, ref_column, position in constraints:
+            table = convert(table)
+            if table in schema:
+                grouped.setdefault((table, kind, name), []).append(
+                    (convert(column), ref_table and convert(ref_table), ref_column and convert(ref_column))
+                )
+        for (table, kind, name), members in grouped.items():
+            info = schema[table]
+            if kind == 'p':
+                info['primary_key'] = [column for column, _, _ in members]
+            elif kind == 'u':
+                info['unique'].append(tuple(column for column, _, _ in members))
+            elif kind in ('f', 'r') and len(members) == 1:
+                # Composite foreign keys have no Django equivalent
+                column, ref_table, ref_column = members[0]
+                info['foreign_keys'][column] = (ref_table, ref_column)
+
+        grouped = OrderedDict()
+        for table, name, unique, column, position in indexes:
+            table = convert(table)
+            if table in schema:
+                grouped.setdefault((table, name, bool(unique)), []).append(column and convert(column))
+        for (table, name, unique), members in grouped.items():
+            if None in members:
+                # Expression indexes cannot be expressed as field lists
+                continue
+            schema[table]['indexes'].append({'name': name, 'columns': members, 'unique': unique})
+
+        return schema
+
+    def _read_sqlite(self, cursor) -> Tuple[List[tuple], List[tuple], List[tuple]]:
+        cursor.execute(SQLITE_COLUMNS_SQL)
+        rows = cursor.fetchall()
+        primary_keys = defaultdict(list)
+        for table, column, data_type, notnull, default, pk in rows:
+            if pk:
+                primary_keys[table].append((pk, column, data_type))
+
+        constraints = []
+        rowid_columns = set()
+        for table, members in primary_keys.items():
+            members.sort()
+            for position, column, _ in members:
+                constraints.append((table, 'p', f'{table}_pk', column, None, None, position))
+            # A lone INTEGER PRIMARY KEY is the rowid and auto-increments
+            if len(members) == 1 and members[0][2].upper() == 'INTEGER':
+                rowid_columns.add((table, members[0][1]))
+
+        columns = [
+            (table, column, data_type, None, None, None, not notnull and not pk, default,
+             (table, column) in rowid_columns)
+            for table, column, data_type, notnull, default, pk in rows
+        ]
+
+        cursor.execute(SQLITE_FOREIGN_KEYS_SQL)
+        for table, fk_id, column, ref_table, ref_column, seq in cursor.fetchall():
+            constraints.append((table, 'f', f'{table}_fk{fk_id}', column, ref_table, ref_column, seq))
+
+        cursor.execute(SQLITE_INDEXES_SQL)
+        indexes = []
+        for table, name, unique, origin, column, seqno in cursor.fetchall():
+            if origin == 'pk':
+                continue
+            if origin == 'u':
+                constraints.append((table, 'u', name, column, None, None, seqno))
+            else:
+                indexes.append((table, name, unique, column, seqno))
+        return columns, constraints, indexes
+
+    def _read_postgresql(self, cursor) -> Tuple[List[tuple], List[tuple], List[tuple]]:
+        schema = self.schema or 'public'
+        cursor.execute(POSTGRESQL_COLUMNS_SQL, [schema])
+        columns = cursor.fetchall()
+        cursor.execute(POSTGRESQL_CONSTRAINTS_SQL, [schema])
+        constraints = cursor.fetchall()
+        cursor.execute(POSTGRESQL_INDEXES_SQL, [schema])
+        indexes = cursor.fetchall()
+        return columns, constraints, indexes
+
+    def _read_oracle(self, cursor) -> Tuple[List[tuple], List[tuple], List[tuple]]:
+        cursor.execute(ORACLE_COLUMNS_SQL)
+        columns = [
+            row[:3] + (row[3] or None,) + row[4:8] + (bool(row[8]),)
+            for row in cursor.fetchall()
+        ]
+        cursor.execute(ORACLE_CONSTRAINTS_SQL)
+        constraints = cursor.fetchall()
+        cursor.execute(ORACLE_INDEXES_SQL)
+        indexes = cursor.fetchall()
+        return columns, constraints, indexes
+
+
+def model_name_for(table: str) -> str:
+    """Return the model class name for a table ('order_items' -> 'OrderItems')."""
+    name = ''.join(part.capitalize() for part in re.split(r'[^0-9a-zA-Z]+', table) if part)
+    if not name or name[0].isdigit():
+        name = 'T' + name
+    return name
+
+
+def field_name_for(column: str) -> str:
+    """Return a valid Python attribute name for a column."""
+    name = re.sub(r'[^0-9a-zA-Z_]+', '_', column.lower()).strip('_') or 'field'
+    if name[0].isdigit():
+        name = 'field_' + name
+    if keyword.iskeyword(name) or name == 'pk' or '__' in name:
+        name = name.replace('__', '_') + '_field'
+    return name
+
+
+def map_column_type(column: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    """
+    Map a column description to a Django field type and its type arguments.
+
+    Unknown types become TextField, as ``inspectdb`` does.
+    """
+    match = TYPE_PATTERN.match(column['data_type'].lower())
+    base = match.group(1) if match else column['data_type'].lower()
+    length = column['length'] or (match and match.group(2) and int(match.group(2)))
+    precision = column['precision'] or (match and match.group(2) and int(match.group(2)))
+    scale = column['scale'] if column['scale'] is not None else (
+        match and match.group(3) and int(match.group(3))
+    )
+    field_type = FIELD_TYPES.get(base)
+    if field_type is None and base.startswith('timestamp'):
+        field_type = 'DateTimeField'
+    if field_type is None:
+        return 'TextField', {}
+
+    if field_type == 'CharField':
+        if not length:
+            return 'TextField', {}
+        return field_type, {'max_length': int(length)}
+    if field_type == 'DecimalField':
+        # Oracle NUMBER(p) / NUMBER(p, 0) are integers
+        if base == 'number' and precision and not scale:
+            return ('BigIntegerField' if int(precision) > 9 else 'IntegerField'), {}
+        if base == 'number' and not precision:
+            return 'DecimalField', {'max_digits': 38, 'decimal_places': 10}
+        return field_type, {'max_digits': int(precision or 10), 'decimal_places': int(scale or 0)}
+    return field_type, {}
+
+
+def _format_arguments(positional: List[str], keywords: Dict[str, Any]) -> str:
+    parts = list(positional)
+    for key, value in keywords.items():
+        parts.append(f'{key}={value if isinstance(value, str) and value.startswith("models.") else repr(value)}')
+    return ', '.join(parts)
+
+
+def table_to_model_config(
+    table: str,
+    info: Dict[str, Any],
+    app_name: Optional[str] = None,
+    tables: Optional[Dict[str, Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """
+    Map one introspected table to a ModelGenerator config.
+
+    ``tables`` is the schema the table was read with. Foreign keys to tables
+    outside it map to plain columns, since their models are not generated,
+    and a foreign key to a column other than the target's primary key gets
+    ``to_field``.
+    """
+    primary_key = info['primary_key']
+    single_unique = {columns[0] for columns in info['unique'] if len(columns) == 1}
+    single_unique.update(index['columns'][0] for index in info['indexes'] if index['unique'] and len(index['columns']) == 1)
+    indexed = {index['columns'][0] for index in info['indexes'] if not index['unique'] and len(index['columns']) == 1}
+
+    foreign_keys = {
+        column: (ref_table, ref_column)
+        for column, (ref_table, ref_column) in info['foreign_keys'].items()
+        if tables is None or ref_table in tables
+    }
+    fk_targets = defaultdict(int)
+    for ref_table, _ in foreign_keys.values():
+        fk_targets[ref_table] += 1
+
+    fields = []
+    field_names = {}
+    used = set()
+    for column, description in info['columns'].items():
+        is_primary = column in primary_key[:1]
+        if is_primary and len(primary_key) == 1 and column == 'id' and description['autoincrement']:
+            # Django's implicit AutoField
+            field_names[column] = 'id'
+            continue
+
+        foreign_key = foreign_keys.get(column)
+        if foreign_key:
+            name = field_name_for(column[:-3] if column.lower().endswith('_id') and len(column) > 3 else column)
+        else:
+            name = field_name_for(column)
+        while name in used:
+            name += '_0'
+        used.add(name)
+        field_names[column] = name
+
+        keywords: Dict[str, Any] = {}
+        if foreign_key:
+            ref_table, ref_column = foreign_key
+            target = 'self' if ref_table == table else model_name_for(ref_table)
+            field_type = 'OneToOneField' if column in single_unique or is_primary else 'ForeignKey'
+            positional = [repr(target)]
+            keywords['on_delete'] = 'models.DO_NOTHING'
+            # SQLite reports no column for a reference to the primary key
+            if tables is not None and ref_column and ref_column not in tables[ref_table]['primary_key'][:1]:
+                keywords['to_field'] = field_name_for(ref_column)
+            if fk_targets[ref_table] > 1 or ref_table == table:
+                keywords['related_name'] = f'{field_name_for(table)}_{name}_set'
+            expected_column = name + '_id'
+        else:
+            field_type, keywords = map_column_type(description)
+            positional = []
+            expected_column = name
+
+        if column != expected_column:
+            keywords['db_column'] = column
+        if is_primary:
+            keywords['primary_key'] = True
+        elif column in single_unique and field_type != 'OneToOneField':
+            keywords['unique'] = True
+        elif column in indexed:
+            keywords['db_index'] = True
+        if description['nullable'] and not is_primary:
+            keywords['blank'] = True
+            keywords['null'] = True
+
+        field = {'name': name, 'type': field_type, 'arguments': _format_arguments(positional, keywords)}
+        if field_type in ('ForeignKey', 'OneToOneField'):
+            field['to'] = target
+        fields.append(field)
+
+    unique_together = [
+        tuple(field_names[column] for column in columns)
+        for columns in info['unique'] + [tuple(index['columns']) for index in info['indexes'] if index['unique']]
+        if len(columns) > 1 and all(column in field_names for column in columns)
+    ]
+    if len(primary_key) > 1:
+        # Django has no composite keys: the first column acts as the key
+        unique_together.insert(0, tuple(field_names[column] for column in primary_key))
+
+    indexes = []
+    for index in info['indexes']:
+        if index['unique'] or len(index['columns']) < 2:
+            continue
+        config = {'fields': [field_names[column] for column in index['columns'] if column in field_names]}
+        # Django limits index names to 30 characters starting with a letter
+        if index['name'] and len(index['name']) <= 30 and index['name'][0].isalpha():
+            config['name'] = index['name']
+        indexes.append(config)
+
+    config = {
+        'name': model_name_for(table),
+        'description': f'Unmanaged model for the {table} table.',
+        'fields': fields or [{'name': 'id', 'type': 'AutoField', 'arguments': 'primary_key=True'}],
+        'db_table': table,
+        'managed': False,
+        'indexes': indexes,
+        'unique_together': unique_together
+    }
+    if app_name:
+        config['app_name'] = app_name
+    return config
+
+
+def build_model_configs(schema: Dict[str, Dict[str, Any]], app_name: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Map an introspected schema to ModelGenerator configs, one per table."""
+    return [table_to_model_config(table, info, app_name, schema) for table, info in schema.items()]
+
+
+def introspect_model_configs(
+    using: str = 'default',
+    schema: Optional[str] = None,
+    include: Iterable[str] = None,
+    exclude: Iterable[str] = None,
+    app_name: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Read a database's catalog and return one ModelGenerator config per table."""
+    tables = SchemaIntrospector(using, schema).get_schema(include=include, exclude=exclude)
+    return build_model_configs(tables, app_name)
@@ -0,0 +1,361 @@
+"""
+Background code generation jobs.
+
+A job is a batch of generation specs (see ``CodeGeneratorManager.generate_batch``)
+with a status per output file. ``GenerationJobService.enqueue`` records the
+job in a store and hands it to a backend; the backend's worker calls
+``GenerationJobService.run``, which updates each file's status as its
+render completes, so progress can be polled (HTMX) or streamed (SSE) while
+the job runs. See ``views`` for the HTTP endpoints.
+
+Stores:
+    ``DatabaseJobStore`` persists jobs in the ``GenerationJob`` and
+    ``GenerationJobFile`` models; ``MemoryJobStore`` keeps them in process.
+
+Backends:
+    ``LocalJobBackend`` runs jobs on an in-process thread pool (or eagerly in
+    the caller with ``max_workers=0``); ``CeleryJobBackend`` sends them to the
+    ``code_generation.run_job`` task (requires Celery and the database
+    store).
+
+``get_job_service`` builds the shared service from
+``CODE_GENERATION_JOB_STORE`` ('database' or 'memory'),
+``CODE_GENERATION_JOB_BACKEND`` ('local' or 'celery'),
+``CODE_GENERATION_JOB_WORKERS`` and ``CODE_GENERATION_JOB_OUTPUT_ROOT``
+(outputs are written under it; without it the rendered code is kept in the
+store instead).
+"""
+import logging
+import os
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .exceptions import CodeGenerationError, InvalidConfigurationError
+from .generators import CodeGeneratorManager
+from .models import GenerationJob, GenerationJobFile
+from .specs import expand_spec
+
+logger = logging.getLogger(__name__)
+
+
+FINISHED_STATUSES = ('succeeded', 'failed')
+
+
+def _file_record(index: int, spec: Dict[str, Any]) -> Dict[str, Any]:
+    config = spec.get('config') or {}
+    return {
+        'index': index,
+        'type': spec.get('type'),
+        'name': config.get('name') or '',
+        'config': config,
+        'output': spec.get('output') or '',
+        'status': 'pending',
+        'error': '',
+        'code': ''
+    }
+
+
+def job_summary(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Return a job without per-file configs and code, with progress counters."""
+    files = [
+        {key: file[key] for key in ('index', 'type', 'name', 'output', 'status', 'error')}
+        for file in job['files']
+    ]
+    completed = sum(file['status'] != 'pending' for file in files)
+    summary = {key: value for key, value in job.items() if key != 'files'}
+    summary.update({
+        'total': len(files),
+        'completed': completed,
+        'failed': sum(file['status'] == 'failed' for file in files),
+        'progress': round(100 * completed / len(files)) if files else 100,
+        'files': files
+    })
+    return summary
+
+
+class MemoryJobStore:
+    """In-process job store; jobs are lost when the process exits."""
+
+    def __init__(self):
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def create(self, specs: List[Dict[str, Any]], output_dir: str = '', format_code: bool = False) -> str:
+        job_id = str(uuid.uuid4())
+        job = {
+            'id': job_id,
+            'status': 'queued',
+            'output_dir': output_dir,
+            'format_code': format_code,
+            'error': '',
+            'created_at': timezone.now(),
+            'started_at': None,
+            'finished_at': None,
+            'files': [_file_record(index, spec) for index, spec in enumerate(specs)]
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+        return job_id
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(str(job_id))
+            if job is None:
+                return None
+            return dict(job, files=[dict(file) for file in job['files']])
+
+    def start(self, job_id: str) -> None:
+        with self._lock:
+            self._jobs[str(job_id)].update(status='running', started_at=timezone.now())
+
+    def update_file(self, job_id: str, index: int, status: str, error: str = '', code: str = '') -> None:
+        with self._lock:
+            self._jobs[str(job_id)]['files'][index].update(status=status, error=error, code=code)
+
+    def finish(self, job_id: str, status: str, error: str = '') -> None:
+        with self._lock:
+            self._jobs[str(job_id)].update(status=status, error=error, finished_at=timezone.now())
+
+
+class DatabaseJobStore:
+    """Job store backed by the ``GenerationJob`` and ``GenerationJobFile`` models."""
+
+    def create(self, specs: List[Dict[str, Any]], output_dir: str = '', format_code: bool = False) -> str:
+        records = [_file_record(index, spec) for index, spec in enumerate(specs)]
+        with transaction.atomic():
+            job = GenerationJob.objects.create(output_dir=output_dir, format_code=format_code)
+            GenerationJobFile.objects.bulk_create([
+                GenerationJobFile(
+                    job=job,
+                    index=record['index'],
+                    generator_type=record['type'],
+                    name=record['name'],
+                    config=record['config'],
+                    output=record['output']
+                )
+                for record in records
+            ])
+        return str(job.pk)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        try:
+            job = GenerationJob.objects.prefetch_related('files').get(pk=job_id)
+        except (GenerationJob.DoesNotExist, ValidationError):
+            return None
+        return {
+            'id': str(job.pk),
+            'status': job.status,
+            'output_dir': job.output_dir,
+            'format_code': job.format_code,
+            'error': job.error,
+            'created_at': job.created_at,
+            'started_at': job.started_at,
+            'finished_at': job.finished_at,
+            'files': [
+                {
+                    'index': file.index,
+                    'type': file.generator_type,
+                    'name': file.name,
+                    'config': file.config,
+                    'output': file.output,
+                    'status': file.status,
+                    'error': file.error,
+                    'code': file.code
+                }
+                for file in job.files.all()
+            ]
+        }
+
+    def start(self, job_id: str) -> None:
+        GenerationJob.objects.filter(pk=job_id).update(status='running', started_at=timezone.now())
+
+    def update_file(self, job_id: str, index: int, status: str, error: str = '', code: str = '') -> None:
+        GenerationJobFile.objects.filter(job_id=job_id, index=index).update(status=status, error=error, code=code)
+
+    def finish(self, job_id: str, status: str, error: str = '') -> None:
+        GenerationJob.objects.filter(pk=job_id).update(status=status, error=error, finished_at=timezone.now())
+
+
+class LocalJobBackend:
+    """
+    Run jobs on an in-process thread pool.
+
+    With ``max_workers=0`` jobs run eagerly in the enqueuing thread, which
+    is what tests (and the database store inside a test transaction) need.
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers) if max_workers else None
+
+    def submit(self, service: 'GenerationJobService', job_id: str) -> None:
+        if self._executor is None:
+            service.run(job_id)
+        else:
+            self._executor.submit(self._run, service, job_id)
+
+    @staticmethod
+    def _run(service: 'GenerationJobService', job_id: str) -> None:
+        try:
+            service.run(job_id)
+        except Exception:
+            logger.exception("Code generation job %s failed", job_id)
+        finally:
+            # Worker threads get their own connection; don't leak it
+            connection.close()
+
+
+class CeleryJobBackend:
+    """Send jobs to the ``code_generation.run_job`` Celery task."""
+
+    def submit(self, service: 'GenerationJobService', job_id: str) -> None:
+        from .tasks import run_generation_job
+
+        if run_generation_job is None:
+            raise CodeGenerationError("The celery job backend requires Celery to be installed")
+        run_generation_job.delay(str(job_id))
+
+
+class GenerationJobService:
+    """
+    Enqueue, run and report code generation jobs.
+
+    Args:
+        store: Job store, defaults to an in-process MemoryJobStore
+        backend: Execution backend, defaults to a LocalJobBackend
+        output_root: Directory that job outputs are written under; job
+            outputs must stay inside it. Without it rendered code is kept in
+            the store.
+    """
+
+    def __init__(self, store=None, backend=None, output_root: Optional[str] = None):
+        self.store = store if store is not None else MemoryJobStore()
+        self.backend = backend if backend is not None else LocalJobBackend()
+        self.output_root = output_root
+
+    def enqueue(
+        self,
+        specs: Iterable[Dict[str, Any]],
+        output_dir: Optional[str] = None,
+        format_code: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Record a job for batch specs and submit it to the backend.
+
+        ``output_dir`` is relative to ``output_root``; each spec's ``output``
+        is relative to ``output_dir``.
+
+        Returns:
+            dict: the job summary (see ``job_summary``)
+        """
+        specs = list(specs)
+        if not specs:
+            raise InvalidConfigurationError("A generation job needs at least one spec")
+        for spec in specs:
+            if spec.get('type') not in CodeGeneratorManager().get_supported_types():
+                raise InvalidConfigurationError(f"Unknown generator type: {spec.get('type')}")
+            output = spec.get('output')
+            if output and (os.path.isabs(output) or os.path.normpath(output).startswith('..')):
+                raise InvalidConfigurationError(f"Output '{output}' must be a relative path inside the job")
+
+        if output_dir is not None and self.output_root is None:
+            raise InvalidConfigurationError("Job outputs cannot be written without an output root")
+        job_dir = ''
+        if self.output_root is not None:
+            job_dir = os.path.normpath(os.path.join(self.output_root, output_dir or ''))
+            root = os.path.normpath(self.output_root)
+            if os.path.commonpath([root, job_dir]) != root:
+                raise InvalidConfigurationError(f"Output directory '{output_dir}' is outside the output root")
+
+        job_id = self.store.create(specs, output_dir=job_dir, format_code=format_code)
+        self.backend.submit(self, job_id)
+        return job_summary(self.store.get(job_id))
+
+    def enqueue_spec(self, spec: Dict[str, Any], format_code: bool = False) -> Dict[str, Any]:
+        """Enqueue every entry of an app spec (see ``specs.expand_spec``)."""
+        if not isinstance(spec, dict) or not spec.get('app_name'):
+            raise InvalidConfigurationError("Spec requires 'app_name'")
+        output_dir = None
+        if self.output_root is not None:
+            output_dir = spec.get('output_dir') or spec['app_name']
+        return self.enqueue(expand_spec(spec), output_dir=output_dir, format_code=format_code)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return the job (with per-file configs and code), or None."""
+        return self.store.get(job_id)
+
+    def run(self, job_id: str) -> Dict[str, Any]:
+        """
+        Render every pending file of a job, recording each result as it completes.
+
+        Returns:
+            dict: the job summary
+        """
+        job = self.store.get(job_id)
+        if job is None:
+            raise CodeGenerationError(f"Generation job '{job_id}' not found")
+        if job['status'] in FINISHED_STATUSES:
+            return job_summary(job)
+
+        self.store.start(job_id)
+        pending = [file for file in job['files'] if file['status'] == 'pending']
+        specs = [
+            {
+                'type': file['type'],
+                'config': file['config'],
+                'output': os.path.join(job['output_dir'], file['output']) if job['output_dir'] and file['output'] else None
+            }
+            for file in pending
+        ]
+        try:
+            results = CodeGeneratorManager().generate_batch(specs, format_code=job['format_code'])
+            for result in results:
+                file = pending[result['index']]
+                if not result['success']:
+                    self.store.update_file(job_id, file['index'], 'failed', error=result['error'])
+                elif specs[result['index']]['output']:
+                    self.store.update_file(job_id, file['index'], 'written' if result['written'] else 'unchanged')
+                else:
+                    self.store.update_file(job_id, file['index'], 'generated', code=result['code'])
+        except Exception as e:
+            self.store.finish(job_id, 'failed', error=str(e))
+            raise CodeGenerationError(f"Generation job '{job_id}' failed: {str(e)}")
+
+        failed = any(file['status'] == 'failed' for file in self.store.get(job_id)['files'])
+        self.store.finish(job_id, 'failed' if failed else 'succeeded')
+        return job_summary(self.store.get(job_id))
+
+
+_job_service = None
+_job_service_lock = threading.Lock()
+
+
+def get_job_service() -> GenerationJobService:
+    """Return the process-wide GenerationJobService configured from settings."""
+    global _job_service
+    if _job_service is None:
+        with _job_service_lock:
+            if _job_service is None:
+                store_name = getattr(settings, 'CODE_GENERATION_JOB_STORE', 'database')
+                backend_name = getattr(settings, 'CODE_GENERATION_JOB_BACKEND', 'local')
+                if store_name not in ('database', 'memory'):
+                    raise InvalidConfigurationError(f"Unknown job store: {store_name}")
+                if backend_name not in ('local', 'celery'):
+                    raise InvalidConfigurationError(f"Unknown job backend: {backend_name}")
+                if backend_name == 'celery' and store_name == 'memory':
+                    raise InvalidConfigurationError("The celery job backend requires the database job store")
+                _job_service = GenerationJobService(
+                    store=DatabaseJobStore() if store_name == 'database' else MemoryJobStore(),
+                    backend=CeleryJobBackend() if backend_name == 'celery' else LocalJobBackend(
+                        max_workers=getattr(settings, 'CODE_GENERATION_JOB_WORKERS', 2)
+                    ),
+                    output_root=getattr(settings, 'CODE_GENERATION_JOB_OUTPUT_ROOT', None)
+                )
+    return _job_service
@@ -0,0 +1,63 @@
+"""
+Persistent records of code generation jobs (see ``jobs.DatabaseJobStore``).
+"""
+import uuid
+
+from django.db import models
+
+
+class GenerationJob(models.Model):
+    """A batch of generation specs run by the job service."""
+
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default='queued', db_index=True)
+    output_dir = models.CharField(max_length=500, blank=True)
+    format_code = models.BooleanField(default=False)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-created_at']
+
+    def __str__(self):
+        return f"{self.id} ({self.status})"
+
+
+class GenerationJobFile(models.Model):
+    """Status of one spec (one output file) of a job."""
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('generated', 'Generated'),
+        ('written', 'Written'),
+        ('unchanged', 'Unchanged'),
+        ('failed', 'Failed'),
+    ]
+
+    job = models.ForeignKey(GenerationJob, on_delete=models.CASCADE, related_name='files')
+    index = models.PositiveIntegerField()
+    generator_type = models.CharField(max_length=32)
+    name = models.CharField(max_length=200, blank=True)
+    config = models.JSONField(default=dict)
+    output = models.CharField(max_length=500, blank=True)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default='pending')
+    error = models.TextField(blank=True)
+    code = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ['index']
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'index'], name='code_generation_job_file_index'),
+        ]
+
+    def __str__(self):
+        return f"{self.output or self.name} ({self.status})"
@@ -0,0 +1,178 @@
+"""
+Spec files and manifests for incremental code generation.
+
+A spec file (YAML or JSON) describes a whole app::
+
+    app_name: shop
+    output_dir: shop          # relative to the spec file, defaults to app_name
+    crud: true                # add an APIView and serializer for every model;
+                              # or a mapping of APIView options, e.g.
+                              # {pagination: keyset, read_serializer: true,
+                              #  performance_tests: 500}
+    models:
+      - name: Product
+        fields:
+          - {name: title, type: CharField, max_length: 200}
+    views:
+      - {name: ProductListView, type: ListView, model: Product}
+    serializers: []
+    benchmarks: []            # serializer_benchmark configs
+    tests: []                 # performance_test configs
+
+Every entry may set ``output`` (relative to ``output_dir``); otherwise it is
+written to ``<section>/<snake_case_name>.py``.
+
+The manifest stores, per output file, the hash of the entry's config, the
+hash of the template that rendered it and the hash of the rendered output,
+so unchanged entries can be skipped without rendering.
+"""
+import hashlib
+import json
+import os
+import re
+from typing import Any, Dict, Iterable, List
+
+import yaml
+
+from .exceptions import InvalidConfigurationError
+from .generators import build_crud_configs
+from .writers import atomic_write
+
+
+DEFAULT_MANIFEST_NAME = '.antman-manifest.json'
+MANIFEST_VERSION = 1
+
+# Spec section -> generator type
+SECTION_TYPES = (
+    ('models', 'model'),
+    ('views', 'view'),
+    ('serializers', 'serializer'),
+    ('benchmarks', 'serializer_benchmark'),
+    ('tests', 'performance_test'),
+)
+
+
+def content_hash(content: str) -> str:
+    """Return the SHA-256 hex digest of text content."""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def config_hash(generator_type: str, config: Dict[str, Any]) -> str:
+    """Return a canonical hash of a generator config."""
+    canonical = json.dumps([generator_type, config], sort_keys=True, separators=(',', ':'), default=str)
+    return content_hash(canonical)
+
+
+def snake_case(name: str) -> str:
+    """Convert a CamelCase name to snake_case ('ProductAPIView' -> 'product_api_view')."""
+    name = re.sub(r'([A-Z]+)([A-Z][a-z])', r'\1_\2', name)
+    return re.sub(r'([a-z0-9])([A-Z])', r'\1_\2', name).lower()
+
+
+def load_spec(spec_path: str) -> Dict[str, Any]:
+    """Load a YAML or JSON spec file."""
+    try:
+        with open(spec_path, 'r', encoding='utf-8') as f:
+            if spec_path.endswith('.json'):
+                spec = json.load(f)
+            else:
+                spec = yaml.safe_load(f)
+    except FileNotFoundError:
+        raise InvalidConfigurationError(f"Spec file '{spec_path}' not found")
+    except (ValueError, yaml.YAMLError) as e:
+        raise InvalidConfigurationError(f"Invalid spec file '{spec_path}': {str(e)}")
+
+    if not isinstance(spec, dict):
+        raise InvalidConfigurationError("Spec must be a mapping")
+    if not spec.get('app_name'):
+        raise InvalidConfigurationError("Spec requires 'app_name'")
+    return spec
+
+
+def expand_spec(spec: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Expand a spec into batch specs for ``CodeGeneratorManager.generate_batch``.
+
+    Returns:
+        list: dicts with ``type``, ``config`` and ``output`` (relative path)
+    """
+    app_name = spec['app_name']
+    entries = {kind: [dict(config) for config in spec.get(section) or []] for section, kind in SECTION_TYPES}
+
+    if spec.get('crud'):
+        # ``crud`` may be a mapping of APIView options (pagination, bulk, ...)
+        view_options = spec['crud'] if isinstance(spec['crud'], dict) else None
+        for kind in ('view', 'serializer', 'serializer_benchmark', 'performance_test'):
+            names = {config.get('name') for config in entries[kind]}
+            for model_config in entries['model']:
+                config = build_crud_configs(model_config, app_name, view_options).get(kind)
+                if config is None or config['name'] in names:
+                    continue
+                if kind == 'serializer_benchmark':
+                    config['output'] = f"benchmarks/{config['script_name']}"
+                entries[kind].append(config)
+
+    batch_specs = []
+    outputs = set()
+    for section, kind in SECTION_TYPES:
+        for config in entries[kind]:
+            if not config.get('name'):
+                raise InvalidConfigurationError(f"Every entry in '{section}' requires a name")
+            output = config.pop('output', None) or f"{section}/{snake_case(config['name'])}.py"
+            if output in outputs:
+                raise InvalidConfigurationError(f"Output '{output}' is produced by more than one entry")
+            outputs.add(output)
+            if kind != 'model':
+                config.setdefault('app_name', app_name)
+            batch_specs.append({'type': kind, 'config': config, 'output': output})
+    return batch_specs
+
+
+class GenerationManifest:
+    """
+    Per-output record of input, template and output hashes.
+
+    Output paths are relative to ``output_dir``, the directory the files are
+    written to, which defaults to the manifest's own directory.
+    """
+
+    def __init__(self, path: str, output_dir: str = None):
+        self.path = path
+        self.base_dir = os.path.abspath(output_dir) if output_dir else os.path.dirname(os.path.abspath(path))
+        self.entries: Dict[str, Dict[str, str]] = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == MANIFEST_VERSION:
+                    self.entries = data.get('files', {})
+            except (OSError, ValueError):
+                # A corrupt manifest only costs a full regeneration
+                self.entries = {}
+
+    def is_current(self, output: str, input_hash: str, template_hash: str) -> bool:
+        """Return True if ``output`` was rendered from the same inputs and is untouched on disk."""
+        entry = self.entries.get(output)
+        if not entry or entry.get('input_hash') != input_hash or entry.get('template_hash') != template_hash:
+            return False
+        try:
+            with open(os.path.join(self.base_dir, output), 'r', encoding='utf-8') as f:
+                return content_hash(f.read()) == entry.get('output_hash')
+        except OSError:
+            return False
+
+    def record(self, output: str, input_hash: str, template_hash: str, output_hash: str) -> None:
+        self.entries[output] = {
+            'input_hash': input_hash,
+            'template_hash': template_hash,
+            'output_hash': output_hash
+        }
+
+    def retain(self, outputs: Iterable[str]) -> None:
+        """Drop entries for outputs no longer produced by the spec."""
+        keep = set(outputs)
+        self.entries = {output: entry for output, entry in self.entries.items() if output in keep}
+
+    def save(self) -> None:
+        data = {'version': MANIFEST_VERSION, 'files': self.entries}
+        atomic_write(self.path, json.dumps(data, indent=2, sort_keys=True))
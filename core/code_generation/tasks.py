@@ -0,0 +1,21 @@
+"""
+Celery task for code generation jobs (see ``jobs.CeleryJobBackend``).
+
+Celery is optional: without it ``run_generation_job`` is None and only the
+local job backend is available.
+"""
+try:
+    from celery import shared_task
+except ImportError:
+    shared_task = None
+
+
+if shared_task is not None:
+    @shared_task(name='code_generation.run_job')
+    def run_generation_job(job_id):
+        """Run a queued generation job in a Celery worker."""
+        from .jobs import get_job_service
+
+        get_job_service().run(job_id)
+else:
+    run_generation_job = None
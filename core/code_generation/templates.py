@@ -1,21 +1,71 @@
 """
 Template management system for code generation.
 """
+import hashlib
 import os
+import threading
+import time
+from collections import OrderedDict
 from typing import Dict, Any
-from jinja2 import Environment, FileSystemLoader, Template
+from django.conf import settings
+from jinja2 import Environment, FileSystemBytecodeCache, FunctionLoader, Template, TemplateNotFound
 from .exceptions import CodeGenerationError, TemplateNotFoundError
 
 
 class TemplateManager:
-    """Manages code generation templates."""
+    """
+    Manages code generation templates.
     
-    def __init__(self, template_dir=None):
+    Templates are compiled once per process and reused: file templates by
+    name through the Jinja environment's cache, built-in templates by name and
+    ad-hoc template strings by the SHA-1 of their source. An optional
+    on-disk bytecode cache lets new worker processes skip compilation.
+    
+    Template files are indexed once into an in-memory registry (name ->
+    path, mtime, size, hash, source), so lookups, listing and up-to-date
+    checks never touch the disk. With ``auto_reload`` the registry is
+    refreshed by polling mtimes at most every ``poll_interval`` seconds and
+    only changed files are re-read; without it the registry is frozen after
+    the first scan (``refresh()`` still rescans on demand).
+    
+    Built-in and ad-hoc templates render through an overlay of the same
+    environment that keeps ``jinja2.Template`` defaults (no trim_blocks or
+    lstrip_blocks), so their output is unchanged.
+    """
+    
+    INLINE_PREFIX = 'inline/'
+    MAX_INLINE_TEMPLATES = 256
+    TEMPLATE_EXTENSIONS = ('.j2', '.jinja', '.template')
+    
+    def __init__(self, template_dir=None, bytecode_cache_dir=None, auto_reload=True, poll_interval=1.0):
         self.template_dir = template_dir or self._get_default_template_dir()
+        self.auto_reload = auto_reload
+        self.poll_interval = poll_interval
+        bytecode_cache = None
+        if bytecode_cache_dir:
+            os.makedirs(bytecode_cache_dir, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
         self.env = Environment(
-            loader=FileSystemLoader(self.template_dir),
+            loader=FunctionLoader(self._get_file_source),
             trim_blocks=True,
-            lstrip_blocks=True
+            lstrip_blocks=True,
+            bytecode_cache=bytecode_cache
+        )
+        
+        # Template files by name ('/'-separated, relative to template_dir)
+        self._registry = None
+        self._last_poll = 0.0
+        self._registry_lock = threading.Lock()
+        
+        # Sources of built-in and ad-hoc templates, looked up by name
+        self._sources = dict(BUILTIN_TEMPLATES)
+        self._inline_names = OrderedDict()
+        self._template_hashes = {}
+        self._lock = threading.Lock()
+        self.source_env = self.env.overlay(
+            loader=FunctionLoader(self._get_source),
+            trim_blocks=False,
+            lstrip_blocks=False
         )
     
     def _get_default_template_dir(self):
@@ -23,8 +73,131 @@ class TemplateManager:
         current_dir = os.path.dirname(os.path.abspath(__file__))
         return os.path.join(current_dir, 'templates')
     
+    def _get_source(self, name):
+        source = self._sources.get(name)
+        if source is None:
+            return None
+        # Sources are immutable for a given name
+        return source, None, lambda: True
+    
+    def _scan(self, previous: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """Index the template directory, re-reading only files whose mtime or size changed."""
+        registry = {}
+        if not os.path.isdir(self.template_dir):
+            return registry
+        for root, dirs, files in os.walk(self.template_dir):
+            for file in files:
+                path = os.path.join(root, file)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                name = os.path.relpath(path, self.template_dir).replace(os.sep, '/')
+                entry = previous.get(name)
+                if entry is None or entry['mtime'] != stat.st_mtime_ns or entry['size'] != stat.st_size:
+                    try:
+                        with open(path, 'r', encoding='utf-8') as f:
+                            source = f.read()
+                    except (OSError, UnicodeDecodeError):
+                        continue
+                    entry = {
+                        'path': path,
+                        'mtime': stat.st_mtime_ns,
+                        'size': stat.st_size,
+                        'hash': hashlib.sha256(source.encode('utf-8')).hexdigest(),
+                        'source': source
+                    }
+                registry[name] = entry
+        return registry
+    
+    def refresh(self) -> Dict[str, Dict[str, Any]]:
+        """Rescan the template directory and return the registry."""
+        with self._registry_lock:
+            self._registry = self._scan(self._registry or {})
+            self._last_poll = time.monotonic()
+            return self._registry
+    
+    def _get_registry(self) -> Dict[str, Dict[str, Any]]:
+        registry = self._registry
+        if registry is None or (
+            self.auto_reload and time.monotonic() - self._last_poll >= self.poll_interval
+        ):
+            registry = self.refresh()
+        return registry
+    
+    def _get_file_source(self, name):
+        entry = self._get_registry().get(name)
+        if entry is None:
+            return None
+        # A changed file gets a new registry entry; no stat() per lookup
+        return entry['source'], entry['path'], lambda: self._get_registry().get(name) is entry
+    
+    def get_builtin_template(self, name: str) -> Template:
+        """Return the compiled built-in template ('model', 'view', 'serializer', ...)."""
+        if name not in BUILTIN_TEMPLATES:
+            raise TemplateNotFoundError(f"Built-in template '{name}' not found")
+        return self.source_env.get_template(name)
+    
+    def get_template_hash(self, name: str) -> str:
+        """Return the SHA-256 of a built-in template's (or template file's) source, for change detection."""
+        template_hash = self._template_hashes.get(name)
+        if template_hash is None:
+            if name not in BUILTIN_TEMPLATES:
+                entry = self._get_registry().get(name.replace(os.sep, '/'))
+                if entry is None:
+                    raise TemplateNotFoundError(f"Template '{name}' not found")
+                # File templates can change; their hash is never memoized here
+                return entry['hash']
+            template_hash = hashlib.sha256(BUILTIN_TEMPLATES[name].encode('utf-8')).hexdigest()
+            self._template_hashes[name] = template_hash
+        return template_hash
+
+    def get_source_template(self, template_content: str) -> Template:
+        """Return the compiled template for a template string, keyed by source hash."""
+        name = self.INLINE_PREFIX + hashlib.sha1(template_content.encode('utf-8')).hexdigest()
+        with self._lock:
+            if name in self._inline_names:
+                self._inline_names.move_to_end(name)
+            else:
+                self._sources[name] = template_content
+                self._inline_names[name] = None
+                if len(self._inline_names) > self.MAX_INLINE_TEMPLATES:
+                    evicted, _ = self._inline_names.popitem(last=False)
+                    del self._sources[evicted]
+        return self.source_env.get_template(name)
+    
+    def precompile(self, include_files: bool = True) -> int:
+        """
+        Compile built-in templates (and template files) ahead of first use.
+        
+        Returns:
+            int: Number of templates compiled
+        """
+        count = 0
+        for name in BUILTIN_TEMPLATES:
+            self.get_builtin_template(name)
+            count += 1
+        if include_files and os.path.isdir(self.template_dir):
+            for name in self.list_templates():
+                self.get_template(name)
+                count += 1
+        return count
+    
+    def get_template(self, template_name: str) -> Template:
+        """Return the compiled template file ``template_name``."""
+        try:
+            return self.env.get_template(template_name.replace(os.sep, '/'))
+        except TemplateNotFound:
+            raise TemplateNotFoundError(f"Template '{template_name}' not found")
+    
     def load_template(self, template_name: str) -> str:
         """Load template content from file."""
+        entry = self._get_registry().get(template_name.replace(os.sep, '/'))
+        if entry is not None:
+            return entry['source']
+        if not self.auto_reload:
+            raise TemplateNotFoundError(f"Template '{template_name}' not found")
+        # Not indexed yet (created since the last poll)
         try:
             template_path = os.path.join(self.template_dir, template_name)
             with open(template_path, 'r', encoding='utf-8') as f:
@@ -37,15 +210,15 @@ class TemplateManager:
     def render_template(self, template_content: str, context: Dict[str, Any]) -> str:
         """Render template with given context."""
         try:
-            template = Template(template_content)
+            template = self.get_source_template(template_content)
             return template.render(**context)
         except Exception as e:
             raise CodeGenerationError(f"Error rendering template: {str(e)}")
     
     def render_template_file(self, template_name: str, context: Dict[str, Any]) -> str:
         """Load and render template file."""
+        template = self.get_template(template_name)
         try:
-            template = self.env.get_template(template_name)
             return template.render(**context)
         except Exception as e:
             raise CodeGenerationError(f"Error rendering template '{template_name}': {str(e)}")
@@ -53,17 +226,47 @@ class TemplateManager:
     def list_templates(self) -> list:
         """List available templates."""
         try:
-            templates = []
-            for root, dirs, files in os.walk(self.template_dir):
-                for file in files:
-                    if file.endswith(('.j2', '.jinja', '.template')):
-                        rel_path = os.path.relpath(os.path.join(root, file), self.template_dir)
-                        templates.append(rel_path)
-            return templates
+            return sorted(
+                name.replace('/', os.sep) for name in self._get_registry()
+                if name.endswith(self.TEMPLATE_EXTENSIONS)
+            )
         except Exception as e:
             raise CodeGenerationError(f"Error listing templates: {str(e)}")
 
 
+_shared_manager = None
+_shared_manager_lock = threading.Lock()
+
+
+def get_template_manager() -> TemplateManager:
+    """
+    Return the process-wide TemplateManager shared by all generators.
+    
+    ``settings.CODE_GENERATION_BYTECODE_CACHE_DIR`` enables the on-disk
+    bytecode cache and ``CODE_GENERATION_TEMPLATE_AUTO_RELOAD`` (default
+    ``DEBUG``) hot reloading of template files, polled every
+    ``CODE_GENERATION_TEMPLATE_POLL_INTERVAL`` seconds, when Django settings
+    are configured. Otherwise the template registry is frozen.
+    """
+    global _shared_manager
+    if _shared_manager is None:
+        with _shared_manager_lock:
+            if _shared_manager is None:
+                bytecode_cache_dir = None
+                auto_reload = False
+                poll_interval = 1.0
+                if settings.configured:
+                    bytecode_cache_dir = getattr(settings, 'CODE_GENERATION_BYTECODE_CACHE_DIR', None)
+                    auto_reload = getattr(settings, 'CODE_GENERATION_TEMPLATE_AUTO_RELOAD', settings.DEBUG)
+                    poll_interval = getattr(settings, 'CODE_GENERATION_TEMPLATE_POLL_INTERVAL', 1.0)
+                _shared_manager = TemplateManager(
+                    bytecode_cache_dir=bytecode_cache_dir,
+                    auto_reload=auto_reload,
+                    poll_interval=poll_interval
+                )
+    return _shared_manager
+
+
 # Template content constants
 MODEL_TEMPLATE = """from django.db import models
 {% if imports %}
@@ -77,30 +280,32 @@ class {{ model_name }}(models.Model):
     \"\"\"{{ model_description|default('Model description.') }}\"\"\"
     
     {% for field in fields %}
-    {% if field.type == 'CharField' %}
-    {{ field.name }} = models.CharField(max_length={{ field.max_length|default(200) }}{% if field.blank %}, blank=True{% endif %}{% if field.null %}, null=True{% endif %}{% if field.default %}, default='{{ field.default }}'{% endif %})
+    {% if field.arguments is defined %}
+    {{ field.name }} = models.{{ field.type }}({{ field.arguments }})
+    {% elif field.type == 'CharField' %}
+    {{ field.name }} = models.CharField(max_length={{ field.max_length|default(200) }}{% if field.blank %}, blank=True{% endif %}{% if field.null %}, null=True{% endif %}{% if field.default %}, default='{{ field.default }}'{% endif %}{% if field.db_index %}, db_index=True{% endif %})
     {% elif field.type == 'TextField' %}
-    {{ field.name }} = models.TextField({% if field.blank %}blank=True{% endif %}{% if field.null %}{% if field.blank %}, {% endif %}null=True{% endif %}{% if field.default %}{% if field.blank or field.null %}, {% endif %}default='{{ field.default }}'{% endif %})
+    {{ field.name }} = models.TextField({% if field.blank %}blank=True{% endif %}{% if field.null %}{% if field.blank %}, {% endif %}null=True{% endif %}{% if field.default %}{% if field.blank or field.null %}, {% endif %}default='{{ field.default }}'{% endif %}{% if field.db_index %}{% if field.blank or field.null or field.default %}, {% endif %}db_index=True{% endif %})
     {% elif field.type == 'IntegerField' %}
-    {{ field.name }} = models.IntegerField({% if field.default %}default={{ field.default }}{% endif %}{% if field.null %}{% if field.default %}, {% endif %}null=True{% endif %})
+    {{ field.name }} = models.IntegerField({% if field.default %}default={{ field.default }}{% endif %}{% if field.null %}{% if field.default %}, {% endif %}null=True{% endif %}{% if field.db_index %}{% if field.default or field.null %}, {% endif %}db_index=True{% endif %})
     {% elif field.type == 'PositiveIntegerField' %}
-    {{ field.name }} = models.PositiveIntegerField({% if field.default %}default={{ field.default }}{% endif %}{% if field.null %}{% if field.default %}, {% endif %}null=True{% endif %})
+    {{ field.name }} = models.PositiveIntegerField({% if field.default %}default={{ field.default }}{% endif %}{% if field.null %}{% if field.default %}, {% endif %}null=True{% endif %}{% if field.db_index %}{% if field.default or field.null %}, {% endif %}db_index=True{% endif %})
     {% elif field.type == 'DecimalField' %}
-    {{ field.name }} = models.DecimalField(max_digits={{ field.max_digits|default(10) }}, decimal_places={{ field.decimal_places|default(2) }}{% if field.default %}, default={{ field.default }}{% endif %}{% if field.null %}, null=True{% endif %})
+    {{ field.name }} = models.DecimalField(max_digits={{ field.max_digits|default(10) }}, decimal_places={{ field.decimal_places|default(2) }}{% if field.default %}, default={{ field.default }}{% endif %}{% if field.null %}, null=True{% endif %}{% if field.db_index %}, db_index=True{% endif %})
     {% elif field.type == 'BooleanField' %}
-    {{ field.name }} = models.BooleanField(default={{ field.default|default('False') }})
+    {{ field.name }} = models.BooleanField(default={{ field.default|default('False') }}{% if field.db_index %}, db_index=True{% endif %})
     {% elif field.type == 'DateTimeField' %}
-    {{ field.name }} = models.DateTimeField({% if field.auto_now_add %}auto_now_add=True{% elif field.auto_now %}auto_now=True{% endif %}{% if field.default and not field.auto_now_add and not field.auto_now %}, default='{{ field.default }}'{% endif %}{% if field.null %}, null=True{% endif %})
+    {{ field.name }} = models.DateTimeField({% if field.auto_now_add %}auto_now_add=True{% elif field.auto_now %}auto_now=True{% endif %}{% if field.default and not field.auto_now_add and not field.auto_now %}, default='{{ field.default }}'{% endif %}{% if field.null %}, null=True{% endif %}{% if field.db_index %}{% if field.auto_now_add or field.auto_now or field.default or field.null %}, {% endif %}db_index=True{% endif %})
     {% elif field.type == 'DateField' %}
-    {{ field.name }} = models.DateField({% if field.auto_now_add %}auto_now_add=True{% elif field.auto_now %}auto_now=True{% endif %}{% if field.default and not field.auto_now_add and not field.auto_now %}, default='{{ field.default }}'{% endif %}{% if field.null %}, null=True{% endif %})
+    {{ field.name }} = models.DateField({% if field.auto_now_add %}auto_now_add=True{% elif field.auto_now %}auto_now=True{% endif %}{% if field.default and not field.auto_now_add and not field.auto_now %}, default='{{ field.default }}'{% endif %}{% if field.null %}, null=True{% endif %}{% if field.db_index %}{% if field.auto_now_add or field.auto_now or field.default or field.null %}, {% endif %}db_index=True{% endif %})
     {% elif field.type == 'ForeignKey' %}
-    {{ field.name }} = models.ForeignKey(to='{{ field.to }}', on_delete=models.{{ field.on_delete|default('CASCADE') }}{% if field.related_name %}, related_name='{{ field.related_name }}'{% endif %}{% if field.null %}, null=True{% endif %}{% if field.blank %}, blank=True{% endif %})
+    {{ field.name }} = models.ForeignKey(to='{{ field.to }}', on_delete=models.{{ field.on_delete|default('CASCADE') }}{% if field.related_name %}, related_name='{{ field.related_name }}'{% endif %}{% if field.null %}, null=True{% endif %}{% if field.blank %}, blank=True{% endif %}{% if field.db_index is sameas false %}, db_index=False{% endif %})
     {% elif field.type == 'ManyToManyField' %}
     {{ field.name }} = models.ManyToManyField('{{ field.to }}'{% if field.related_name %}, related_name='{{ field.related_name }}'{% endif %}{% if field.blank %}, blank=True{% endif %})
     {% elif field.type == 'OneToOneField' %}
     {{ field.name }} = models.OneToOneField('{{ field.to }}', on_delete=models.{{ field.on_delete|default('CASCADE') }}{% if field.related_name %}, related_name='{{ field.related_name }}'{% endif %}{% if field.null %}, null=True{% endif %})
     {% else %}
-    {{ field.name }} = models.{{ field.type }}({% if field.options %}{{ field.options }}{% endif %})
+    {{ field.name }} = models.{{ field.type }}({% if field.options %}{{ field.options }}{% endif %}{% if field.db_index %}{% if field.options %}, {% endif %}db_index=True{% endif %})
     {% endif %}
     {% endfor %}
     
@@ -123,8 +328,18 @@ class {{ model_name }}(models.Model):
         {% endif %}
         {% if db_table %}
         db_table = "{{ db_table }}"
+        {% endif %}{% if managed is sameas false %}
+        managed = False
+        {% endif %}{% if indexes %}
+        indexes = [
+            {% for index in indexes %}
+            models.Index(fields={{ index.fields }}{% if index.name %}, name='{{ index.name }}'{% endif %}{% if index.include %}, include={{ index.include }}{% endif %}),
+            {% endfor %}
+        ]
+        {% endif %}{% if unique_together %}
+        unique_together = {{ unique_together }}
         {% endif %}
-        {% if not verbose_name and not verbose_name_plural and not ordering and not db_table %}
+        {% if not verbose_name and not verbose_name_plural and not ordering and not db_table and managed is not sameas false and not indexes and not unique_together %}
         pass
         {% endif %}
 """
@@ -181,6 +396,284 @@ class {{ view_name }}(CreateView):
     template_name = '{{ app_name }}/{{ model_name|lower }}_form.html'
     success_url = reverse_lazy('{{ app_name }}:{{ model_name|lower }}-list')
 
+{% elif view_type == 'APIView' and optimized %}
+{%- if pagination == 'keyset' and keyset_tiebreak %}
+import base64
+
+{%- endif %}
+{%- if pagination == 'keyset' or bulk %}
+from django.core.exceptions import ValidationError as DjangoValidationError
+{%- endif %}
+{%- if bulk %}
+from django.db import transaction
+{%- endif %}
+{%- if pagination == 'keyset' and keyset_tiebreak %}
+from django.db.models import Q
+{%- endif %}
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+{%- if pagination == 'keyset' %}
+from rest_framework.exceptions import ValidationError
+{%- endif %}
+from {{ app_name }}.models import {{ model_name }}
+from {{ app_name }}.serializers import {% if read_serializer %}{{ model_name }}ReadSerializer, {% endif %}{{ model_name }}Serializer
+
+
+class {{ view_name }}(APIView):
+    \"\"\"API view for {{ model_name }} objects.\"\"\"
+    {%- if pagination %}
+
+    page_size = {{ page_size }}
+    max_page_size = {{ max_page_size }}
+    {%- endif %}
+    {%- if bulk %}
+
+    max_batch_size = {{ max_batch_size }}
+    {%- endif %}
+
+    def get_queryset(self):
+        \"\"\"Return the base queryset of {{ model_name }} objects.\"\"\"
+        queryset = {{ model_name }}.objects.all()
+        {%- if select_related %}
+        queryset = queryset.select_related({{ select_related }})
+        {%- endif %}
+        {%- if prefetch_related %}
+        queryset = queryset.prefetch_related({{ prefetch_related }})
+        {%- endif %}
+        return queryset
+    {%- if pagination %}
+
+    @staticmethod
+    def get_query_int(request, name, default, minimum, maximum=None):
+        \"\"\"Read a bounded integer query parameter.\"\"\"
+        try:
+            value = max(int(request.query_params.get(name, default)), minimum)
+        except (TypeError, ValueError):
+            value = default
+        return min(value, maximum) if maximum is not None else value
+    {%- endif %}
+    {%- if pagination == 'limit_offset' %}
+
+    def paginate(self, request, queryset):
+        \"\"\"Return one ``limit``/``offset`` page without counting the table.\"\"\"
+        limit = self.get_query_int(request, 'limit', self.page_size, 1, self.max_page_size)
+        offset = self.get_query_int(request, 'offset', 0, 0)
+        rows = list(queryset.order_by({{ ordering }})[offset:offset + limit + 1])
+        has_next = len(rows) > limit
+        return rows[:limit], {
+            'limit': limit,
+            'offset': offset,
+            'next_offset': offset + limit if has_next else None,
+        }
+    {%- elif pagination == 'keyset' %}
+
+    def paginate(self, request, queryset):
+        \"\"\"Return the page after the ``cursor`` {% if keyset_tiebreak %}({{ keyset_field }} and pk){% else %}value of {{ keyset_field }}{% endif %}.\"\"\"
+        limit = self.get_query_int(request, 'limit', self.page_size, 1, self.max_page_size)
+        cursor = request.query_params.get('cursor')
+        if cursor:
+            {%- if keyset_tiebreak %}
+            try:
+                value, separator, pk = base64.urlsafe_b64decode(cursor.encode()).decode().rpartition('|')
+                if not separator:
+                    raise ValueError(cursor)
+                queryset = queryset.filter(
+                    Q({{ keyset_field }}__{{ keyset_op }}=value) | Q({{ keyset_field }}=value, pk__{{ keyset_op }}=pk)
+                )
+            except (TypeError, ValueError, DjangoValidationError):
+                raise ValidationError({'cursor': 'Invalid cursor'})
+            {%- else %}
+            try:
+                queryset = queryset.filter({{ keyset_field }}__{{ keyset_op }}=cursor)
+            except (TypeError, ValueError, DjangoValidationError):
+                raise ValidationError({'cursor': 'Invalid cursor'})
+            {%- endif %}
+        rows = list(queryset.order_by({{ keyset_order_by }})[:limit + 1])
+        has_next = len(rows) > limit
+        rows = rows[:limit]
+        return rows, {
+            'limit': limit,
+            {%- if keyset_tiebreak %}
+            'next_cursor': self.get_cursor(rows[-1]) if has_next else None,
+            {%- else %}
+            'next_cursor': {% if read_serializer %}rows[-1]['{{ keyset_field }}']{% else %}rows[-1].{{ keyset_field }}{% endif %} if has_next else None,
+            {%- endif %}
+        }
+    {%- if keyset_tiebreak %}
+
+    @staticmethod
+    def get_cursor(row):
+        \"\"\"Return the cursor after ``row``: its {{ keyset_field }} at full precision and its pk.\"\"\"
+        {%- if read_serializer %}
+        value, pk = row['{{ keyset_field }}'], row['pk']
+        {%- else %}
+        value, pk = row.{{ keyset_field }}, row.pk
+        {%- endif %}
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        return base64.urlsafe_b64encode(f'{value}|{pk}'.encode()).decode()
+    {%- endif %}
+    {%- endif %}
+    {%- if 'GET' in methods %}
+
+    def get(self, request, pk=None):
+        \"\"\"Retrieve {{ model_name }} object(s).\"\"\"
+        if pk:
+            try:
+                obj = self.get_queryset().get(pk=pk)
+            except {{ model_name }}.DoesNotExist:
+                return Response(
+                    {'error': '{{ model_name }} not found'},
+                    status=status.HTTP_404_NOT_FOUND
+                )
+            serializer = {{ model_name }}Serializer(obj)
+            return Response(serializer.data)
+
+        objects = {% if read_serializer %}{{ model_name }}ReadSerializer.project(self.get_queryset(){% if pagination == 'keyset' %}, {{ keyset_columns }}{% endif %}){% else %}self.get_queryset(){{ projection }}{% endif %}
+        {%- if pagination %}
+        page, meta = self.paginate(request, objects)
+        serializer = {{ list_serializer }}(page, many=True)
+        return Response({'results': serializer.data, **meta})
+        {%- else %}
+        serializer = {{ list_serializer }}(objects, many=True)
+        return Response(serializer.data)
+        {%- endif %}
+    {%- endif %}
+    {%- if 'POST' in methods %}
+
+    def post(self, request):
+        \"\"\"Create a {{ model_name }} object{% if bulk %}, or many from a list{% endif %}.\"\"\"
+        {%- if bulk %}
+        if isinstance(request.data, list):
+            return self.bulk_create(request)
+        {%- endif %}
+        serializer = {{ model_name }}Serializer(data=request.data)
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    {%- if bulk %}
+
+    def bulk_create(self, request):
+        \"\"\"Validate a list of {{ model_name }} objects and insert them with bulk_create().\"\"\"
+        if len(request.data) > self.max_batch_size:
+            return Response(
+                {'error': f'At most {self.max_batch_size} objects per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        serializer = {{ model_name }}Serializer(data=request.data, many=True)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        rows = [dict(item) for item in serializer.validated_data]
+        {%- if m2m_fields %}
+        relations = [{name: row.pop(name) for name in {{ m2m_fields }} if name in row} for row in rows]
+        {%- endif %}
+        with transaction.atomic():
+            objects = {{ model_name }}.objects.bulk_create([{{ model_name }}(**row) for row in rows])
+            {%- if m2m_fields %}
+            for obj, values in zip(objects, relations):
+                for name, related in values.items():
+                    getattr(obj, name).set(related)
+            {%- endif %}
+        serializer = {{ model_name }}Serializer(objects, many=True)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+    {%- endif %}
+    {%- endif %}
+    {%- if 'PUT' in methods %}
+
+    def put(self, request, pk):
+        \"\"\"Update {{ model_name }} object.\"\"\"
+        try:
+            obj = self.get_queryset().get(pk=pk)
+        except {{ model_name }}.DoesNotExist:
+            return Response(
+                {'error': '{{ model_name }} not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        serializer = {{ model_name }}Serializer(obj, data=request.data)
+        if serializer.is_valid():
+            serializer.save()
+            return Response(serializer.data)
+        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    {%- if bulk %}
+
+    def patch(self, request):
+        \"\"\"Partially update many {{ model_name }} objects with bulk_update().\"\"\"
+        if not isinstance(request.data, list) or not all(
+            isinstance(item, dict) and item.get('id') is not None for item in request.data
+        ):
+            return Response(
+                {'error': 'Expected a list of objects with an id'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(request.data) > self.max_batch_size:
+            return Response(
+                {'error': f'At most {self.max_batch_size} objects per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            # Payload ids may be strings ("5"); look them up as primary key values
+            ids = [{{ model_name }}._meta.pk.to_python(item['id']) for item in request.data]
+        except DjangoValidationError as e:
+            return Response({'error': 'Invalid id', 'detail': e.messages}, status=status.HTTP_400_BAD_REQUEST)
+        instances = self.get_queryset().in_bulk(ids)
+        missing = [item['id'] for item, pk in zip(request.data, ids) if pk not in instances]
+        if missing:
+            return Response(
+                {'error': '{{ model_name }} not found', 'ids': missing},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        objects, fields, errors = [], set(), {}
+        {%- if m2m_fields %}
+        relations = []
+        {%- endif %}
+        for item, pk in zip(request.data, ids):
+            obj = instances[pk]
+            serializer = {{ model_name }}Serializer(obj, data=item, partial=True)
+            if not serializer.is_valid():
+                errors[str(item['id'])] = serializer.errors
+                continue
+            values = dict(serializer.validated_data)
+            {%- if m2m_fields %}
+            relations.append((obj, {name: values.pop(name) for name in {{ m2m_fields }} if name in values}))
+            {%- endif %}
+            for name, value in values.items():
+                setattr(obj, name, value)
+            fields.update(values)
+            objects.append(obj)
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        with transaction.atomic():
+            if fields:
+                {{ model_name }}.objects.bulk_update(objects, sorted(fields))
+            {%- if m2m_fields %}
+            for obj, values in relations:
+                for name, related in values.items():
+                    getattr(obj, name).set(related)
+            {%- endif %}
+        serializer = {{ model_name }}Serializer(objects, many=True)
+        return Response(serializer.data)
+    {%- endif %}
+    {%- endif %}
+    {%- if 'DELETE' in methods %}
+
+    def delete(self, request, pk):
+        \"\"\"Delete {{ model_name }} object.\"\"\"
+        deleted, _ = {{ model_name }}.objects.filter(pk=pk).delete()
+        if not deleted:
+            return Response(
+                {'error': '{{ model_name }} not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    {%- endif %}
+
 {% elif view_type == 'APIView' %}
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -309,4 +802,274 @@ class {{ serializer_name }}(serializers.ModelSerializer):
         {{ method.body|default('return None') }}
     {% endfor %}
     {% endif %}
+{%- if read_fields %}
+
+
+class {{ model_name }}ReadSerializer:
+    \"\"\"
+    Read-only projection of {{ model_name }} rows for list endpoints.
+
+    Converts ``values()`` rows with a precompiled accessor table instead of
+    building serializer fields per object; ``data`` matches {{ serializer_name }}
+    for these fields.
+    \"\"\"
+
+    fields = {{ read_fields }}
+    converters = (
+        {%- for name, converter in read_converters %}
+        ('{{ name }}', {{ converter }}),
+        {%- endfor %}
+    )
+
+    def __init__(self, rows, many=True):
+        self.rows = rows
+
+    @classmethod
+    def project(cls, queryset, *extra):
+        \"\"\"Return the ``values()`` rows of ``queryset`` this serializer reads.\"\"\"
+        return queryset.prefetch_related(None).values(*dict.fromkeys(cls.fields + extra))
+
+    @property
+    def data(self):
+        rows = list(self.rows)
+        {%- if read_converters %}
+        for row in rows:
+            for name, convert in self.converters:
+                value = row[name]
+                if value is not None:
+                    row[name] = convert(value)
+        {%- endif %}
+        return rows
+{% endif %}
+"""
+
+SERIALIZER_BENCHMARK_TEMPLATE = """\"\"\"
+Rows/sec of {{ serializer_name }} against {{ model_name }}ReadSerializer.
+
+Fetches and serializes the first --rows {{ model_name }} rows the way a list
+endpoint does, best of --repeat runs, on the configured database.
+
+Usage:
+    DJANGO_SETTINGS_MODULE=<settings> python {{ script_name }} [--rows N] [--repeat N]
+\"\"\"
+import argparse
+import time
+
+import django
+
+django.setup()
+
+from {{ app_name }}.models import {{ model_name }}  # noqa: E402
+from {{ app_name }}.serializers import {{ model_name }}ReadSerializer, {{ serializer_name }}  # noqa: E402
+
+
+def rows_per_second(serialize, repeat):
+    best, count = float('inf'), 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        count = len(serialize())
+        best = min(best, time.perf_counter() - start)
+    return count / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000, help='Rows serialized per run')
+    parser.add_argument('--repeat', type=int, default=5, help='Runs per measurement')
+    args = parser.parse_args()
+
+    queryset = {{ model_name }}.objects.order_by('pk')[:args.rows]
+    if not queryset.exists():
+        parser.exit(1, 'No {{ model_name }} rows to serialize\\n')
+
+    model_serializer = rows_per_second(
+        lambda: {{ serializer_name }}(queryset.all(), many=True).data, args.repeat
+    )
+    read_serializer = rows_per_second(
+        lambda: {{ model_name }}ReadSerializer({{ model_name }}ReadSerializer.project(queryset)).data, args.repeat
+    )
+
+    print(f"{'{{ serializer_name }}':<32} {model_serializer:12.0f} rows/sec")
+    print(f"{'{{ model_name }}ReadSerializer':<32} {read_serializer:12.0f} rows/sec")
+    print(f"{'speedup':<32} {read_serializer / model_serializer:12.1f}x")
+
+
+if __name__ == '__main__':
+    main()
 """
+
+PERFORMANCE_TEST_TEMPLATE = """\"\"\"
+Performance guardrails for {{ view_name }}.
+
+Seeds {{ rows }} {{ model_name }} rows, checks how many queries each endpoint runs and
+compares median latency with the baseline recorded in {{ baseline_file }} next
+to this file. Missing baselines are recorded on the first run; set
+PERF_UPDATE_BASELINES=1 to re-record them and PERF_LATENCY_TOLERANCE to
+change the allowed slowdown (default {{ tolerance }}x).
+\"\"\"
+import json
+import os
+import statistics
+import time
+import uuid
+from datetime import date, time as time_of_day, timedelta
+from decimal import Decimal
+
+import pytest
+from django.utils import timezone
+from rest_framework.test import APIRequestFactory
+
+from {{ app_name }}.models import {{ model_name }}
+from {{ app_name }}.views import {{ view_name }}
+
+ROWS = {{ rows }}
+LIST_QUERIES = {{ list_queries }}
+DETAIL_QUERIES = {{ detail_queries }}
+LATENCY_RUNS = {{ latency_runs }}
+LATENCY_TOLERANCE = float(os.environ.get('PERF_LATENCY_TOLERANCE', '{{ tolerance }}'))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '{{ baseline_file }}')
+
+
+class {{ model_name }}Factory:
+    \"\"\"Creates {{ model_name }} rows, and the rows they reference, from model metadata.\"\"\"
+
+    _shared = {}
+
+    @classmethod
+    def create_batch(cls, size, model={{ model_name }}):
+        return model.objects.bulk_create([cls.build(model, index) for index in range(size)])
+
+    @classmethod
+    def create(cls, model, index=0):
+        obj = cls.build(model, index)
+        obj.save()
+        return obj
+
+    @classmethod
+    def build(cls, model, index):
+        values = {}
+        for field in model._meta.concrete_fields:
+            if (field.primary_key or field.null or field.has_default()
+                    or getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)):
+                continue
+            values[field.attname] = cls.value(field, index)
+        return model(**values)
+
+    @classmethod
+    def value(cls, field, index):
+        if field.choices:
+            return field.choices[0][0]
+        if field.is_relation:
+            if field.one_to_one:
+                return cls.create(field.related_model, index).pk
+            if field.related_model not in cls._shared:
+                cls._shared[field.related_model] = cls.create(field.related_model)
+            return cls._shared[field.related_model].pk
+        kind = field.get_internal_type()
+        if kind == 'EmailField':
+            return f'user{index}@example.com'
+        if kind == 'URLField':
+            return f'https://example.com/{index}'
+        if kind in ('CharField', 'SlugField', 'TextField'):
+            value = f'{field.name}-{index}'
+            return value[-field.max_length:] if field.max_length else value
+        if 'Integer' in kind:
+            return index
+        if kind == 'DecimalField':
+            return Decimal(index % 10 ** (field.max_digits - field.decimal_places))
+        if kind == 'FloatField':
+            return float(index)
+        if kind == 'BooleanField':
+            return index % 2 == 0
+        if kind == 'DateTimeField':
+            return timezone.now() - timedelta(minutes=index)
+        if kind == 'DateField':
+            return date.today() - timedelta(days=index)
+        if kind == 'TimeField':
+            return time_of_day(index % 24)
+        if kind == 'DurationField':
+            return timedelta(seconds=index)
+        if kind == 'UUIDField':
+            return uuid.uuid4()
+        if kind == 'JSONField':
+            return {}
+        return str(index)
+
+
+def check_latency_baseline(key, latency):
+    \"\"\"Record ``latency`` as the baseline of ``key``, or fail if it regressed.\"\"\"
+    baselines = {}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH, encoding='utf-8') as f:
+            baselines = json.load(f)
+    if key not in baselines or os.environ.get('PERF_UPDATE_BASELINES'):
+        baselines[key] = latency
+        with open(BASELINE_PATH, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+        return
+    assert latency <= baselines[key] * LATENCY_TOLERANCE, (
+        f'{key}: median {latency * 1000:.2f} ms, baseline {baselines[key] * 1000:.2f} ms'
+    )
+
+
+def median_latency(view, request, **kwargs):
+    timings = []
+    for _ in range(LATENCY_RUNS):
+        start = time.perf_counter()
+        view(request, **kwargs).render()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+@pytest.fixture
+def seeded(db):
+    {{ model_name }}Factory._shared.clear()
+    return {{ model_name }}Factory.create_batch(ROWS)
+
+
+@pytest.fixture
+def view():
+    return {{ view_name }}.as_view()
+
+
+@pytest.fixture
+def first_pk(seeded):
+    return {{ model_name }}.objects.order_by('pk').values_list('pk', flat=True).first()
+{%- if 'GET' in methods %}
+
+
+def test_list_query_count(seeded, view, django_assert_num_queries):
+    request = APIRequestFactory().get('/')
+    with django_assert_num_queries(LIST_QUERIES):
+        response = view(request)
+        response.render()
+    assert response.status_code == 200
+
+
+def test_detail_query_count(first_pk, view, django_assert_num_queries):
+    request = APIRequestFactory().get('/')
+    with django_assert_num_queries(DETAIL_QUERIES):
+        response = view(request, pk=first_pk)
+        response.render()
+    assert response.status_code == 200
+
+
+def test_list_latency(seeded, view):
+    request = APIRequestFactory().get('/')
+    check_latency_baseline('{{ view_name }}.list', median_latency(view, request))
+
+
+def test_detail_latency(first_pk, view):
+    request = APIRequestFactory().get('/')
+    check_latency_baseline('{{ view_name }}.detail', median_latency(view, request, pk=first_pk))
+{%- endif %}
+"""
+
+
+BUILTIN_TEMPLATES = {
+    'model': MODEL_TEMPLATE,
+    'view': VIEW_TEMPLATE,
+    'serializer': SERIALIZER_TEMPLATE,
+    'serializer_benchmark': SERIALIZER_BENCHMARK_TEMPLATE,
+    'performance_test': PERFORMANCE_TEST_TEMPLATE,
+}
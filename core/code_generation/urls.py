@@ -0,0 +1,14 @@
+"""
+URL configuration for code generation jobs.
+"""
+from django.urls import path
+
+from . import views
+
+app_name = 'code_generation'
+
+urlpatterns = [
+    path('jobs/', views.job_create, name='job_create'),
+    path('jobs/<uuid:job_id>/', views.job_detail, name='job_detail'),
+    path('jobs/<uuid:job_id>/events/', views.job_events, name='job_events'),
+]
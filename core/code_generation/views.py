@@ -0,0 +1,158 @@
+"""
+HTTP endpoints for code generation jobs.
+
+``POST jobs/`` enqueues a job from a JSON spec and answers 202 at once;
+``GET jobs/<id>/`` returns its progress as JSON, or as an HTML fragment that
+re-polls itself every second while the job runs when requested by HTMX
+(``HX-Request``); ``GET jobs/<id>/events/`` streams progress as server-sent
+events in short windows that the browser's EventSource resumes on its own.
+"""
+import hashlib
+import json
+import time
+
+from django.conf import settings
+from django.contrib.admin.views.decorators import staff_member_required
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, HttpResponse, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
+from django.utils.html import format_html, format_html_join
+from django.views.decorators.http import require_GET, require_POST
+
+from .exceptions import CodeGenerationError
+from .jobs import FINISHED_STATUSES, get_job_service, job_summary
+
+
+def _get_summary(job_id):
+    job = get_job_service().get(job_id)
+    if job is None:
+        raise Http404("Generation job not found")
+    return job_summary(job)
+
+
+@staff_member_required
+@require_POST
+def job_create(request):
+    """
+    Enqueue a generation job.
+
+    The body is ``{"spec": {...}}`` (an app spec, see ``specs``) or
+    ``{"specs": [...]}`` (batch specs), with an optional ``"format": true``.
+    """
+    try:
+        payload = json.loads(request.body or b'{}')
+    except ValueError:
+        return JsonResponse({'error': 'Request body must be JSON'}, status=400)
+    if not isinstance(payload, dict):
+        return JsonResponse({'error': 'Request body must be a JSON object'}, status=400)
+
+    service = get_job_service()
+    format_code = bool(payload.get('format', False))
+    try:
+        if 'spec' in payload:
+            summary = service.enqueue_spec(payload['spec'], format_code=format_code)
+        elif isinstance(payload.get('specs'), list):
+            summary = service.enqueue(payload['specs'], format_code=format_code)
+        else:
+            return JsonResponse({'error': "Provide 'spec' or 'specs'"}, status=400)
+    except CodeGenerationError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    response = JsonResponse(summary, status=202)
+    response['Location'] = reverse('code_generation:job_detail', args=[summary['id']])
+    return response
+
+
+@staff_member_required
+@require_GET
+def job_detail(request, job_id):
+    """Return job progress as JSON, or as a self-polling HTML fragment for HTMX."""
+    summary = _get_summary(job_id)
+    if request.headers.get('HX-Request'):
+        return HttpResponse(render_progress(summary))
+    return JsonResponse(summary)
+
+
+@staff_member_required
+@require_GET
+def job_events(request, job_id):
+    """Stream job progress as server-sent events, resuming after ``Last-Event-ID``."""
+    summary = _get_summary(job_id)
+    response = StreamingHttpResponse(
+        progress_events(job_id, summary, last_event_id=request.headers.get('Last-Event-ID')),
+        content_type='text/event-stream'
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def progress_events(job_id, summary=None, last_event_id=None):
+    """
+    Yield ``progress`` events whenever the job changes and a final ``done`` event.
+
+    The stream runs on a synchronous worker, so it is kept short: the job
+    store is polled every ``CODE_GENERATION_JOB_POLL_INTERVAL`` seconds
+    (default 0.5) for at most ``CODE_GENERATION_JOB_STREAM_TIMEOUT`` seconds
+    (default 15). The stream opens with a ``retry:`` delay of
+    ``CODE_GENERATION_JOB_STREAM_RETRY`` milliseconds (default 1000) after
+    which EventSource reconnects, sending the ``id:`` of the last event it
+    received as ``Last-Event-ID`` so an unchanged progress event is not
+    repeated.
+    """
+    interval = getattr(settings, 'CODE_GENERATION_JOB_POLL_INTERVAL', 0.5)
+    deadline = time.monotonic() + getattr(settings, 'CODE_GENERATION_JOB_STREAM_TIMEOUT', 15)
+    yield f"retry: {getattr(settings, 'CODE_GENERATION_JOB_STREAM_RETRY', 1000)}\n\n"
+    last = last_event_id
+    while True:
+        if summary is None:
+            job = get_job_service().get(job_id)
+            if job is None:
+                return
+            summary = job_summary(job)
+        data = json.dumps(summary, cls=DjangoJSONEncoder)
+        event_id = hashlib.sha256(data.encode('utf-8')).hexdigest()[:16]
+        if summary['status'] in FINISHED_STATUSES:
+            yield f"id: {event_id}\nevent: done\ndata: {data}\n\n"
+            return
+        if event_id != last:
+            yield f"id: {event_id}\nevent: progress\ndata: {data}\n\n"
+            last = event_id
+        if time.monotonic() >= deadline:
+            return
+        time.sleep(interval)
+        summary = None
+
+
+def render_progress(summary):
+    """Render a job summary as an HTML fragment; unfinished jobs poll for updates."""
+    polling = ''
+    if summary['status'] not in FINISHED_STATUSES:
+        polling = format_html(
+            ' hx-get="{}" hx-trigger="every 1s" hx-swap="outerHTML"',
+            reverse('code_generation:job_detail', args=[summary['id']])
+        )
+    files = format_html_join(
+        '\n',
+        '<li class="job-file job-file-{}">{} <span>{}</span>{}</li>',
+        (
+            (
+                file['status'],
+                file['output'] or file['name'],
+                file['status'],
+                format_html(' <code>{}</code>', file['error']) if file['error'] else ''
+            )
+            for file in summary['files']
+        )
+    )
+    return format_html(
+        '<div id="generation-job-{}" class="generation-job job-{}"{}>\n'
+        '<progress max="{}" value="{}">{}%</progress>\n'
+        '<p>{} of {} files, {} failed ({})</p>\n'
+        '<ul>\n{}\n</ul>\n'
+        '</div>',
+        summary['id'], summary['status'], polling,
+        summary['total'], summary['completed'], summary['progress'],
+        summary['completed'], summary['total'], summary['failed'], summary['status'],
+        files
+    )
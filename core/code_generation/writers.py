@@ -0,0 +1,287 @@
+"""
+File writers for generated code.
+
+Generated files are written through a temporary file in the target directory
+that then replaces the target, so readers (and Django's autoreloader) never
+see a partially written module. ``write_if_changed`` and ``BatchWriter`` also
+skip targets whose content is already identical - compared by size first and
+only then by hash - so unchanged files keep their mtime and do not trigger
+reloads or downstream linters. ``stream_write`` does the same for content
+produced as an iterator of chunks, without holding it in memory.
+"""
+import hashlib
+import os
+import secrets
+from typing import Dict, Iterable, List, Tuple, Union
+
+
+HASH_CHUNK_SIZE = 64 * 1024
+STREAM_BUFFER_SIZE = 64 * 1024
+TEMP_NAME_ATTEMPTS = 100
+
+
+def _encode(content: Union[str, bytes], encoding: str) -> bytes:
+    return content if isinstance(content, bytes) else content.encode(encoding)
+
+
+def _matches(file_path: str, data: bytes) -> bool:
+    """Return True if the file at ``file_path`` holds exactly ``data``."""
+    return _matches_digest(file_path, len(data), lambda: hashlib.sha256(data).digest())
+
+
+def _matches_digest(file_path: str, size: int, expected) -> bool:
+    """
+    Return True if the file has ``size`` bytes and the SHA-256 ``expected``.
+
+    ``expected`` may be a callable so the new content is only hashed when
+    the sizes match.
+    """
+    try:
+        if os.stat(file_path).st_size != size:
+            return False
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+    except OSError:
+        return False
+    return digest.digest() == (expected() if callable(expected) else expected)
+
+
+def _create_temp(file_path: str) -> Tuple[int, str]:
+    """
+    Create a temporary file next to ``file_path``.
+
+    The file gets the target's mode, or - being created with 0o666 like
+    ``open()`` does - the umask-based default for new files. The umask is
+    applied by the kernel, never read or changed here.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    os.makedirs(directory, exist_ok=True)
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0)
+    for _ in range(TEMP_NAME_ATTEMPTS):
+        temp_path = os.path.join(directory, f'.{secrets.token_hex(8)}.tmp')
+        try:
+            fd = os.open(temp_path, flags, 0o666)
+            break
+        except FileExistsError:
+            continue
+    else:
+        raise FileExistsError(f"No usable temporary file name in '{directory}'")
+
+    try:
+        mode = os.stat(file_path).st_mode & 0o777
+    except OSError:
+        return fd, temp_path
+    try:
+        os.chmod(temp_path, mode)
+    except BaseException:
+        os.close(fd)
+        _unlink(temp_path)
+        raise
+    return fd, temp_path
+
+
+def _write_temp(file_path: str, data: bytes, fsync: bool) -> str:
+    """Write ``data`` to a temporary file next to ``file_path`` and return its path."""
+    fd, temp_path = _create_temp(file_path)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+    except BaseException:
+        _unlink(temp_path)
+        raise
+    return temp_path
+
+
+def _unlink(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+def _fsync_file(path: str) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _fsync_directory(directory: str) -> None:
+    """Persist renames in ``directory``; not supported on every platform."""
+    try:
+        _fsync_file(directory)
+    except OSError:
+        pass
+
+
+def is_unchanged(file_path: str, content: Union[str, bytes], encoding: str = 'utf-8') -> bool:
+    """Return True if ``file_path`` already holds ``content``."""
+    return _matches(file_path, _encode(content, encoding))
+
+
+def atomic_write(file_path: str, content: Union[str, bytes], encoding: str = 'utf-8', fsync: bool = False) -> None:
+    """Write ``content`` to ``file_path`` atomically."""
+    temp_path = _write_temp(file_path, _encode(content, encoding), fsync)
+    try:
+        os.replace(temp_path, file_path)
+    except BaseException:
+        _unlink(temp_path)
+        raise
+    if fsync:
+        _fsync_directory(os.path.dirname(os.path.abspath(file_path)))
+
+
+def write_if_changed(
+    file_path: str,
+    content: Union[str, bytes],
+    encoding: str = 'utf-8',
+    fsync: bool = False
+) -> bool:
+    """
+    Atomically write ``content`` unless ``file_path`` already holds it.
+
+    Returns:
+        bool: True if the file was written, False if it was unchanged
+    """
+    data = _encode(content, encoding)
+    if _matches(file_path, data):
+        return False
+    atomic_write(file_path, data, fsync=fsync)
+    return True
+
+
+def stream_write(
+    file_path: str,
+    chunks: Iterable[str],
+    encoding: str = 'utf-8',
+    buffer_size: int = STREAM_BUFFER_SIZE,
+    fsync: bool = False
+) -> bool:
+    """
+    Atomically write text chunks to ``file_path`` with bounded memory.
+
+    Chunks are buffered up to ``buffer_size`` characters, encoded and written
+    to a temporary file while a hash of the content is computed. If the
+    target already holds the same content the temporary file is dropped and
+    the target is left untouched.
+
+    Returns:
+        bool: True if the file was written, False if it was unchanged
+    """
+    fd, temp_path = _create_temp(file_path)
+    try:
+        digest = hashlib.sha256()
+        size = 0
+        with os.fdopen(fd, 'wb') as f:
+            buffer: List[str] = []
+            buffered = 0
+            for chunk in chunks:
+                buffer.append(chunk)
+                buffered += len(chunk)
+                if buffered >= buffer_size:
+                    size += _write_buffer(f, digest, buffer, encoding)
+                    buffer, buffered = [], 0
+            size += _write_buffer(f, digest, buffer, encoding)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+
+        if _matches_digest(file_path, size, digest.digest()):
+            _unlink(temp_path)
+            return False
+        os.replace(temp_path, file_path)
+    except BaseException:
+        _unlink(temp_path)
+        raise
+    if fsync:
+        _fsync_directory(os.path.dirname(os.path.abspath(file_path)))
+    return True
+
+
+def _write_buffer(f, digest, buffer: List[str], encoding: str) -> int:
+    data = ''.join(buffer).encode(encoding)
+    digest.update(data)
+    f.write(data)
+    return len(data)
+
+
+class BatchWriter:
+    """
+    Skip-unchanged atomic writes committed together.
+
+    Changed files are staged as temporary files and only renamed into place
+    on ``commit()``. With ``fsync`` enabled the staged files are synced in one
+    pass just before the renames and each target directory once afterwards,
+    instead of a sync per file at write time.
+
+    Used as a context manager, the batch is committed on success and
+    discarded if the block raises.
+    """
+
+    def __init__(self, encoding: str = 'utf-8', fsync: bool = True):
+        self.encoding = encoding
+        self.fsync = fsync
+        self.written = 0
+        self.skipped = 0
+        self._pending: List[Tuple[str, str]] = []
+
+    def write(self, file_path: str, content: Union[str, bytes]) -> bool:
+        """
+        Stage ``content`` for ``file_path`` unless the file already holds it.
+
+        Returns:
+            bool: True if the file will be written on commit
+        """
+        data = _encode(content, self.encoding)
+        if _matches(file_path, data):
+            self.skipped += 1
+            return False
+        self._pending.append((_write_temp(file_path, data, fsync=False), file_path))
+        self.written += 1
+        return True
+
+    def commit(self) -> None:
+        """Move staged files into place."""
+        pending, self._pending = self._pending, []
+        directories = {os.path.dirname(os.path.abspath(file_path)) for _, file_path in pending}
+        replaced = 0
+        try:
+            if self.fsync:
+                for temp_path, _ in pending:
+                    _fsync_file(temp_path)
+            for temp_path, file_path in pending:
+                os.replace(temp_path, file_path)
+                replaced += 1
+        except BaseException:
+            for temp_path, _ in pending[replaced:]:
+                _unlink(temp_path)
+            raise
+        if self.fsync:
+            for directory in directories:
+                _fsync_directory(directory)
+
+    def discard(self) -> None:
+        """Drop staged files without touching their targets."""
+        pending, self._pending = self._pending, []
+        for temp_path, _ in pending:
+            _unlink(temp_path)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {'written': self.written, 'skipped': self.skipped}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.discard()
+        return False
@@ -0,0 +1,238 @@
+"""
+Persistent cache of code quality results.
+
+Re-running the quality tools over an unchanged tree repeats the same work.
+QualityCache stores each result (processed code, lint issues, check
+results) as a JSON file under a cache directory, keyed by the SHA-256 of the
+input content, the operation, the black/isort/ruff versions and the tool
+configuration, so a result is reused only when nothing that could change it
+has changed. The directory is bounded by entry count and total size; the
+least recently used entries are evicted first.
+
+The shared cache is off unless ``CODE_QUALITY_CACHE`` is set, so library
+code never writes to the user's cache directory on its own; the
+``process_code_quality`` management command turns it on by default.
+"""
+import hashlib
+import json
+import os
+import subprocess
+import threading
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+
+from core.code_generation.writers import atomic_write
+
+
+CACHE_KEY_VERSION = 1
+
+# Evict down to this fraction of the limits, so pruning is not triggered on every write
+PRUNE_TARGET = 0.8
+
+
+@lru_cache(maxsize=None)
+def tool_versions() -> Dict[str, str]:
+    """Return the versions of black, isort and ruff ('missing' when unavailable)."""
+    versions = {}
+    for name in ('black', 'isort'):
+        try:
+            versions[name] = __import__(name).__version__
+        except (ImportError, AttributeError):
+            versions[name] = _command_version(name)
+    versions['ruff'] = _command_version('ruff')
+    return versions
+
+
+def _command_version(name: str) -> str:
+    try:
+        result = subprocess.run([name, '--version'], capture_output=True, text=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return 'missing'
+    return result.stdout.strip() or 'missing'
+
+
+def file_digest(path: Optional[str]) -> Optional[str]:
+    """Return the SHA-256 of a configuration file's content, or None."""
+    if not path:
+        return None
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return None
+
+
+class QualityCache:
+    """
+    On-disk cache of code quality results, bounded by entries and bytes.
+
+    Args:
+        cache_dir: Directory holding the entries
+        max_entries: Maximum number of entries
+        max_bytes: Maximum total size of the entries
+    """
+
+    def __init__(self, cache_dir: str, max_entries: int = 50000, max_bytes: int = 256 * 1024 * 1024):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        # Entry count and size, scanned on first write and tracked afterwards
+        self._usage = None
+        os.makedirs(cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(operation: str, content: str, namespace: str) -> str:
+        """Return the cache key of ``operation`` applied to ``content`` under a tool namespace."""
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        return hashlib.sha256(f"{CACHE_KEY_VERSION}:{operation}:{namespace}:{digest}".encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def make_namespace(**configuration: Any) -> str:
+        """Return the namespace of a tool configuration, including the tool versions."""
+        canonical = json.dumps(
+            [tool_versions(), configuration],
+            sort_keys=True,
+            separators=(',', ':'),
+            default=str
+        )
+        return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], key + '.json')
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for ``key``, or None."""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                value = json.load(f)
+            # Recency for eviction
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self._stats['misses'] += 1
+            return None
+        with self._lock:
+            self._stats['hits'] += 1
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value under ``key``; best effort."""
+        data = json.dumps(value, separators=(',', ':'))
+        path = self._path(key)
+        try:
+            replaced = os.path.getsize(path) if os.path.exists(path) else None
+            atomic_write(path, data)
+        except OSError:
+            return
+
+        with self._lock:
+            if self._usage is None:
+                self._usage = self._scan()
+            else:
+                if replaced is None:
+                    self._usage['entries'] += 1
+                self._usage['bytes'] += len(data.encode('utf-8')) - (replaced or 0)
+            over = self._usage['entries'] > self.max_entries or self._usage['bytes'] > self.max_bytes
+        if over:
+            self.prune()
+
+    def _scan(self) -> Dict[str, Any]:
+        entries = []
+        for root, dirs, files in os.walk(self.cache_dir):
+            for file in files:
+                if not file.endswith('.json'):
+                    continue
+                path = os.path.join(root, file)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+        return {'entries': len(entries), 'bytes': sum(size for _, size, _ in entries), 'files': entries}
+
+    def prune(self) -> int:
+        """
+        Evict the least recently used entries until the cache is within ``PRUNE_TARGET`` of its limits.
+
+        Returns:
+            int: Number of entries evicted
+        """
+        with self._lock:
+            usage = self._scan()
+            entries, size = usage['entries'], usage['bytes']
+            max_entries = int(self.max_entries * PRUNE_TARGET)
+            max_bytes = int(self.max_bytes * PRUNE_TARGET)
+            evicted = 0
+            for mtime, file_size, path in sorted(usage['files']):
+                if entries <= max_entries and size <= max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                except OSError:
+                    continue
+                entries -= 1
+                size -= file_size
+                evicted += 1
+            self._usage = {'entries': entries, 'bytes': size}
+            self._stats['evictions'] += evicted
+            return evicted
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            for mtime, size, path in self._scan()['files']:
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            self._usage = {'entries': 0, 'bytes': 0}
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss/eviction counters and the current entry count and size."""
+        with self._lock:
+            stats = dict(self._stats)
+            usage = self._usage if self._usage is not None else self._scan()
+            stats['entries'] = usage['entries']
+            stats['bytes'] = usage['bytes']
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        return stats
+
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+
+def get_quality_cache(default: bool = False) -> Optional[QualityCache]:
+    """
+    Return the process-wide QualityCache, or None when it is disabled.
+
+    Configured by ``CODE_QUALITY_CACHE`` (default: ``default``),
+    ``CODE_QUALITY_CACHE_DIR`` (default ``~/.cache/antman/code-quality``),
+    ``CODE_QUALITY_CACHE_MAX_ENTRIES`` and ``CODE_QUALITY_CACHE_MAX_BYTES``.
+    """
+    global _shared_cache
+    options = settings if settings.configured else None
+    if not getattr(options, 'CODE_QUALITY_CACHE', default):
+        return None
+    if _shared_cache is None:
+        with _shared_cache_lock:
+            if _shared_cache is None:
+                cache_dir = getattr(options, 'CODE_QUALITY_CACHE_DIR', None) or os.path.join(
+                    os.path.expanduser('~'), '.cache', 'antman', 'code-quality'
+                )
+                try:
+                    _shared_cache = QualityCache(
+                        cache_dir,
+                        max_entries=getattr(options, 'CODE_QUALITY_CACHE_MAX_ENTRIES', 50000),
+                        max_bytes=getattr(options, 'CODE_QUALITY_CACHE_MAX_BYTES', 256 * 1024 * 1024)
+                    )
+                except OSError:
+                    # An unwritable cache directory only costs the speedup
+                    return None
+    return _shared_cache
@@ -1,66 +1,153 @@
 """
 Code quality tools integration for automated code formatting and linting.
 향후 유지보수가 쉽도록 코드 퀄리티 및 자동생성 및 리팅기능 추가
+
+Black and isort run in process when they are importable, with their
+Mode/Config objects built once per settings combination; the command-line
+tools are only used as a fallback.
 """
+import contextvars
+import fnmatch
 import os
 import subprocess
 import tempfile
-from typing import Dict, List, Any, Optional, Tuple
-from pathlib import Path
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from functools import lru_cache, partial
+from typing import Dict, Iterable, Iterator, List, Any, Optional, Sequence, Tuple
 import json
 
+from core.code_generation.writers import write_if_changed
+from core.resilience.deadline import check_deadline, remaining_timeout
+from core.resilience.exceptions import DeadlineExceededError
+
+from .cache import QualityCache, file_digest, get_quality_cache
+
+try:
+    import black
+except ImportError:
+    black = None
+
+try:
+    import isort
+except ImportError:
+    isort = None
+
+try:
+    import pathspec
+except ImportError:
+    pathspec = None
+
+
+# Configuration files ruff discovers, in its order of precedence within a directory
+RUFF_CONFIG_FILES = ('.ruff.toml', 'ruff.toml', 'pyproject.toml')
+
 
 class CodeQualityError(Exception):
     """Exception for code quality tool errors."""
     pass
 
 
+@contextmanager
+def _tool_errors(message: str):
+    """Wrap tool failures in CodeQualityError, letting deadline expiry propagate unchanged."""
+    try:
+        yield
+    except DeadlineExceededError:
+        raise
+    except Exception as e:
+        raise CodeQualityError(f"{message}: {str(e)}") from e
+
+
+def _run_tool(cmd: List[str], input: Optional[str] = None) -> subprocess.CompletedProcess:
+    """Run a tool subprocess within the remaining request deadline, if any."""
+    try:
+        return subprocess.run(
+            cmd, input=input, capture_output=True, text=True, timeout=remaining_timeout(operation=cmd[0])
+        )
+    except subprocess.TimeoutExpired as e:
+        raise DeadlineExceededError(f"{cmd[0]} did not finish before the request deadline") from e
+
+
+@lru_cache(maxsize=None)
+def _black_mode(line_length: int, target_version: str) -> 'black.Mode':
+    """Return the shared black Mode for a line length and target version."""
+    return black.Mode(
+        line_length=line_length,
+        target_versions={black.TargetVersion[target_version.upper()]}
+    )
+
+
+@lru_cache(maxsize=None)
+def _isort_config(profile: str, line_length: int) -> 'isort.Config':
+    """Return the shared isort Config for a profile and line length."""
+    return isort.Config(profile=profile, line_length=line_length)
+
+
 class CodeFormatter:
-    """Code formatting using Black."""
+    """
+    Code formatting using Black.
+    
+    Args:
+        line_length: Maximum line length
+        target_version: Black target version, e.g. ``'py39'``
+        in_process: Call ``black.format_str`` instead of the ``black``
+            command; ignored when black is not importable
+    """
     
-    def __init__(self, line_length: int = 88, target_version: str = "py39"):
+    def __init__(self, line_length: int = 88, target_version: str = "py39", in_process: bool = True):
         self.line_length = line_length
         self.target_version = target_version
+        self.in_process = in_process and black is not None
+    
+    @property
+    def mode(self) -> 'black.Mode':
+        return _black_mode(self.line_length, self.target_version)
     
     def format_code(self, code: str) -> str:
         """Format Python code using Black."""
+        if not self.in_process:
+            return self._format_code_subprocess(code)
+        check_deadline('black')
         try:
+            return black.format_str(code, mode=self.mode)
+        except Exception as e:
+            raise CodeQualityError(f"Error formatting code: Black formatting failed: {str(e)}")
+    
+    def _format_code_subprocess(self, code: str) -> str:
+        with _tool_errors("Error formatting code"):
             with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as temp_file:
                 temp_file.write(code)
                 temp_file_path = temp_file.name
-            
-            # Run Black on the temporary file
-            cmd = [
-                'black',
-                '--line-length', str(self.line_length),
-                '--target-version', self.target_version,
-                '--quiet',
-                temp_file_path
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                raise CodeQualityError(f"Black formatting failed: {result.stderr}")
-            
-            # Read the formatted code
-            with open(temp_file_path, 'r', encoding='utf-8') as f:
-                formatted_code = f.read()
-            
-            # Clean up
-            os.unlink(temp_file_path)
-            
-            return formatted_code
-            
-        except Exception as e:
-            # Clean up on error
-            if 'temp_file_path' in locals() and os.path.exists(temp_file_path):
+            try:
+                # Run Black on the temporary file
+                cmd = [
+                    'black',
+                    '--line-length', str(self.line_length),
+                    '--target-version', self.target_version,
+                    '--quiet',
+                    temp_file_path
+                ]
+                
+                result = _run_tool(cmd)
+                
+                if result.returncode != 0:
+                    raise CodeQualityError(f"Black formatting failed: {result.stderr}")
+                
+                # Read the formatted code
+                with open(temp_file_path, 'r', encoding='utf-8') as f:
+                    return f.read()
+            finally:
                 os.unlink(temp_file_path)
-            raise CodeQualityError(f"Error formatting code: {str(e)}")
     
     def format_file(self, file_path: str) -> bool:
         """Format a Python file using Black."""
-        try:
+        if self.in_process:
+            return _rewrite_file(file_path, self.format_code)
+        with _tool_errors(f"Error formatting file {file_path}"):
             cmd = [
                 'black',
                 '--line-length', str(self.line_length),
@@ -68,67 +155,81 @@ class CodeFormatter:
                 file_path
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = _run_tool(cmd)
             return result.returncode == 0
-            
-        except Exception as e:
-            raise CodeQualityError(f"Error formatting file {file_path}: {str(e)}")
     
     def check_formatting(self, code: str) -> bool:
         """Check if code is properly formatted."""
         try:
             formatted_code = self.format_code(code)
             return code.strip() == formatted_code.strip()
+        except DeadlineExceededError:
+            raise
         except Exception:
             return False
 
 
 class ImportSorter:
-    """Import sorting using isort."""
+    """
+    Import sorting using isort.
     
-    def __init__(self, profile: str = "black", line_length: int = 88):
+    Args:
+        profile: isort profile
+        line_length: Maximum line length
+        in_process: Call ``isort.code`` instead of the ``isort`` command;
+            ignored when isort is not importable
+    """
+    
+    def __init__(self, profile: str = "black", line_length: int = 88, in_process: bool = True):
         self.profile = profile
         self.line_length = line_length
+        self.in_process = in_process and isort is not None
+    
+    @property
+    def config(self) -> 'isort.Config':
+        return _isort_config(self.profile, self.line_length)
     
     def sort_imports(self, code: str) -> str:
         """Sort imports in Python code using isort."""
+        if not self.in_process:
+            return self._sort_imports_subprocess(code)
+        check_deadline('isort')
         try:
+            return isort.code(code, config=self.config)
+        except Exception as e:
+            raise CodeQualityError(f"Error sorting imports: isort failed: {str(e)}")
+    
+    def _sort_imports_subprocess(self, code: str) -> str:
+        with _tool_errors("Error sorting imports"):
             with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as temp_file:
                 temp_file.write(code)
                 temp_file_path = temp_file.name
-            
-            # Run isort on the temporary file
-            cmd = [
-                'isort',
-                '--profile', self.profile,
-                '--line-length', str(self.line_length),
-                '--quiet',
-                temp_file_path
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            if result.returncode != 0:
-                raise CodeQualityError(f"isort failed: {result.stderr}")
-            
-            # Read the sorted code
-            with open(temp_file_path, 'r', encoding='utf-8') as f:
-                sorted_code = f.read()
-            
-            # Clean up
-            os.unlink(temp_file_path)
-            
-            return sorted_code
-            
-        except Exception as e:
-            # Clean up on error
-            if 'temp_file_path' in locals() and os.path.exists(temp_file_path):
+            try:
+                # Run isort on the temporary file
+                cmd = [
+                    'isort',
+                    '--profile', self.profile,
+                    '--line-length', str(self.line_length),
+                    '--quiet',
+                    temp_file_path
+                ]
+                
+                result = _run_tool(cmd)
+                
+                if result.returncode != 0:
+                    raise CodeQualityError(f"isort failed: {result.stderr}")
+                
+                # Read the sorted code
+                with open(temp_file_path, 'r', encoding='utf-8') as f:
+                    return f.read()
+            finally:
                 os.unlink(temp_file_path)
-            raise CodeQualityError(f"Error sorting imports: {str(e)}")
     
     def sort_file_imports(self, file_path: str) -> bool:
         """Sort imports in a Python file using isort."""
-        try:
+        if self.in_process:
+            return _rewrite_file(file_path, self.sort_imports)
+        with _tool_errors(f"Error sorting imports in file {file_path}"):
             cmd = [
                 'isort',
                 '--profile', self.profile,
@@ -136,70 +237,132 @@ class ImportSorter:
                 file_path
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = _run_tool(cmd)
             return result.returncode == 0
-            
-        except Exception as e:
-            raise CodeQualityError(f"Error sorting imports in file {file_path}: {str(e)}")
     
     def check_import_sorting(self, code: str) -> bool:
         """Check if imports are properly sorted."""
         try:
             sorted_code = self.sort_imports(code)
             return code.strip() == sorted_code.strip()
+        except DeadlineExceededError:
+            raise
         except Exception:
             return False
 
 
+def _rewrite_file(file_path: str, transform) -> bool:
+    """
+    Apply an in-process transform to a file, rewriting it only if it changed.
+    
+    Returns False when the transform rejects the code, like the command-line
+    tools' non-zero exit status.
+    """
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            code = f.read()
+    except OSError as e:
+        raise CodeQualityError(f"Error reading file {file_path}: {str(e)}")
+    try:
+        transformed = transform(code)
+    except CodeQualityError:
+        return False
+    if transformed != code:
+        # Atomic, so an interrupted run cannot leave a truncated source file
+        try:
+            write_if_changed(file_path, transformed)
+        except OSError as e:
+            raise CodeQualityError(f"Error writing file {file_path}: {str(e)}")
+    return True
+
+
+def find_ruff_config(directory: str) -> Optional[str]:
+    """
+    Return the ruff configuration file that applies to files in ``directory``.
+    
+    Like ruff, the closest directory wins and, within a directory,
+    ``.ruff.toml`` before ``ruff.toml`` before a ``pyproject.toml`` with a
+    ``[tool.ruff]`` table.
+    """
+    directory = os.path.abspath(directory)
+    while True:
+        for name in RUFF_CONFIG_FILES:
+            path = os.path.join(directory, name)
+            if not os.path.isfile(path):
+                continue
+            if name != 'pyproject.toml':
+                return path
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    if '[tool.ruff' in f.read():
+                        return path
+            except OSError:
+                pass
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+
+
 class CodeLinter:
-    """Code linting using Ruff."""
+    """
+    Code linting using Ruff.
+    
+    In-memory code is passed on stdin (``--stdin-filename``); the batch
+    methods lint or fix many files or snippets with a single ruff process
+    and map the diagnostics back to their inputs. Snippet batches run in a
+    temporary directory, where ruff would find no project configuration, so
+    without ``config_file`` they get the configuration that applies to
+    ``project_root`` (default: the working directory).
+    """
     
-    def __init__(self, config_file: Optional[str] = None):
+    STDIN_FILENAME = 'snippet.py'
+    # Paths per ruff process in the batch methods, to stay under ARG_MAX
+    MAX_BATCH_FILES = 500
+    
+    def __init__(self, config_file: Optional[str] = None, project_root: Optional[str] = None):
         self.config_file = config_file
+        self.project_root = project_root
     
-    def lint_code(self, code: str) -> List[Dict[str, Any]]:
-        """Lint Python code using Ruff."""
+    def _ruff(self, *args: str, input: Optional[str] = None) -> subprocess.CompletedProcess:
+        cmd = ['ruff', 'check', *args]
+        if self.config_file:
+            cmd.extend(['--config', self.config_file])
+        result = _run_tool(cmd, input=input)
+        # 0: clean, 1: violations remain, 2: ruff itself failed
+        if result.returncode not in (0, 1):
+            raise CodeQualityError(f"Ruff failed: {result.stderr.strip()}")
+        return result
+    
+    @staticmethod
+    def _parse_issues(output: str) -> List[Dict[str, Any]]:
         try:
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as temp_file:
-                temp_file.write(code)
-                temp_file_path = temp_file.name
-            
-            # Run Ruff on the temporary file
-            cmd = ['ruff', 'check', '--output-format=json', temp_file_path]
-            
-            if self.config_file:
-                cmd.extend(['--config', self.config_file])
-            
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            # Clean up
-            os.unlink(temp_file_path)
-            
-            # Parse JSON output
-            if result.stdout:
-                try:
-                    issues = json.loads(result.stdout)
-                    return issues
-                except json.JSONDecodeError:
-                    return []
-            
+            return json.loads(output) if output.strip() else []
+        except json.JSONDecodeError:
             return []
-            
+    
+    def lint_code(self, code: str, filename: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Lint Python code using Ruff."""
+        try:
+            result = self._ruff(
+                '--output-format=json', '--stdin-filename', filename or self.STDIN_FILENAME, '-',
+                input=code
+            )
+            return self._parse_issues(result.stdout)
+        except (CodeQualityError, DeadlineExceededError):
+            raise
         except Exception as e:
-            # Clean up on error
-            if 'temp_file_path' in locals() and os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
             raise CodeQualityError(f"Error linting code: {str(e)}")
     
     def lint_file(self, file_path: str) -> List[Dict[str, Any]]:
         """Lint a Python file using Ruff."""
-        try:
+        with _tool_errors(f"Error linting file {file_path}"):
             cmd = ['ruff', 'check', '--output-format=json', file_path]
             
             if self.config_file:
                 cmd.extend(['--config', self.config_file])
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            result = _run_tool(cmd)
             
             # Parse JSON output
             if result.stdout:
@@ -210,70 +373,308 @@ class CodeLinter:
                     return []
             
             return []
-            
-        except Exception as e:
-            raise CodeQualityError(f"Error linting file {file_path}: {str(e)}")
     
-    def fix_code(self, code: str) -> str:
+    def fix_code(self, code: str, filename: Optional[str] = None) -> str:
         """Fix linting issues in Python code using Ruff."""
+        return self.fix_and_lint_code(code, filename)[0]
+    
+    def fix_and_lint_code(self, code: str, filename: Optional[str] = None) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Fix code and report the issues that remain, with one ruff process.
+        
+        With ``--fix`` on stdin ruff writes the fixed code to stdout and the
+        remaining diagnostics to stderr.
+        """
         try:
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as temp_file:
-                temp_file.write(code)
-                temp_file_path = temp_file.name
-            
-            # Run Ruff fix on the temporary file
-            cmd = ['ruff', 'check', '--fix', temp_file_path]
-            
-            if self.config_file:
-                cmd.extend(['--config', self.config_file])
-            
-            result = subprocess.run(cmd, capture_output=True, text=True)
-            
-            # Read the fixed code
-            with open(temp_file_path, 'r', encoding='utf-8') as f:
-                fixed_code = f.read()
-            
-            # Clean up
-            os.unlink(temp_file_path)
-            
-            return fixed_code
-            
+            result = self._ruff(
+                '--fix', '--output-format=json', '--stdin-filename', filename or self.STDIN_FILENAME, '-',
+                input=code
+            )
+            return result.stdout, self._parse_issues(result.stderr)
+        except (CodeQualityError, DeadlineExceededError):
+            raise
         except Exception as e:
-            # Clean up on error
-            if 'temp_file_path' in locals() and os.path.exists(temp_file_path):
-                os.unlink(temp_file_path)
             raise CodeQualityError(f"Error fixing code: {str(e)}")
+    
+    def lint_files(self, file_paths: Sequence[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Lint many files with one ruff process per ``MAX_BATCH_FILES`` files.
+        
+        Returns:
+            dict: issues by file path, as given (files without issues map to [])
+        """
+        return self._check_files(file_paths, fix=False)
+    
+    def fix_files(self, file_paths: Sequence[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fix many files in place with one ruff process per ``MAX_BATCH_FILES`` files.
+        
+        Returns:
+            dict: remaining issues by file path, as given
+        """
+        return self._check_files(file_paths, fix=True)
+    
+    def lint_many(self, codes: Sequence[str]) -> List[List[Dict[str, Any]]]:
+        """Lint many in-memory snippets with one ruff process; returns issues per snippet, in order."""
+        return [issues for _, issues in self._check_snippets(codes, fix=False)]
+    
+    def fix_many(self, codes: Sequence[str]) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        """Fix many in-memory snippets with one ruff process; returns ``(code, issues)`` per snippet, in order."""
+        return self._check_snippets(codes, fix=True)
+    
+    def _check_files(
+        self, file_paths: Sequence[str], fix: bool, *extra_args: str
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        results = {path: [] for path in file_paths}
+        by_real_path = {os.path.realpath(path): path for path in file_paths}
+        paths = list(results)
+        args = ['--fix', '--exit-zero', *extra_args] if fix else ['--exit-zero', *extra_args]
+        try:
+            for start in range(0, len(paths), self.MAX_BATCH_FILES):
+                result = self._ruff(
+                    *args, '--output-format=json', '--', *paths[start:start + self.MAX_BATCH_FILES]
+                )
+                for issue in self._parse_issues(result.stdout):
+                    path = by_real_path.get(os.path.realpath(issue.get('filename', '')))
+                    if path is not None:
+                        results[path].append(issue)
+        except (CodeQualityError, DeadlineExceededError):
+            raise
+        except Exception as e:
+            raise CodeQualityError(f"Error linting files: {str(e)}")
+        return results
+    
+    def _check_snippets(self, codes: Sequence[str], fix: bool) -> List[Tuple[str, List[Dict[str, Any]]]]:
+        if not codes:
+            return []
+        # Ruff reads one stdin stream per process, so a batch goes through
+        # one temporary directory instead
+        with tempfile.TemporaryDirectory(prefix='antman-ruff-') as temp_dir:
+            paths = []
+            for index, code in enumerate(codes):
+                path = os.path.join(temp_dir, f'snippet_{index}.py')
+                with open(path, 'w', encoding='utf-8') as f:
+                    f.write(code)
+                paths.append(path)
+            
+            # Temporary files are never seen again: skip ruff's cache
+            extra_args = ['--no-cache']
+            if not self.config_file:
+                config = find_ruff_config(self.project_root or os.getcwd())
+                if config:
+                    extra_args.extend(['--config', config])
+            issues = self._check_files(paths, fix, *extra_args)
+            if not fix:
+                return [(code, issues[path]) for code, path in zip(codes, paths)]
+            
+            results = []
+            for path in paths:
+                with open(path, 'r', encoding='utf-8') as f:
+                    results.append((f.read(), issues[path]))
+            return results
 
 
 class CodeQualityManager:
-    """Manager for all code quality tools."""
+    """
+    Manager for all code quality tools.
+    
+    Results are cached by content and tool configuration in ``cache``
+    (default: ``get_quality_cache()``, off unless ``CODE_QUALITY_CACHE`` is
+    set) unless ``use_cache`` is False. Files are linted under their own path,
+    so ruff applies the configuration closest to each file, and that
+    configuration is part of the file's cache key.
+    """
+    
+    # (stage, input) outputs remembered by run_pipeline
+    STAGE_MEMO_SIZE = 32
     
     def __init__(
         self,
         line_length: int = 88,
         target_version: str = "py39",
         isort_profile: str = "black",
-        ruff_config: Optional[str] = None
+        ruff_config: Optional[str] = None,
+        use_cache: bool = True,
+        cache: Optional[QualityCache] = None
     ):
+        self.settings = (line_length, target_version, isort_profile, ruff_config, use_cache)
         self.formatter = CodeFormatter(line_length, target_version)
         self.import_sorter = ImportSorter(isort_profile, line_length)
         self.linter = CodeLinter(ruff_config)
+        self.cache = (cache or get_quality_cache()) if use_cache else None
+        # Digest by (configuration, mtime, size) and cache namespace by configuration
+        self._config_digests = {}
+        self._namespaces = {}
+        self._stage_memo = OrderedDict()
+        self._memo_lock = threading.Lock()
+    
+    @property
+    def cache_namespace(self) -> str:
+        """Cache namespace of this manager's tool versions and configuration, for in-memory code."""
+        return self._namespace()
+    
+    def _ruff_config(self, filename: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+        """
+        Return the ruff configuration that applies to ``filename`` and its digest.
+        
+        Looked up on every call, so a long-lived manager notices a
+        configuration that was added or edited; the digest is only
+        recomputed when the file's mtime or size changed.
+        """
+        ruff_config = self.settings[3]
+        if not ruff_config:
+            # Ruff uses the configuration closest to the file, for stdin the working directory
+            directory = os.path.dirname(os.path.abspath(filename)) if filename else os.getcwd()
+            ruff_config = find_ruff_config(directory)
+            if not ruff_config:
+                return None, None
+        ruff_config = os.path.abspath(ruff_config)
+        try:
+            stat = os.stat(ruff_config)
+        except OSError:
+            return ruff_config, None
+        key = (ruff_config, stat.st_mtime_ns, stat.st_size)
+        digest = self._config_digests.get(key)
+        if digest is None:
+            digest = self._config_digests[key] = file_digest(ruff_config)
+        return ruff_config, digest
+    
+    def _namespace(self, filename: Optional[str] = None) -> str:
+        """Cache namespace for code linted as ``filename`` (default: in-memory code)."""
+        line_length, target_version, isort_profile = self.settings[:3]
+        ruff_config, digest = self._ruff_config(filename)
+        path = None
+        if filename and ruff_config:
+            # per-file-ignores match paths relative to the configuration
+            path = os.path.relpath(os.path.abspath(filename), os.path.dirname(ruff_config))
+        namespace = self._namespaces.get((ruff_config, digest, path))
+        if namespace is None:
+            namespace = self._namespaces[(ruff_config, digest, path)] = QualityCache.make_namespace(
+                line_length=line_length,
+                target_version=target_version,
+                isort_profile=isort_profile,
+                ruff={'config': ruff_config, 'digest': digest, 'path': path}
+            )
+        return namespace
+    
+    def _cache_key(self, operation: str, code: str, filename: Optional[str] = None) -> str:
+        return QualityCache.make_key(operation, code, self._namespace(filename))
     
     def process_code(self, code: str) -> Tuple[str, List[Dict[str, Any]]]:
         """Process code through all quality tools."""
+        result = self._process_code(code)
+        return result['code'], result['lint_issues']
+    
+    def _process_code(self, code: str, filename: Optional[str] = None) -> Dict[str, Any]:
+        if self.cache is not None:
+            key = self._cache_key('process', code, filename)
+            entry = self.cache.get(key)
+            if entry is not None:
+                return {**entry, 'cached': True, 'timings': {}}
+        
+        result = self.run_pipeline(code, filename=filename)
+        
+        if self.cache is not None:
+            entry = {'code': result['code'], 'lint_issues': result['lint_issues']}
+            self.cache.set(key, entry)
+            if result['code'] != code:
+                # The output is what the next run reads back
+                self.cache.set(self._cache_key('process', result['code'], filename), entry)
+        return {**result, 'cached': False}
+    
+    def run_pipeline(self, code: str, fix: bool = True, filename: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Run isort, black and ruff over code, reusing earlier stage outputs.
+        
+        The stages are not fused: each tool still parses the source text on
+        its own, with no shared syntax tree. With ``fix`` the code is
+        import-sorted, formatted, then fixed and linted by one ruff process;
+        without it the code is only checked. Each stage's output is
+        remembered for the last ``STAGE_MEMO_SIZE`` (stage, input) pairs, so
+        a stage whose exact input was seen before is skipped: a fix after a
+        check of the same code reuses the sorted output, the formatted
+        output when isort changed nothing, and the lint result when ruff
+        found nothing fixable. Ruff lints the code as ``filename`` when
+        given, so the configuration that applies to that path is used;
+        remembered ruff results are keyed on that configuration's digest as
+        well, so they are not reused after it is edited.
+        
+        Returns:
+            dict: ``code`` and ``lint_issues``; ``is_formatted`` and
+            ``imports_sorted`` when checking; ``timings`` (seconds per stage
+            that ran) and ``reused`` (stages served from the memo)
+        """
+        timings = {}
+        reused = []
+        
+        def stage(name, func, source, scope=None):
+            return self._run_stage(name, func, source, timings, reused, scope)
+        
+        # Ruff's results depend on the configuration that applies to the file
+        ruff_scope = (filename,) + self._ruff_config(filename)
+        lint_code = partial(self.linter.lint_code, filename=filename)
+        fix_and_lint_code = partial(self.linter.fix_and_lint_code, filename=filename)
+        
+        if not fix:
+            sorted_code = self._try_stage(stage, 'isort', self.import_sorter.sort_imports, code)
+            formatted_code = self._try_stage(stage, 'black', self.formatter.format_code, code)
+            lint_issues = stage('ruff', lint_code, code, ruff_scope)
+            if not any(issue.get('fix') for issue in lint_issues):
+                # Nothing to fix: ruff --fix would return the code as is
+                self._remember('ruff --fix', code, (code, lint_issues), ruff_scope)
+            return {
+                'code': code,
+                'lint_issues': lint_issues,
+                'is_formatted': formatted_code is not None and formatted_code.strip() == code.strip(),
+                'imports_sorted': sorted_code is not None and sorted_code.strip() == code.strip(),
+                'timings': timings,
+                'reused': reused,
+            }
+        
         # Step 1: Sort imports
-        processed_code = self.import_sorter.sort_imports(code)
+        processed_code = stage('isort', self.import_sorter.sort_imports, code)
         
         # Step 2: Format code
-        processed_code = self.formatter.format_code(processed_code)
+        processed_code = stage('black', self.formatter.format_code, processed_code)
         
-        # Step 3: Fix linting issues
-        processed_code = self.linter.fix_code(processed_code)
+        # Step 3: Fix linting issues and get the remaining ones
+        processed_code, lint_issues = stage('ruff --fix', fix_and_lint_code, processed_code, ruff_scope)
+        self._remember('ruff', processed_code, lint_issues, ruff_scope)
         
-        # Step 4: Get remaining lint issues
-        lint_issues = self.linter.lint_code(processed_code)
+        return {'code': processed_code, 'lint_issues': lint_issues, 'timings': timings, 'reused': reused}
+    
+    @staticmethod
+    def _try_stage(stage, name, func, source):
+        """Run a check stage, returning None when the tool rejects the code."""
+        try:
+            return stage(name, func, source)
+        except DeadlineExceededError:
+            raise
+        except Exception:
+            return None
+    
+    def _run_stage(self, name, func, source, timings, reused, scope=None):
+        with self._memo_lock:
+            memo_key = (name, scope, source)
+            if memo_key in self._stage_memo:
+                self._stage_memo.move_to_end(memo_key)
+                reused.append(name)
+                return self._stage_memo[memo_key]
         
-        return processed_code, lint_issues
+        start = time.perf_counter()
+        try:
+            return self._remember(name, source, func(source), scope)
+        finally:
+            timings[name] = timings.get(name, 0.0) + time.perf_counter() - start
+    
+    def _remember(self, name, source, output, scope=None):
+        memo_key = (name, scope, source)
+        with self._memo_lock:
+            self._stage_memo[memo_key] = output
+            self._stage_memo.move_to_end(memo_key)
+            while len(self._stage_memo) > self.STAGE_MEMO_SIZE:
+                self._stage_memo.popitem(last=False)
+        return output
     
     def process_file(self, file_path: str) -> Dict[str, Any]:
         """Process a file through all quality tools."""
@@ -283,60 +684,161 @@ class CodeQualityManager:
                 original_code = f.read()
             
             # Process code
-            processed_code, lint_issues = self.process_code(original_code)
+            result = self._process_code(original_code, os.path.abspath(file_path))
+            processed_code = result['code']
             
             # Write back if changed
             if original_code != processed_code:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(processed_code)
+                write_if_changed(file_path, processed_code)
             
             return {
                 'file_path': file_path,
                 'changed': original_code != processed_code,
-                'lint_issues': lint_issues,
+                'lint_issues': result['lint_issues'],
+                'cached': result['cached'],
+                'timings': result['timings'],
                 'success': True
             }
             
+        except DeadlineExceededError:
+            raise
         except Exception as e:
             return {
                 'file_path': file_path,
                 'changed': False,
                 'lint_issues': [],
+                'cached': False,
+                'timings': {},
                 'success': False,
                 'error': str(e)
             }
     
-    def process_directory(self, directory_path: str, extensions: List[str] = None) -> List[Dict[str, Any]]:
-        """Process all Python files in a directory."""
-        if extensions is None:
-            extensions = ['.py']
+    def process_directory(
+        self,
+        directory_path: str,
+        extensions: List[str] = None,
+        exclude: Optional[Sequence[str]] = None,
+        respect_gitignore: bool = True,
+        max_workers: Optional[int] = None,
+        use_processes: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Process all Python files in a directory.
         
-        results = []
-        directory = Path(directory_path)
+        See ``iter_process_directory``; results are returned sorted by path.
+        """
+        results = self.iter_process_directory(
+            directory_path,
+            extensions=extensions,
+            exclude=exclude,
+            respect_gitignore=respect_gitignore,
+            max_workers=max_workers,
+            use_processes=use_processes
+        )
+        return sorted(results, key=lambda result: result['file_path'])
+    
+    def iter_process_directory(
+        self,
+        directory_path: str,
+        extensions: List[str] = None,
+        exclude: Optional[Sequence[str]] = None,
+        respect_gitignore: bool = True,
+        max_workers: Optional[int] = None,
+        use_processes: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Process the source files of a directory in parallel, yielding results as files complete.
         
-        for file_path in directory.rglob('*'):
-            if file_path.is_file() and file_path.suffix in extensions:
-                result = self.process_file(str(file_path))
-                results.append(result)
+        Files are found by ``iter_source_files``, so VCS metadata, virtualenvs,
+        ``node_modules``, caches, ``exclude`` patterns and (by default)
+        ``.gitignore`` rules are skipped.
+        """
+        files = iter_source_files(
+            directory_path,
+            extensions=extensions,
+            exclude=exclude,
+            respect_gitignore=respect_gitignore
+        )
+        return self.iter_process_files(files, max_workers=max_workers, use_processes=use_processes)
+    
+    def iter_process_files(
+        self,
+        file_paths: Iterable[str],
+        max_workers: Optional[int] = None,
+        use_processes: bool = False
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Process files on a worker pool, yielding ``process_file`` results in completion order.
         
-        return results
+        At most ``4 * max_workers`` files are in flight, so an unbounded file
+        iterator is consumed lazily. Thread workers run under the caller's
+        request deadline; process workers build their own manager with this
+        manager's settings.
+        
+        Args:
+            file_paths: Files to process
+            max_workers: Worker count, defaults to the CPU count
+            use_processes: Use a process pool, so in-process black and isort
+                are not serialized by the GIL
+        """
+        max_workers = max_workers or os.cpu_count() or 1
+        if use_processes:
+            executor_class = ProcessPoolExecutor
+            cache_options = None
+            if self.cache is not None:
+                cache_options = (self.cache.cache_dir, self.cache.max_entries, self.cache.max_bytes)
+            submit = partial(_process_file_in_worker, self.settings[:4], cache_options)
+        else:
+            executor_class = ThreadPoolExecutor
+            submit = None
+        
+        file_paths = iter(file_paths)
+        with executor_class(max_workers=max_workers) as executor:
+            pending = set()
+            while True:
+                for file_path in file_paths:
+                    if submit is None:
+                        # A fresh copy per task: one context cannot be entered by two threads
+                        future = executor.submit(contextvars.copy_context().run, self.process_file, file_path)
+                    else:
+                        future = executor.submit(submit, file_path)
+                    pending.add(future)
+                    if len(pending) >= max_workers * 4:
+                        break
+                if not pending:
+                    return
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield future.result()
     
     def check_code_quality(self, code: str) -> Dict[str, Any]:
         """Check code quality without modifying the code."""
-        # Check formatting
-        is_formatted = self.formatter.check_formatting(code)
-        
-        # Check import sorting
-        imports_sorted = self.import_sorter.check_import_sorting(code)
+        entry = None
+        timings = {}
+        if self.cache is not None:
+            key = self._cache_key('check', code)
+            entry = self.cache.get(key)
         
-        # Get lint issues
-        lint_issues = self.linter.lint_code(code)
+        if entry is None:
+            result = self.run_pipeline(code, fix=False)
+            entry = {
+                'is_formatted': result['is_formatted'],
+                'imports_sorted': result['imports_sorted'],
+                'lint_issues': result['lint_issues'],
+            }
+            timings = result['timings']
+            if self.cache is not None:
+                self.cache.set(key, entry)
         
+        is_formatted = entry['is_formatted']
+        imports_sorted = entry['imports_sorted']
+        lint_issues = entry['lint_issues']
         return {
             'is_formatted': is_formatted,
             'imports_sorted': imports_sorted,
             'lint_issues': lint_issues,
-            'quality_score': self._calculate_quality_score(is_formatted, imports_sorted, lint_issues)
+            'quality_score': self._calculate_quality_score(is_formatted, imports_sorted, lint_issues),
+            'timings': timings
         }
     
     def _calculate_quality_score(
@@ -367,6 +869,102 @@ class CodeQualityManager:
         return max(0.0, score)
 
 
+# Directory names never searched for source files
+DEFAULT_EXCLUDED_DIRS = frozenset({
+    '.git', '.hg', '.svn', '.tox', '.nox', '.venv', 'venv', 'env', '.env',
+    'node_modules', '__pycache__', '.mypy_cache', '.pytest_cache', '.ruff_cache',
+    'build', 'dist', 'site-packages', 'htmlcov',
+})
+
+
+def _is_excluded(rel_path: str, name: str, exclude: Sequence[str]) -> bool:
+    return any(fnmatch.fnmatch(rel_path, pattern) or fnmatch.fnmatch(name, pattern) for pattern in exclude)
+
+
+def _is_gitignored(path: str, is_dir: bool, rules: List[Tuple[str, Any]]) -> bool:
+    for base, spec in rules:
+        rel_path = os.path.relpath(path, base).replace(os.sep, '/')
+        if spec.match_file(rel_path + '/' if is_dir else rel_path):
+            return True
+    return False
+
+
+def _load_gitignore(directory: str):
+    path = os.path.join(directory, '.gitignore')
+    if pathspec is None or not os.path.isfile(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return pathspec.GitIgnoreSpec.from_lines(f)
+    except (OSError, UnicodeDecodeError, ValueError):
+        return None
+
+
+def iter_source_files(
+    directory_path: str,
+    extensions: Optional[Sequence[str]] = None,
+    exclude: Optional[Sequence[str]] = None,
+    respect_gitignore: bool = True
+) -> Iterator[str]:
+    """
+    Yield the source files under a directory, pruning what should not be processed.
+    
+    Directories in ``DEFAULT_EXCLUDED_DIRS`` and ``*.egg-info`` are never
+    entered. ``exclude`` holds glob patterns matched against the path
+    relative to ``directory_path`` and against the file or directory name.
+    With ``respect_gitignore`` the ``.gitignore`` files of the tree are
+    applied (each relative to its own directory) when pathspec is
+    installed.
+    """
+    extensions = tuple(extensions or ['.py'])
+    exclude = list(exclude or [])
+    root = os.path.abspath(directory_path)
+    # (directory, spec) of every .gitignore above the directory being walked
+    ignores = {root: []}
+    
+    for current, dirs, files in os.walk(root):
+        rules = ignores.pop(current, [])
+        if respect_gitignore:
+            spec = _load_gitignore(current)
+            if spec is not None:
+                rules = rules + [(current, spec)]
+        
+        kept = []
+        for name in sorted(dirs):
+            path = os.path.join(current, name)
+            rel_path = os.path.relpath(path, root).replace(os.sep, '/')
+            if name in DEFAULT_EXCLUDED_DIRS or name.endswith('.egg-info') or os.path.islink(path):
+                continue
+            if _is_excluded(rel_path, name, exclude) or _is_gitignored(path, True, rules):
+                continue
+            kept.append(name)
+            ignores[path] = rules
+        dirs[:] = kept
+        
+        for name in sorted(files):
+            if not name.endswith(extensions):
+                continue
+            path = os.path.join(current, name)
+            rel_path = os.path.relpath(path, root).replace(os.sep, '/')
+            if _is_excluded(rel_path, name, exclude) or _is_gitignored(path, False, rules):
+                continue
+            yield path
+
+
+_worker_managers: Dict[Tuple, 'CodeQualityManager'] = {}
+
+
+def _process_file_in_worker(settings: Tuple, cache_options: Optional[Tuple], file_path: str) -> Dict[str, Any]:
+    """Process one file with the worker process's manager for ``settings`` and the parent's cache."""
+    manager = _worker_managers.get((settings, cache_options))
+    if manager is None:
+        cache = QualityCache(*cache_options) if cache_options else None
+        manager = _worker_managers[(settings, cache_options)] = CodeQualityManager(
+            *settings, use_cache=cache is not None, cache=cache
+        )
+    return manager.process_file(file_path)
+
+
 # Convenience functions
 def format_code(code: str, line_length: int = 88) -> str:
     """Format Python code using Black."""
@@ -1,93 +1,180 @@
 """
 Custom exception classes for comprehensive error handling.
+
+Every Antman exception derives from one base class. Construction only stores
+the arguments it receives: the timestamp is kept as a float and turned into a
+datetime on first access, and empty ``details`` dicts are not allocated until
+someone reads them (``to_dict`` does not). Subclasses list their extra
+attributes in ``dict_fields`` instead of overriding ``to_dict``.
+
+The ``code`` and ``extra_data`` attributes of the former
+``core.error_handling.base`` class remain available as deprecated aliases of
+``error_code`` and ``details``.
 """
 import datetime
-from typing import Dict, Any, Optional, List
+import time
+import warnings
+from typing import Dict, Any, Optional, List, Tuple
+
+
+# Values treated as "not set" when serializing optional attributes
+_EMPTY_VALUES = (None, '', {})
+
+
+class _LazyDict:
+    """Attribute stored as ``_<name>`` that returns a fresh dict the first time it is read unset."""
+
+    def __set_name__(self, owner, name):
+        self.attr_name = f'_{name}'
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        value = getattr(instance, self.attr_name)
+        if value is None:
+            value = {}
+            setattr(instance, self.attr_name, value)
+        return value
+
+    def __set__(self, instance, value):
+        setattr(instance, self.attr_name, value)
 
 
 class AntmanBaseException(Exception):
     """Base exception class for all Antman-specific errors."""
-    
+
+    default_error_code: Optional[str] = None
+    default_http_status_code: int = 500
+    # Optional attributes appended to to_dict() when they hold a value
+    dict_fields: Tuple[str, ...] = ()
+
+    details = _LazyDict()
+
     def __init__(
-        self, 
-        message: str, 
-        error_code: str = None, 
+        self,
+        message: str = "An unexpected error occurred",
+        error_code: str = None,
         details: Dict[str, Any] = None,
-        http_status_code: int = 500
+        http_status_code: int = None,
+        *,
+        code: str = None,
+        extra_data: Dict[str, Any] = None
     ):
+        if code is not None or extra_data is not None:
+            warnings.warn(
+                "'code' and 'extra_data' are deprecated; use 'error_code' and 'details'",
+                DeprecationWarning,
+                stacklevel=2
+            )
         super().__init__(message)
         self.message = message
-        self.error_code = error_code or self.__class__.__name__.upper()
-        self.details = details or {}
-        self.http_status_code = http_status_code
-        self.timestamp = datetime.datetime.now()
-    
+        self.error_code = error_code or code or self.default_error_code or self.__class__.__name__.upper()
+        self.http_status_code = http_status_code or self.default_http_status_code
+        self._details = details if details is not None else extra_data
+        self._created = time.time()
+        self._timestamp = None
+
+    @property
+    def timestamp(self) -> datetime.datetime:
+        """Creation time of the exception, converted lazily."""
+        if self._timestamp is None:
+            self._timestamp = datetime.datetime.fromtimestamp(self._created)
+        return self._timestamp
+
+    @property
+    def status_code(self) -> int:
+        """Alias of ``http_status_code`` used by the middleware."""
+        return self.http_status_code
+
+    @property
+    def code(self) -> str:
+        """Deprecated alias of ``error_code``."""
+        return self.error_code
+
+    @code.setter
+    def code(self, value: str):
+        self.error_code = value
+
+    @property
+    def extra_data(self) -> Dict[str, Any]:
+        """Deprecated alias of ``details``."""
+        return self.details
+
+    @extra_data.setter
+    def extra_data(self, value: Dict[str, Any]):
+        self.details = value
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert exception to dictionary for JSON serialization."""
-        return {
+        data = {
+            'error': True,
             'error_code': self.error_code,
             'message': self.message,
-            'details': self.details,
+            'details': self._details if self._details is not None else {},
             'timestamp': self.timestamp.isoformat(),
             'http_status_code': self.http_status_code
         }
-    
+        for name in self.dict_fields:
+            descriptor = getattr(type(self), name, None)
+            if isinstance(descriptor, _LazyDict):
+                # Read the stored value so an unset dict is not allocated
+                value = getattr(self, descriptor.attr_name)
+            else:
+                value = getattr(self, name)
+            if value not in _EMPTY_VALUES:
+                data[name] = value
+        return data
+
     def __str__(self):
         return self.message
 
 
 class ValidationError(AntmanBaseException):
     """Exception for validation errors."""
-    
+
+    default_error_code = "VALIDATION_ERROR"
+    default_http_status_code = 400
+    dict_fields = ('field_errors',)
+
+    field_errors = _LazyDict()
+
     def __init__(
         self, 
         message: str, 
         field_errors: Dict[str, List[str]] = None,
         details: Dict[str, Any] = None
     ):
-        super().__init__(
-            message, 
-            error_code="VALIDATION_ERROR", 
-            details=details,
-            http_status_code=400
-        )
-        self.field_errors = field_errors or {}
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary including field errors."""
-        data = super().to_dict()
-        if self.field_errors:
-            data['field_errors'] = self.field_errors
-        return data
+        super().__init__(message, details=details)
+        self._field_errors = field_errors
 
 
 class AuthenticationError(AntmanBaseException):
     """Exception for authentication failures."""
-    
+
+    default_error_code = "AUTHENTICATION_ERROR"
+    default_http_status_code = 401
+
     def __init__(self, message: str = "Authentication failed", details: Dict[str, Any] = None):
-        super().__init__(
-            message, 
-            error_code="AUTHENTICATION_ERROR", 
-            details=details,
-            http_status_code=401
-        )
+        super().__init__(message, details=details)
 
 
 class AuthorizationError(AntmanBaseException):
     """Exception for authorization failures."""
-    
+
+    default_error_code = "AUTHORIZATION_ERROR"
+    default_http_status_code = 403
+
     def __init__(self, message: str = "Access denied", details: Dict[str, Any] = None):
-        super().__init__(
-            message, 
-            error_code="AUTHORIZATION_ERROR", 
-            details=details,
-            http_status_code=403
-        )
+        super().__init__(message, details=details)
 
 
 class ResourceNotFoundError(AntmanBaseException):
     """Exception for resource not found errors."""
-    
+
+    default_error_code = "RESOURCE_NOT_FOUND"
+    default_http_status_code = 404
+    dict_fields = ('resource_type', 'resource_id')
+
     def __init__(
         self, 
         message: str, 
@@ -95,28 +182,20 @@ class ResourceNotFoundError(AntmanBaseException):
         resource_id: Any = None,
         details: Dict[str, Any] = None
     ):
-        super().__init__(
-            message, 
-            error_code="RESOURCE_NOT_FOUND", 
-            details=details,
-            http_status_code=404
-        )
+        super().__init__(message, details=details)
         self.resource_type = resource_type
         self.resource_id = resource_id
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary including resource info."""
-        data = super().to_dict()
-        if self.resource_type:
-            data['resource_type'] = self.resource_type
-        if self.resource_id is not None:
-            data['resource_id'] = self.resource_id
-        return data
 
 
 class ExternalServiceError(AntmanBaseException):
     """Exception for external service failures."""
-    
+
+    default_error_code = "EXTERNAL_SERVICE_ERROR"
+    default_http_status_code = 502
+    dict_fields = ('service_name', 'service_response')
+
+    service_response = _LazyDict()
+
     def __init__(
         self, 
         message: str, 
@@ -124,28 +203,18 @@ class ExternalServiceError(AntmanBaseException):
         service_response: Dict[str, Any] = None,
         details: Dict[str, Any] = None
     ):
-        super().__init__(
-            message, 
-            error_code="EXTERNAL_SERVICE_ERROR", 
-            details=details,
-            http_status_code=502
-        )
+        super().__init__(message, details=details)
         self.service_name = service_name
-        self.service_response = service_response or {}
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary including service info."""
-        data = super().to_dict()
-        if self.service_name:
-            data['service_name'] = self.service_name
-        if self.service_response:
-            data['service_response'] = self.service_response
-        return data
+        self._service_response = service_response
 
 
 class RateLimitExceededError(AntmanBaseException):
     """Exception for rate limit exceeded errors."""
-    
+
+    default_error_code = "RATE_LIMIT_EXCEEDED"
+    default_http_status_code = 429
+    dict_fields = ('limit', 'window', 'retry_after')
+
     def __init__(
         self, 
         message: str = "Rate limit exceeded", 
@@ -154,71 +223,41 @@ class RateLimitExceededError(AntmanBaseException):
         retry_after: int = None,
         details: Dict[str, Any] = None
     ):
-        super().__init__(
-            message, 
-            error_code="RATE_LIMIT_EXCEEDED", 
-            details=details,
-            http_status_code=429
-        )
+        super().__init__(message, details=details)
         self.limit = limit
         self.window = window
         self.retry_after = retry_after
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary including rate limit info."""
-        data = super().to_dict()
-        if self.limit is not None:
-            data['limit'] = self.limit
-        if self.window is not None:
-            data['window'] = self.window
-        if self.retry_after is not None:
-            data['retry_after'] = self.retry_after
-        return data
 
 
 class BusinessLogicError(AntmanBaseException):
     """Exception for business logic violations."""
-    
+
+    default_error_code = "BUSINESS_LOGIC_ERROR"
+    default_http_status_code = 422
+    dict_fields = ('rule_name',)
+
     def __init__(self, message: str, rule_name: str = None, details: Dict[str, Any] = None):
-        super().__init__(
-            message, 
-            error_code="BUSINESS_LOGIC_ERROR", 
-            details=details,
-            http_status_code=422
-        )
+        super().__init__(message, details=details)
         self.rule_name = rule_name
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary including rule info."""
-        data = super().to_dict()
-        if self.rule_name:
-            data['rule_name'] = self.rule_name
-        return data
 
 
 class ConfigurationError(AntmanBaseException):
     """Exception for configuration errors."""
-    
+
+    default_error_code = "CONFIGURATION_ERROR"
+    dict_fields = ('config_key',)
+
     def __init__(self, message: str, config_key: str = None, details: Dict[str, Any] = None):
-        super().__init__(
-            message, 
-            error_code="CONFIGURATION_ERROR", 
-            details=details,
-            http_status_code=500
-        )
+        super().__init__(message, details=details)
         self.config_key = config_key
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary including config info."""
-        data = super().to_dict()
-        if self.config_key:
-            data['config_key'] = self.config_key
-        return data
 
 
 class DatabaseError(AntmanBaseException):
     """Exception for database-related errors."""
-    
+
+    default_error_code = "DATABASE_ERROR"
+    dict_fields = ('operation', 'table')
+
     def __init__(
         self, 
         message: str, 
@@ -226,28 +265,17 @@ class DatabaseError(AntmanBaseException):
         table: str = None,
         details: Dict[str, Any] = None
     ):
-        super().__init__(
-            message, 
-            error_code="DATABASE_ERROR", 
-            details=details,
-            http_status_code=500
-        )
+        super().__init__(message, details=details)
         self.operation = operation
         self.table = table
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary including database info."""
-        data = super().to_dict()
-        if self.operation:
-            data['operation'] = self.operation
-        if self.table:
-            data['table'] = self.table
-        return data
 
 
 class CacheError(AntmanBaseException):
     """Exception for cache-related errors."""
-    
+
+    default_error_code = "CACHE_ERROR"
+    dict_fields = ('cache_key', 'cache_backend')
+
     def __init__(
         self, 
         message: str, 
@@ -255,28 +283,17 @@ class CacheError(AntmanBaseException):
         cache_backend: str = None,
         details: Dict[str, Any] = None
     ):
-        super().__init__(
-            message, 
-            error_code="CACHE_ERROR", 
-            details=details,
-            http_status_code=500
-        )
+        super().__init__(message, details=details)
         self.cache_key = cache_key
         self.cache_backend = cache_backend
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary including cache info."""
-        data = super().to_dict()
-        if self.cache_key:
-            data['cache_key'] = self.cache_key
-        if self.cache_backend:
-            data['cache_backend'] = self.cache_backend
-        return data
 
 
 class FileSystemError(AntmanBaseException):
     """Exception for file system errors."""
-    
+
+    default_error_code = "FILESYSTEM_ERROR"
+    dict_fields = ('file_path', 'operation')
+
     def __init__(
         self, 
         message: str, 
@@ -284,20 +301,6 @@ class FileSystemError(AntmanBaseException):
         operation: str = None,
         details: Dict[str, Any] = None
     ):
-        super().__init__(
-            message, 
-            error_code="FILESYSTEM_ERROR", 
-            details=details,
-            http_status_code=500
-        )
+        super().__init__(message, details=details)
         self.file_path = file_path
         self.operation = operation
-    
-    def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary including file system info."""
-        data = super().to_dict()
-        if self.file_path:
-            data['file_path'] = self.file_path
-        if self.operation:
-            data['operation'] = self.operation
-        return data
@@ -25,6 +25,7 @@ from .exceptions import (
     CacheError,
     FileSystemError
 )
+from core.resilience.exceptions import DeadlineExceededError
 
 
 logger = logging.getLogger(__name__)
@@ -42,6 +43,7 @@ class ErrorHandler:
             FileNotFoundError: self._handle_file_not_found_error,
             ConnectionError: self._handle_connection_error,
             TimeoutError: self._handle_timeout_error,
+            DeadlineExceededError: self._handle_timeout_error,
             ValueError: self._handle_value_error,
             KeyError: self._handle_key_error,
             AttributeError: self._handle_attribute_error,
@@ -2,10 +2,14 @@
 Error handling middleware for Django applications.
 """
 import logging
+import threading
+import time
 import traceback
+from collections import OrderedDict
 from django.http import JsonResponse, HttpResponse
 from django.conf import settings
 from django.utils.deprecation import MiddlewareMixin
+from django.utils.functional import empty
 from .exceptions import AntmanBaseException
 from .handlers import ErrorHandler
 
@@ -139,34 +143,105 @@ class APIErrorHandlingMiddleware(MiddlewareMixin):
         )
 
 
+class ErrorLogSampler:
+    """
+    Rate limiter for error logs keyed by exception fingerprint.
+
+    At most ``limit`` occurrences of the same fingerprint are logged per
+    ``window`` seconds; the rest are only counted and the count is reported
+    with the next logged occurrence.
+    """
+    
+    def __init__(self, window=60.0, limit=5, max_fingerprints=1000, clock=time.monotonic):
+        self.window = window
+        self.limit = limit
+        self.max_fingerprints = max_fingerprints
+        self._clock = clock
+        self._entries = OrderedDict()  # fingerprint -> [window_start, logged, suppressed]
+        self._lock = threading.Lock()
+    
+    def sample(self, fingerprint):
+        """
+        Record one occurrence of ``fingerprint``.
+        
+        Returns:
+            tuple: (should_log, suppressed_count_since_last_log)
+        """
+        now = self._clock()
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None or now - entry[0] >= self.window:
+                suppressed = entry[2] if entry else 0
+                self._entries[fingerprint] = [now, 1, 0]
+                self._entries.move_to_end(fingerprint)
+                if len(self._entries) > self.max_fingerprints:
+                    self._entries.popitem(last=False)
+                return True, suppressed
+            
+            if entry[1] < self.limit:
+                entry[1] += 1
+                suppressed, entry[2] = entry[2], 0
+                return True, suppressed
+            
+            entry[2] += 1
+            return False, 0
+
+
 class RequestLoggingErrorMiddleware(MiddlewareMixin):
-    """Middleware that logs request details when errors occur."""
+    """
+    Middleware that logs request details when errors occur.
+    
+    The captured context is bounded: only allowlisted headers are copied,
+    at most ``ERROR_LOG_BODY_BYTES`` of an already loaded body are logged
+    (the request stream is never read), values are truncated, and
+    repeated exceptions from the same code location are sampled per window.
+    """
+    
+    DEFAULT_HEADER_ALLOWLIST = [
+        'content-type', 'content-length', 'accept', 'referer',
+        'x-request-id', 'x-forwarded-for'
+    ]
     
     def __init__(self, get_response=None):
         super().__init__(get_response)
         self.get_response = get_response or (lambda request: None)
+        header_allowlist = getattr(settings, 'ERROR_LOG_HEADER_ALLOWLIST', self.DEFAULT_HEADER_ALLOWLIST)
+        # Precompute META keys so no per-request header dict is built
+        self.header_keys = [
+            (name.lower(), self._meta_key(name)) for name in header_allowlist
+        ]
+        self.body_bytes = getattr(settings, 'ERROR_LOG_BODY_BYTES', 1000)
+        self.max_value_length = getattr(settings, 'ERROR_LOG_MAX_VALUE_LENGTH', 256)
+        self.sampler = ErrorLogSampler(
+            window=getattr(settings, 'ERROR_LOG_SAMPLE_WINDOW', 60),
+            limit=getattr(settings, 'ERROR_LOG_SAMPLE_LIMIT', 5),
+            max_fingerprints=getattr(settings, 'ERROR_LOG_MAX_FINGERPRINTS', 1000)
+        )
     
     def process_exception(self, request, exception):
-        """Log detailed request information when exceptions occur."""
+        """Log bounded request information when exceptions occur."""
         try:
+            should_log, suppressed = self.sampler.sample(self._fingerprint(exception))
+            if not should_log:
+                return None
+            
             request_data = {
                 'method': request.method,
-                'path': request.path,
-                'user': str(getattr(request, 'user', 'Anonymous')),
+                'path': request.path[:self.max_value_length],
+                'user': self._get_user_label(request),
                 'ip': self._get_client_ip(request),
-                'user_agent': request.META.get('HTTP_USER_AGENT', ''),
-                'headers': dict(request.headers),
-                'exception': str(exception),
+                'user_agent': request.META.get('HTTP_USER_AGENT', '')[:self.max_value_length],
+                'headers': self._capture_headers(request),
+                'exception': str(exception)[:self.max_value_length],
                 'exception_type': type(exception).__name__
             }
             
-            # Add request body for POST/PUT/PATCH requests
-            if request.method in ['POST', 'PUT', 'PATCH']:
-                try:
-                    if hasattr(request, 'body'):
-                        request_data['body'] = request.body.decode('utf-8')[:1000]  # Limit size
-                except Exception:
-                    request_data['body'] = '<Unable to decode body>'
+            if suppressed:
+                request_data['suppressed_occurrences'] = suppressed
+            
+            # Add a bounded body prefix for POST/PUT/PATCH requests
+            if self.body_bytes and request.method in ['POST', 'PUT', 'PATCH']:
+                request_data['body'] = self._peek_body(request)
             
             logger.error(
                 f"Request error: {exception}",
@@ -180,6 +255,56 @@ class RequestLoggingErrorMiddleware(MiddlewareMixin):
         # Don't handle the exception, just log it
         return None
     
+    def _meta_key(self, header_name):
+        """Translate a header name into its request.META key."""
+        key = header_name.upper().replace('-', '_')
+        if key in ('CONTENT_TYPE', 'CONTENT_LENGTH'):
+            return key
+        return f'HTTP_{key}'
+    
+    def _capture_headers(self, request):
+        """Copy allowlisted headers, truncating long values."""
+        meta = request.META
+        headers = {}
+        for name, key in self.header_keys:
+            value = meta.get(key)
+            if value is not None:
+                headers[name] = str(value)[:self.max_value_length]
+        return headers
+    
+    def _peek_body(self, request):
+        """
+        Return at most ``body_bytes`` of an already loaded request body.
+        
+        The input stream is never read here: consuming it would make later
+        ``request.body``/``request.POST`` access (other exception handlers,
+        DRF's error path) raise RawPostDataException.
+        """
+        if not hasattr(request, '_body'):
+            return '<body not loaded>'
+        try:
+            return request._body[:self.body_bytes].decode('utf-8', errors='replace')
+        except Exception:
+            return '<Unable to decode body>'
+    
+    def _fingerprint(self, exception):
+        """Identify an exception by type and the code location that raised it."""
+        tb = exception.__traceback__
+        if tb is None:
+            return (type(exception).__name__, None, None)
+        while tb.tb_next is not None:
+            tb = tb.tb_next
+        return (type(exception).__name__, tb.tb_frame.f_code.co_filename, tb.tb_lineno)
+    
+    def _get_user_label(self, request):
+        """Describe the user without forcing a lazy user lookup."""
+        user = getattr(request, 'user', None)
+        if user is None:
+            return 'Anonymous'
+        if getattr(user, '_wrapped', None) is empty:
+            return '<not loaded>'
+        return str(user)[:self.max_value_length]
+    
     def _get_client_ip(self, request):
         """Get the client IP address from the request."""
         x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
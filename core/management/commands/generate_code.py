@@ -1,14 +1,28 @@
 """
 Django management command for code generation.
 """
+import os
 from django.core.management.base import BaseCommand, CommandError
 from django.core.management import CommandParser
 from core.code_generation.generators import (
+    CodeGeneratorManager,
     ModelGenerator, 
     ViewGenerator, 
     SerializerGenerator,
     CodeGenerationError
 )
+from core.code_generation.indexing import plan_indexes
+from core.code_generation.specs import (
+    DEFAULT_MANIFEST_NAME,
+    GenerationManifest,
+    config_hash,
+    content_hash,
+    expand_spec,
+    load_spec
+)
+from core.code_generation.templates import get_template_manager
+from core.code_generation.validation import validate_batch
+from core.code_generation.writers import BatchWriter, is_unchanged, stream_write, write_if_changed
 
 
 class Command(BaseCommand):
@@ -20,12 +34,13 @@ class Command(BaseCommand):
         """Add command arguments."""
         parser.add_argument(
             'generator_type',
+            nargs='?',
             choices=['model', 'view', 'serializer'],
-            help='Type of code to generate'
+            help='Type of code to generate (omit with --spec)'
         )
         
         # Common arguments
-        parser.add_argument('--name', required=True, help='Name of the component')
+        parser.add_argument('--name', help='Name of the component')
         parser.add_argument('--app', '--app-name', dest='app_name', help='Django app name')
         
         # Model-specific arguments
@@ -36,6 +51,17 @@ class Command(BaseCommand):
         parser.add_argument('--type', '--view-type', dest='view_type', help='Type of view')
         parser.add_argument('--model', help='Model name for the view')
         parser.add_argument('--template', help='Template name')
+        parser.add_argument(
+            '--pagination',
+            choices=['limit_offset', 'keyset'],
+            help='Paginate the APIView list endpoint'
+        )
+        parser.add_argument('--page-size', type=int, help='Default page size of a paginated APIView')
+        parser.add_argument('--select-related', help='Comma-separated relations to select_related()')
+        parser.add_argument('--prefetch-related', help='Comma-separated relations to prefetch_related()')
+        parser.add_argument('--only', help='Comma-separated fields loaded by the list endpoint')
+        parser.add_argument('--defer', help='Comma-separated fields deferred by the list endpoint')
+        parser.add_argument('--bulk', action='store_true', help='Add bulk create/update endpoints')
         
         # Serializer-specific arguments
         parser.add_argument('--serializer-fields', help='Serializer fields')
@@ -43,41 +69,228 @@ class Command(BaseCommand):
         # Output options
         parser.add_argument('--output', '-o', help='Output file path')
         parser.add_argument('--dry-run', action='store_true', help='Show generated code without saving')
+        parser.add_argument(
+            '--stream',
+            action='store_true',
+            help='Render straight to the output in chunks instead of building the module in memory'
+        )
+        
+        # Spec options
+        parser.add_argument('--spec', help='YAML/JSON spec describing a whole app')
+        parser.add_argument(
+            '--manifest',
+            help=f'Manifest path (default: {DEFAULT_MANIFEST_NAME} in the output directory)'
+        )
+        parser.add_argument('--force', action='store_true', help='Regenerate every spec entry')
+        parser.add_argument('--jobs', '-j', type=int, help='Parallel workers for spec generation')
+        parser.add_argument(
+            '--format',
+            action='store_true',
+            help='Format spec output with isort and black in process and one batched ruff --fix'
+        )
+        parser.add_argument(
+            '--validate',
+            action='store_true',
+            help='Compile spec output and check imports and model references across the batch'
+        )
     
     def handle(self, *args, **options):
         """Handle the command execution."""
+        if options.get('spec'):
+            return self._handle_spec(options)
+        
         generator_type = options['generator_type']
+        if not generator_type:
+            raise CommandError("Generator type is required unless --spec is given")
+        if not options.get('name'):
+            raise CommandError("Component name is required (--name)")
         
+        stream = options.get('stream', False)
         try:
             if generator_type == 'model':
-                code = self._generate_model(options)
+                code = self._generate_model(options, stream)
             elif generator_type == 'view':
-                code = self._generate_view(options)
+                code = self._generate_view(options, stream)
             elif generator_type == 'serializer':
-                code = self._generate_serializer(options)
+                code = self._generate_serializer(options, stream)
             else:
                 raise CommandError(f"Unknown generator type: {generator_type}")
             
             if options['dry_run']:
                 self.stdout.write(self.style.SUCCESS("Generated code:"))
-                self.stdout.write(code)
+                self._write_code(code)
             else:
                 if options['output']:
-                    with open(options['output'], 'w', encoding='utf-8') as f:
-                        f.write(code)
-                    self.stdout.write(
-                        self.style.SUCCESS(f"{generator_type.title()} code saved to {options['output']}")
-                    )
+                    if stream:
+                        written = stream_write(options['output'], code)
+                    else:
+                        written = write_if_changed(options['output'], code)
+                    if written:
+                        self.stdout.write(
+                            self.style.SUCCESS(f"{generator_type.title()} code saved to {options['output']}")
+                        )
+                    else:
+                        self.stdout.write(f"{options['output']} is up to date")
                 else:
                     self.stdout.write(self.style.SUCCESS(f"{generator_type.title()} generated successfully:"))
-                    self.stdout.write(code)
+                    self._write_code(code)
                     
         except CodeGenerationError as e:
             raise CommandError(f"Code generation failed: {str(e)}")
         except Exception as e:
             raise CommandError(f"Unexpected error: {str(e)}")
     
-    def _generate_model(self, options):
+    def _handle_spec(self, options):
+        """
+        Generate every entry of a spec file incrementally.
+        
+        Entries whose config and template hashes match the manifest (and whose
+        output is untouched on disk) are not rendered at all; rendered output
+        identical to the file on disk is not rewritten. With ``--format`` the
+        rendered modules are formatted before that comparison; with
+        ``--validate`` modules that fail ``validate_batch`` are not written.
+        """
+        spec_path = options['spec']
+        try:
+            spec = load_spec(spec_path)
+            batch_specs = expand_spec(spec)
+        except CodeGenerationError as e:
+            raise CommandError(f"Invalid spec: {str(e)}")
+        
+        for item in batch_specs:
+            if item['type'] == 'model' and item['config'].get('query_patterns'):
+                try:
+                    warnings = plan_indexes(item['config'])['warnings']
+                except CodeGenerationError:
+                    # Reported as a failed entry by the batch below
+                    continue
+                for warning in warnings:
+                    self.stderr.write(self.style.WARNING(f"{item['config']['name']}: {warning}"))
+        
+        output_dir = options.get('output') or os.path.join(
+            os.path.dirname(os.path.abspath(spec_path)),
+            spec.get('output_dir') or spec['app_name']
+        )
+        manifest = GenerationManifest(
+            options.get('manifest') or os.path.join(output_dir, DEFAULT_MANIFEST_NAME),
+            output_dir=output_dir
+        )
+        template_manager = get_template_manager()
+        
+        format_code = options.get('format', False)
+        pending = []
+        skipped = 0
+        current = []
+        for item in batch_specs:
+            input_hash = config_hash(item['type'], item['config'])
+            if format_code:
+                input_hash = content_hash(input_hash + ':formatted')
+            template_hash = template_manager.get_template_hash(item['type'])
+            if not options.get('force') and manifest.is_current(item['output'], input_hash, template_hash):
+                skipped += 1
+                current.append(item)
+                continue
+            pending.append((item, input_hash, template_hash))
+        
+        failed = 0
+        # Render only; outputs are compared and written here
+        results = list(CodeGeneratorManager().generate_batch(
+            [{'type': item['type'], 'config': item['config']} for item, _, _ in pending],
+            max_workers=options.get('jobs'),
+            format_code=format_code
+        ))
+        rendered = []
+        for result in results:
+            item = pending[result['index']][0]
+            if result['success']:
+                rendered.append(result)
+            else:
+                failed += 1
+                self.stderr.write(f"{item['output']}: {result['error']}")
+        
+        if format_code and rendered:
+            # Imported here: black and isort are slow to import
+            from core.code_generation.formatting import CodeFormattingStage
+            try:
+                fixed = CodeFormattingStage(project_root=output_dir).lint_fix([result['code'] for result in rendered])
+            except CodeGenerationError as e:
+                raise CommandError(f"Code formatting failed: {str(e)}")
+            for result, (code, _) in zip(rendered, fixed):
+                result['code'] = code
+        
+        if options.get('validate') and rendered:
+            rendered, invalid = self._validate(rendered, pending, current, output_dir, spec['app_name'])
+            failed += invalid
+        
+        writer = BatchWriter()
+        try:
+            for result in rendered:
+                item, input_hash, template_hash = pending[result['index']]
+                code = result['code']
+                file_path = os.path.join(output_dir, item['output'])
+                if options['dry_run']:
+                    if is_unchanged(file_path, code):
+                        writer.skipped += 1
+                    else:
+                        writer.written += 1
+                        self.stdout.write(f"Would write {item['output']}")
+                elif writer.write(file_path, code):
+                    self.stdout.write(f"Wrote {item['output']}")
+                manifest.record(item['output'], input_hash, template_hash, content_hash(code))
+        except BaseException:
+            writer.discard()
+            raise
+        
+        if not options['dry_run']:
+            writer.commit()
+            manifest.retain(item['output'] for item in batch_specs)
+            manifest.save()
+        
+        written, unchanged = writer.written, writer.skipped
+        self.stdout.write(self.style.SUCCESS(
+            f"{written} written, {unchanged} unchanged, {skipped} skipped, {failed} failed"
+        ))
+        if failed:
+            raise CommandError(f"Code generation failed for {failed} spec entries")
+    
+    def _validate(self, rendered, pending, current, output_dir, app_name):
+        """
+        Validate rendered modules together with the unchanged outputs they may import.
+        
+        Returns:
+            tuple: the rendered results that passed and the number that failed
+        """
+        items = [
+            {'code': result['code'], 'output': pending[result['index']][0]['output'], 'app_name': app_name}
+            for result in rendered
+        ]
+        for item in current:
+            try:
+                with open(os.path.join(output_dir, item['output']), 'r', encoding='utf-8') as f:
+                    items.append({'code': f.read(), 'output': item['output'], 'app_name': app_name})
+            except OSError:
+                continue
+        
+        valid = []
+        for result, validation in zip(rendered, validate_batch(items)):
+            if validation['success']:
+                valid.append(result)
+                continue
+            output = pending[result['index']][0]['output']
+            for error in validation['errors']:
+                self.stderr.write(f"{output}:{error['line']}: {error['message']}")
+        return valid, len(rendered) - len(valid)
+    
+    def _write_code(self, code):
+        """Write generated code (a string or an iterator of chunks) to stdout."""
+        if isinstance(code, str):
+            self.stdout.write(code)
+            return
+        for chunk in code:
+            self.stdout.write(chunk, ending='')
+        self.stdout.write('')
+    
+    def _generate_model(self, options, stream=False):
         """Generate model code."""
         config = {
             'name': options['name'],
@@ -89,9 +302,9 @@ class Command(BaseCommand):
             config['app_name'] = options['app_name']
         
         generator = ModelGenerator()
-        return generator.generate(config)
+        return generator.generate_stream(config) if stream else generator.generate(config)
     
-    def _generate_view(self, options):
+    def _generate_view(self, options, stream=False):
         """Generate view code."""
         if not options.get('view_type'):
             raise CommandError("View type is required (--type)")
@@ -101,13 +314,19 @@ class Command(BaseCommand):
             'type': options['view_type'],
             'model': options.get('model'),
             'app_name': options.get('app_name'),
-            'template_name': options.get('template')
+            'template_name': options.get('template'),
+            'pagination': options.get('pagination'),
+            'page_size': options.get('page_size'),
+            'bulk': options.get('bulk', False)
         }
+        for option in ('select_related', 'prefetch_related', 'only', 'defer'):
+            if options.get(option):
+                config[option] = self._parse_serializer_fields(options[option])
         
         generator = ViewGenerator()
-        return generator.generate(config)
+        return generator.generate_stream(config) if stream else generator.generate(config)
     
-    def _generate_serializer(self, options):
+    def _generate_serializer(self, options, stream=False):
         """Generate serializer code."""
         config = {
             'name': options['name'],
@@ -117,7 +336,7 @@ class Command(BaseCommand):
         }
         
         generator = SerializerGenerator()
-        return generator.generate(config)
+        return generator.generate_stream(config) if stream else generator.generate(config)
     
     def _parse_fields(self, fields_str):
         """Parse field string into field configuration."""
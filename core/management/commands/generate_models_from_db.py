@@ -0,0 +1,82 @@
+"""
+Django management command generating models from a live database schema.
+"""
+import os
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management import CommandParser
+from core.code_generation.exceptions import CodeGenerationError
+from core.code_generation.generators import CodeGeneratorManager
+from core.code_generation.introspection import introspect_model_configs
+from core.code_generation.specs import snake_case
+from core.code_generation.writers import BatchWriter
+
+
+class Command(BaseCommand):
+    """Generate unmanaged models for every table of a database."""
+    
+    help = 'Generate Django models from an existing database schema'
+    
+    def add_arguments(self, parser: CommandParser):
+        """Add command arguments."""
+        parser.add_argument('--database', default='default', help='Database alias to introspect')
+        parser.add_argument('--schema', help='Database schema (PostgreSQL, default: public)')
+        parser.add_argument('--app', '--app-name', dest='app_name', help='Django app name')
+        parser.add_argument('--output', '-o', required=True, help='Models package directory')
+        parser.add_argument('--include', action='append', help='Glob of table names to include (repeatable)')
+        parser.add_argument('--exclude', action='append', help='Glob of table names to exclude (repeatable)')
+        parser.add_argument('--jobs', '-j', type=int, help='Parallel workers')
+        parser.add_argument('--processes', action='store_true', help='Render in worker processes')
+        parser.add_argument('--dry-run', action='store_true', help='Render without writing files')
+    
+    def handle(self, *args, **options):
+        """Handle the command execution."""
+        try:
+            configs = introspect_model_configs(
+                using=options['database'],
+                schema=options.get('schema'),
+                include=options.get('include'),
+                exclude=options.get('exclude'),
+                app_name=options.get('app_name')
+            )
+        except CodeGenerationError as e:
+            raise CommandError(f"Schema introspection failed: {str(e)}")
+        
+        if not configs:
+            self.stdout.write("No tables found")
+            return
+        
+        output_dir = options['output']
+        modules = [snake_case(config['name']) for config in configs]
+        failed = 0
+        writer = BatchWriter()
+        try:
+            results = CodeGeneratorManager().generate_batch(
+                [{'type': 'model', 'config': config} for config in configs],
+                max_workers=options.get('jobs'),
+                use_processes=options.get('processes', False)
+            )
+            for result in results:
+                if not result['success']:
+                    failed += 1
+                    self.stderr.write(f"{configs[result['index']]['db_table']}: {result['error']}")
+                    continue
+                if not options['dry_run']:
+                    writer.write(os.path.join(output_dir, modules[result['index']] + '.py'), result['code'])
+            
+            if not options['dry_run']:
+                imports = ''.join(
+                    f"from .{module} import {config['name']}  # noqa: F401\n"
+                    for module, config in sorted(zip(modules, configs))
+                )
+                writer.write(os.path.join(output_dir, '__init__.py'), imports)
+        except BaseException:
+            writer.discard()
+            raise
+        writer.commit()
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(configs) - failed} models generated from {len(configs)} tables "
+            f"({writer.written} files written, {writer.skipped} unchanged)"
+        ))
+        if failed:
+            raise CommandError(f"Model generation failed for {failed} tables")
@@ -0,0 +1,100 @@
+"""
+Deadline middleware for per-request time budgets.
+"""
+import logging
+from typing import Optional
+from django.http import HttpRequest, HttpResponse
+from django.utils.deprecation import MiddlewareMixin
+from django.conf import settings
+
+from core.error_handling.handlers import error_handler
+from core.resilience.deadline import (
+    Deadline,
+    install_query_deadline_guard,
+    reset_current_deadline,
+    set_current_deadline
+)
+from core.resilience.exceptions import DeadlineExceededError
+
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineMiddleware(MiddlewareMixin):
+    """
+    Middleware that gives every request a deadline.
+
+    The budget comes from the longest matching prefix in
+    ``REQUEST_DEADLINE_ROUTES`` (falling back to ``REQUEST_DEADLINE_SECONDS``)
+    and can be shortened by the client through the ``X-Request-Timeout``
+    header. The deadline is exposed as ``request.deadline`` and through
+    ``core.resilience.deadline.get_current_deadline()`` for code that has no
+    access to the request. Database queries started after the deadline are
+    refused, and DeadlineExceededError is rendered as a timeout response.
+
+    The deadline is cleared as soon as the response leaves this middleware,
+    so it belongs at the end of ``MIDDLEWARE``: the response phase of the
+    middleware listed after it (a session save, for example) would otherwise
+    run under an expired budget and turn a finished response into an error.
+    """
+
+    def __init__(self, get_response=None):
+        super().__init__(get_response)
+        self.get_response = get_response or (lambda request: None)
+        self.default_timeout = getattr(settings, 'REQUEST_DEADLINE_SECONDS', 30)
+        self.max_timeout = getattr(settings, 'REQUEST_DEADLINE_MAX_SECONDS', 300)
+        routes = getattr(settings, 'REQUEST_DEADLINE_ROUTES', {})
+        # Longest prefix first so the most specific policy wins
+        self.routes = sorted(routes.items(), key=lambda item: len(item[0]), reverse=True)
+        header = getattr(settings, 'REQUEST_DEADLINE_HEADER', 'X-Request-Timeout')
+        self.header_key = 'HTTP_' + header.upper().replace('-', '_')
+        install_query_deadline_guard()
+
+    def process_request(self, request: HttpRequest) -> None:
+        """Attach the request deadline and make it current."""
+        timeout = self._resolve_timeout(request)
+        if timeout is None:
+            return
+
+        request.deadline = Deadline(timeout)
+        request._deadline_token = set_current_deadline(request.deadline)
+
+    def process_response(self, request: HttpRequest, response: HttpResponse) -> HttpResponse:
+        """Clear the current deadline."""
+        token = getattr(request, '_deadline_token', None)
+        if token is not None:
+            reset_current_deadline(token)
+            request._deadline_token = None
+        return response
+
+    def process_exception(self, request: HttpRequest, exception: Exception) -> Optional[HttpResponse]:
+        """Render cooperative cancellations through the timeout handler."""
+        if not isinstance(exception, DeadlineExceededError):
+            return None
+
+        logger.warning(
+            f"Request deadline exceeded: {request.method} {request.path}",
+            extra={'timeout': exception.timeout}
+        )
+        return error_handler.handle_error(request, exception)
+
+    def _resolve_timeout(self, request: HttpRequest) -> Optional[float]:
+        """Return the budget in seconds for this request, or None for no deadline."""
+        timeout = self.default_timeout
+        for prefix, route_timeout in self.routes:
+            if request.path.startswith(prefix):
+                timeout = route_timeout
+                break
+
+        header_value = request.META.get(self.header_key)
+        if header_value:
+            try:
+                client_timeout = float(header_value)
+            except ValueError:
+                client_timeout = None
+            if client_timeout is not None and client_timeout > 0:
+                timeout = client_timeout if timeout is None else min(timeout, client_timeout)
+
+        if timeout is None:
+            return None
+        return min(timeout, self.max_timeout)
@@ -0,0 +1,9 @@
+"""
+복원력(resilience) 패키지.
+
+이 패키지는 GitLab, 프로젝트 데이터베이스, 프로젝트 웹사이트와 같은
+외부 의존성 호출을 보호하기 위한 서킷 브레이커와 벌크헤드,
+재시도와 헤징을 지원하는 공용 아웃바운드 HTTP 클라이언트,
+요청 단위 데드라인 전파 기능을 제공합니다.
+"""
+# Resilience package
@@ -0,0 +1,285 @@
+"""
+Circuit breakers and bulkheads for calls to external dependencies.
+
+Each target (a GitLab instance, a project database, a project website) gets
+one CircuitBreaker shared by every thread in the worker process. The breaker
+tracks the outcome of the most recent calls; once the failure rate in that
+window crosses the threshold it opens and rejects calls immediately with
+CircuitOpenError instead of letting them wait for a full timeout. After
+``reset_timeout`` seconds a limited number of trial calls are let through
+(half-open); a success closes the circuit again, a failure re-opens it.
+Every admitted call carries the state generation it was admitted in, so a
+slow call admitted before the circuit tripped cannot release a trial slot or
+decide the outcome of a later half-open period. Rejections by a nested
+breaker or bulkhead, and DeadlineExceededError (the caller's own request
+budget running out, although it is a TimeoutError), are not counted as
+failures of the target.
+
+An optional bulkhead caps the number of concurrent calls per target so that
+one slow dependency cannot occupy every worker thread.
+"""
+import functools
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Optional, Tuple, Type
+
+from django.conf import settings
+
+from core.error_handling.exceptions import ExternalServiceError
+from .exceptions import BulkheadFullError, CircuitOpenError, DeadlineExceededError
+
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker with an optional concurrency bulkhead."""
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(
+        self,
+        name: str,
+        failure_rate_threshold: float = 0.5,
+        minimum_calls: int = 10,
+        window_size: int = 20,
+        reset_timeout: float = 30.0,
+        half_open_max_calls: int = 1,
+        max_concurrent: Optional[int] = None,
+        bulkhead_timeout: float = 0.0,
+        failure_exceptions: Tuple[Type[BaseException], ...] = (
+            ConnectionError, TimeoutError, ExternalServiceError
+        ),
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if not 0 < failure_rate_threshold <= 1:
+            raise ValueError("failure_rate_threshold must be in (0, 1]")
+        if minimum_calls > window_size:
+            raise ValueError("minimum_calls cannot exceed window_size")
+
+        self.name = name
+        self.failure_rate_threshold = failure_rate_threshold
+        self.minimum_calls = minimum_calls
+        self.window_size = window_size
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.max_concurrent = max_concurrent
+        self.bulkhead_timeout = bulkhead_timeout
+        self.failure_exceptions = failure_exceptions
+        self._clock = clock
+
+        self._lock = threading.Lock()
+        self._state = self.CLOSED
+        self._outcomes = deque(maxlen=window_size)  # True for failure
+        self._failures = 0
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        # Bumped on every trip and reset; calls admitted earlier are stale
+        self._generation = 0
+        self._bulkhead = threading.BoundedSemaphore(max_concurrent) if max_concurrent else None
+
+    @property
+    def state(self) -> str:
+        """Current state, moving from open to half-open once the reset timeout has passed."""
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+            self._state = self.HALF_OPEN
+            self._half_open_calls = 0
+            logger.info(f"Circuit '{self.name}' half-open")
+        return self._state
+
+    def _before_call(self) -> Tuple[bool, int]:
+        """
+        Reserve permission for one call or raise CircuitOpenError.
+
+        Returns:
+            tuple: ``(trial, generation)`` token passed back to ``_record``
+            and ``_release``
+        """
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return False, self._generation
+            if state == self.HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+                self._half_open_calls += 1
+                return True, self._generation
+            retry_after = max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+
+        raise CircuitOpenError(
+            f"Circuit for '{self.name}' is open",
+            service_name=self.name,
+            retry_after=round(retry_after, 3)
+        )
+
+    def _release(self, token: Tuple[bool, int]) -> None:
+        """Give back a call's trial slot without recording an outcome."""
+        trial, generation = token
+        with self._lock:
+            if trial and generation == self._generation:
+                self._half_open_calls -= 1
+
+    def _record(self, token: Tuple[bool, int], failed: bool) -> None:
+        trial, generation = token
+        with self._lock:
+            if generation != self._generation:
+                # Admitted before the last trip or reset: its outcome is stale
+                return
+            if trial:
+                self._half_open_calls -= 1
+                if failed:
+                    self._trip()
+                else:
+                    self._reset()
+                return
+
+            if len(self._outcomes) == self.window_size and self._outcomes[0]:
+                self._failures -= 1
+            self._outcomes.append(failed)
+            if failed:
+                self._failures += 1
+
+            if (
+                self._state == self.CLOSED
+                and len(self._outcomes) >= self.minimum_calls
+                and self._failures / len(self._outcomes) >= self.failure_rate_threshold
+            ):
+                self._trip()
+
+    def _trip(self) -> None:
+        self._generation += 1
+        self._state = self.OPEN
+        self._opened_at = self._clock()
+        logger.warning(f"Circuit '{self.name}' opened")
+
+    def _reset(self) -> None:
+        self._generation += 1
+        self._state = self.CLOSED
+        self._outcomes.clear()
+        self._failures = 0
+        logger.info(f"Circuit '{self.name}' closed")
+
+    @contextmanager
+    def guard(self):
+        """Run the enclosed block under the breaker and bulkhead."""
+        token = self._before_call()
+
+        if self._bulkhead is not None and not self._bulkhead.acquire(timeout=self.bulkhead_timeout):
+            self._release(token)
+            raise BulkheadFullError(
+                f"Too many concurrent calls to '{self.name}'",
+                service_name=self.name,
+                max_concurrent=self.max_concurrent
+            )
+
+        try:
+            yield self
+        except (CircuitOpenError, BulkheadFullError, DeadlineExceededError):
+            # Shed by a nested breaker or bulkhead, or out of the caller's
+            # budget: says nothing about this target
+            self._release(token)
+            raise
+        except self.failure_exceptions:
+            self._record(token, failed=True)
+            raise
+        except BaseException:
+            # Errors unrelated to the target's health still release a half-open slot
+            self._record(token, failed=False)
+            raise
+        else:
+            self._record(token, failed=False)
+        finally:
+            if self._bulkhead is not None:
+                self._bulkhead.release()
+
+    def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Call ``func`` under the breaker and bulkhead."""
+        with self.guard():
+            return func(*args, **kwargs)
+
+    def __call__(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Use the breaker as a decorator."""
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return self.call(func, *args, **kwargs)
+        return wrapper
+
+    def reset(self) -> None:
+        """Force the circuit closed and clear the failure window."""
+        with self._lock:
+            self._reset()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the breaker state for monitoring and health checks."""
+        with self._lock:
+            calls = len(self._outcomes)
+            return {
+                'name': self.name,
+                'state': self._current_state(),
+                'calls': calls,
+                'failures': self._failures,
+                'failure_rate': round(self._failures / calls, 3) if calls else 0.0,
+                'max_concurrent': self.max_concurrent
+            }
+
+
+class CircuitBreakerRegistry:
+    """Process-wide registry holding one breaker per target name."""
+
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str, **options) -> CircuitBreaker:
+        """
+        Return the breaker for ``name``, creating it on first use.
+
+        Options come from ``settings.CIRCUIT_BREAKER_DEFAULTS``, then
+        ``settings.CIRCUIT_BREAKERS[name]``, then the keyword arguments of the
+        first call that creates the breaker.
+        """
+        breaker = self._breakers.get(name)
+        if breaker is not None:
+            return breaker
+
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                config = dict(getattr(settings, 'CIRCUIT_BREAKER_DEFAULTS', {}))
+                config.update(getattr(settings, 'CIRCUIT_BREAKERS', {}).get(name, {}))
+                config.update(options)
+                breaker = CircuitBreaker(name, **config)
+                self._breakers[name] = breaker
+            return breaker
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return the state of every registered breaker."""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {breaker.name: breaker.snapshot() for breaker in breakers}
+
+    def clear(self) -> None:
+        """Drop every registered breaker."""
+        with self._lock:
+            self._breakers.clear()
+
+
+# Global registry instance shared by all threads in the worker
+circuit_breakers = CircuitBreakerRegistry()
+
+
+def circuit_breaker(name: str, **options) -> Callable[[Callable[..., Any]], Callable[..., Any]]:
+    """Decorator protecting a function with the shared breaker for ``name``."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return circuit_breakers.get(name, **options).call(func, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,131 @@
+"""
+Per-request deadlines.
+
+A Deadline is the point in time after which the client (and nginx in front of
+us) has given up on a request. The active deadline lives in a context
+variable so any code running on behalf of the request - ORM queries,
+outbound HTTP calls, subprocess-based tools - can ask for the remaining
+budget and stop cooperatively by raising DeadlineExceededError, which the
+error handler renders like any other timeout.
+"""
+import contextvars
+import time
+from contextlib import contextmanager
+from typing import Callable, Optional
+
+from .exceptions import DeadlineExceededError
+
+
+_current_deadline: contextvars.ContextVar = contextvars.ContextVar('antman_deadline', default=None)
+
+
+class Deadline:
+    """Absolute expiry time measured on a monotonic clock."""
+
+    __slots__ = ('timeout', 'expires_at', '_clock')
+
+    def __init__(self, timeout: float, clock: Callable[[], float] = time.monotonic):
+        self.timeout = timeout
+        self.expires_at = clock() + timeout
+        self._clock = clock
+
+    def remaining(self) -> float:
+        """Seconds left before the deadline, never negative."""
+        return max(0.0, self.expires_at - self._clock())
+
+    @property
+    def expired(self) -> bool:
+        return self._clock() >= self.expires_at
+
+    def check(self, operation: str = None) -> None:
+        """Raise DeadlineExceededError if the deadline has passed."""
+        if self.expired:
+            raise DeadlineExceededError(
+                f"Deadline of {self.timeout:g}s exceeded" + (f" before {operation}" if operation else ""),
+                timeout=self.timeout
+            )
+
+    def timeout_for(self, default: Optional[float] = None) -> float:
+        """Return the remaining budget, capped by ``default`` when given."""
+        remaining = self.remaining()
+        if default is None:
+            return remaining
+        return min(default, remaining)
+
+    def __repr__(self):
+        return f"<Deadline timeout={self.timeout:g}s remaining={self.remaining():.3f}s>"
+
+
+def get_current_deadline() -> Optional[Deadline]:
+    """Return the deadline of the current request, if any."""
+    return _current_deadline.get()
+
+
+def set_current_deadline(deadline: Optional[Deadline]) -> contextvars.Token:
+    """Make ``deadline`` current; pass the returned token to ``reset_current_deadline``."""
+    return _current_deadline.set(deadline)
+
+
+def reset_current_deadline(token: contextvars.Token) -> None:
+    _current_deadline.reset(token)
+
+
+def check_deadline(operation: str = None) -> None:
+    """Raise DeadlineExceededError if the current deadline has passed."""
+    deadline = _current_deadline.get()
+    if deadline is not None:
+        deadline.check(operation)
+
+
+def remaining_timeout(default: Optional[float] = None, operation: str = None) -> Optional[float]:
+    """
+    Timeout to use for a blocking call made on behalf of the current request.
+
+    Returns ``default`` when no deadline is active, otherwise the remaining
+    budget capped by ``default``. Raises DeadlineExceededError when the
+    deadline has already passed so the call is not started at all.
+    """
+    deadline = _current_deadline.get()
+    if deadline is None:
+        return default
+    deadline.check(operation)
+    return deadline.timeout_for(default)
+
+
+@contextmanager
+def deadline_scope(timeout: float):
+    """
+    Run the enclosed block under a deadline of ``timeout`` seconds.
+
+    An enclosing deadline that expires earlier is kept, so scopes can only
+    tighten the budget.
+    """
+    deadline = Deadline(timeout)
+    current = _current_deadline.get()
+    if current is not None and current.expires_at <= deadline.expires_at:
+        deadline = current
+    token = _current_deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current_deadline.reset(token)
+
+
+def query_deadline_guard(execute, sql, params, many, context):
+    """Database execute wrapper refusing to start queries after the deadline."""
+    check_deadline('database query')
+    return execute(sql, params, many, context)
+
+
+def install_query_deadline_guard() -> None:
+    """Attach ``query_deadline_guard`` to current and future database connections."""
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    def attach(connection, **kwargs):
+        if query_deadline_guard not in connection.execute_wrappers:
+            connection.execute_wrappers.append(query_deadline_guard)
+
+    connection_created.connect(attach, weak=False, dispatch_uid='antman_query_deadline_guard')
+    for connection in connections.all(initialized_only=True):
+        attach(connection)
@@ -0,0 +1,50 @@
+"""
+Custom exceptions for the resilience module.
+"""
+from typing import Dict, Any
+
+from core.error_handling.exceptions import ExternalServiceError
+
+
+class CircuitOpenError(ExternalServiceError):
+    """Raised when a call is rejected because the target's circuit is open."""
+
+    default_error_code = "CIRCUIT_OPEN"
+    default_http_status_code = 503
+    dict_fields = ExternalServiceError.dict_fields + ('retry_after',)
+
+    def __init__(
+        self,
+        message: str,
+        service_name: str = None,
+        retry_after: float = None,
+        details: Dict[str, Any] = None
+    ):
+        super().__init__(message, service_name=service_name, details=details)
+        self.retry_after = retry_after
+
+
+class BulkheadFullError(ExternalServiceError):
+    """Raised when a target already has the maximum number of calls in flight."""
+
+    default_error_code = "BULKHEAD_FULL"
+    default_http_status_code = 503
+    dict_fields = ExternalServiceError.dict_fields + ('max_concurrent',)
+
+    def __init__(
+        self,
+        message: str,
+        service_name: str = None,
+        max_concurrent: int = None,
+        details: Dict[str, Any] = None
+    ):
+        super().__init__(message, service_name=service_name, details=details)
+        self.max_concurrent = max_concurrent
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when work is abandoned because the request deadline has passed."""
+
+    def __init__(self, message: str = "Request deadline exceeded", timeout: float = None):
+        super().__init__(message)
+        self.timeout = timeout
@@ -0,0 +1,331 @@
+"""
+Shared outbound HTTP client policy.
+
+OutboundHTTPClient wraps httpx with:
+
+* one pooled ``httpx.Client`` per (scheme, host, port);
+* retries with exponential backoff and full jitter for idempotent requests,
+  limited by a per-host retry budget so retries cannot multiply load on a
+  target that is already struggling;
+* optional hedging: if an idempotent request has not answered after
+  ``hedge_after`` seconds a second copy is sent (to a mirror when given) and
+  the first successful response wins;
+* optional circuit breaking through ``core.resilience.circuit_breaker``.
+
+Each attempt's timeout is capped by the current request deadline and no
+retry is scheduled once the remaining budget cannot cover the backoff.
+Final failures are raised as ``TimeoutError`` or ``ExternalServiceError`` so
+ErrorHandler renders them like any other external service failure. Retryable
+statuses (502/503/504) are only raised for requests that may be retried;
+other requests get the response back with its body. Rejections by a circuit
+breaker or bulkhead are never retried.
+"""
+import contextvars
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from typing import Any, Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+import httpx
+
+from core.error_handling.exceptions import ExternalServiceError
+from .circuit_breaker import circuit_breakers
+from .deadline import get_current_deadline, remaining_timeout
+from .exceptions import BulkheadFullError, CircuitOpenError
+
+
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE', 'TRACE'})
+RETRY_STATUS_CODES = frozenset({502, 503, 504})
+
+
+class RetryBudget:
+    """Token bucket allowing retries only up to a fraction of recent requests."""
+
+    def __init__(self, ratio: float = 0.2, initial_tokens: float = 10.0, max_tokens: float = 100.0):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = initial_tokens
+        self._lock = threading.Lock()
+
+    def deposit(self) -> None:
+        """Credit the budget for one original request."""
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """Spend one token for a retry; return False when the budget is exhausted."""
+        with self._lock:
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+    @property
+    def tokens(self) -> float:
+        return self._tokens
+
+
+class RetryPolicy:
+    """Retry limits and jittered exponential backoff."""
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        backoff_base: float = 0.1,
+        backoff_max: float = 2.0,
+        retry_status_codes: FrozenSet[int] = RETRY_STATUS_CODES,
+        budget_ratio: float = 0.2
+    ):
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.retry_status_codes = retry_status_codes
+        self.budget_ratio = budget_ratio
+
+    def backoff(self, attempt: int, rng: random.Random) -> float:
+        """Return the delay before retry number ``attempt`` (full jitter)."""
+        return rng.uniform(0, min(self.backoff_max, self.backoff_base * (2 ** attempt)))
+
+
+class OutboundHTTPClient:
+    """httpx wrapper applying the shared outbound policy."""
+
+    def __init__(
+        self,
+        timeout: float = 10.0,
+        max_connections_per_host: int = 20,
+        max_keepalive_per_host: int = 10,
+        retry_policy: Optional[RetryPolicy] = None,
+        hedge_after: Optional[float] = None,
+        hedge_workers: int = 8,
+        transport: Optional[httpx.BaseTransport] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Optional[random.Random] = None
+    ):
+        self.timeout = timeout
+        self.limits = httpx.Limits(
+            max_connections=max_connections_per_host,
+            max_keepalive_connections=max_keepalive_per_host
+        )
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.hedge_after = hedge_after
+        self.hedge_workers = hedge_workers
+        self._transport = transport
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+
+        self._clients: Dict[Tuple[str, str, Optional[int]], httpx.Client] = {}
+        self._budgets: Dict[str, RetryBudget] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def _host_key(self, url: httpx.URL) -> Tuple[str, str, Optional[int]]:
+        return (url.scheme, url.host, url.port)
+
+    def _client_for(self, url: httpx.URL) -> httpx.Client:
+        """Return the pooled client for the URL's host, creating it on first use."""
+        key = self._host_key(url)
+        client = self._clients.get(key)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(key)
+                if client is None:
+                    client = httpx.Client(
+                        timeout=self.timeout,
+                        limits=self.limits,
+                        transport=self._transport
+                    )
+                    self._clients[key] = client
+        return client
+
+    def _budget_for(self, host: str) -> RetryBudget:
+        budget = self._budgets.get(host)
+        if budget is None:
+            with self._lock:
+                budget = self._budgets.setdefault(
+                    host, RetryBudget(ratio=self.retry_policy.budget_ratio)
+                )
+        return budget
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.hedge_workers, thread_name_prefix='outbound-hedge'
+                    )
+        return self._executor
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        idempotent: Optional[bool] = None,
+        hedge_after: Optional[float] = None,
+        mirrors: Iterable[str] = (),
+        service_name: Optional[str] = None,
+        **kwargs
+    ) -> httpx.Response:
+        """
+        Send a request under the outbound policy.
+
+        Args:
+            method: HTTP method
+            url: Target URL
+            idempotent: Override whether the request may be retried or hedged;
+                defaults to the HTTP method semantics
+            hedge_after: Seconds to wait before sending a hedged copy;
+                defaults to the client setting, ``None`` disables hedging
+            mirrors: Alternative URLs used for hedged copies
+            service_name: Circuit breaker name guarding each attempt
+            **kwargs: Passed to ``httpx.Client.request``
+
+        Returns:
+            httpx.Response: The first response that is not a retryable failure;
+            non-idempotent requests return retryable statuses as responses
+
+        Raises:
+            TimeoutError: The final attempt timed out
+            DeadlineExceededError: The request deadline passed before an attempt started
+            ExternalServiceError: The final attempt failed or (idempotent
+                requests only) returned a retryable status
+        """
+        method = method.upper()
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        if hedge_after is None:
+            hedge_after = self.hedge_after
+
+        urls = [httpx.URL(url)] + [httpx.URL(mirror) for mirror in mirrors]
+        budget = self._budget_for(urls[0].host)
+        budget.deposit()
+
+        attempt = 0
+        while True:
+            try:
+                if idempotent and hedge_after is not None:
+                    return self._send_hedged(method, urls, hedge_after, service_name, kwargs)
+                return self._send(method, urls[0], service_name, kwargs, raise_for_retry=idempotent)
+            except (CircuitOpenError, BulkheadFullError):
+                # Shedding load: retrying would add to it
+                raise
+            except (TimeoutError, ExternalServiceError):
+                attempt += 1
+                delay = self.retry_policy.backoff(attempt, self._rng)
+                deadline = get_current_deadline()
+                if (
+                    not idempotent
+                    or attempt >= self.retry_policy.max_attempts
+                    or (deadline is not None and deadline.remaining() <= delay)
+                    or not budget.withdraw()
+                ):
+                    raise
+            self._sleep(delay)
+
+    def _send(
+        self,
+        method: str,
+        url: httpx.URL,
+        service_name: Optional[str],
+        kwargs: Dict[str, Any],
+        raise_for_retry: bool = True
+    ) -> httpx.Response:
+        """Send one attempt, converting transport failures and (if ``raise_for_retry``) retryable statuses."""
+        if service_name:
+            with circuit_breakers.get(service_name).guard():
+                return self._send_once(method, url, kwargs, raise_for_retry)
+        return self._send_once(method, url, kwargs, raise_for_retry)
+
+    def _send_once(
+        self,
+        method: str,
+        url: httpx.URL,
+        kwargs: Dict[str, Any],
+        raise_for_retry: bool = True
+    ) -> httpx.Response:
+        client = self._client_for(url)
+        options = dict(kwargs)
+        options['timeout'] = remaining_timeout(options.get('timeout', self.timeout), f'{method} {url.host}')
+        try:
+            response = client.request(method, url, **options)
+        except httpx.TimeoutException as e:
+            raise TimeoutError(f"Request to {url.host} timed out") from e
+        except httpx.TransportError as e:
+            raise ExternalServiceError(
+                f"Request to {url.host} failed: {e}",
+                service_name=url.host,
+                details={'url': str(url), 'method': method}
+            ) from e
+
+        if raise_for_retry and response.status_code in self.retry_policy.retry_status_codes:
+            raise ExternalServiceError(
+                f"{url.host} responded with HTTP {response.status_code}",
+                service_name=url.host,
+                service_response={'status_code': response.status_code},
+                details={'url': str(url), 'method': method}
+            )
+        return response
+
+    def _send_hedged(
+        self,
+        method: str,
+        urls: List[httpx.URL],
+        hedge_after: float,
+        service_name: Optional[str],
+        kwargs: Dict[str, Any]
+    ) -> httpx.Response:
+        """Send to the primary URL and, if it is slow, a hedged copy; first success wins."""
+        executor = self._get_executor()
+
+        def submit(url):
+            # Run in a copy of the caller's context so the request deadline follows
+            context = contextvars.copy_context()
+            return executor.submit(context.run, self._send, method, url, service_name, kwargs)
+
+        futures = [submit(urls[0])]
+        done, _ = wait(futures, timeout=hedge_after)
+        if not done:
+            futures.append(submit(urls[1] if len(urls) > 1 else urls[0]))
+
+        error = None
+        for future in as_completed(futures):
+            try:
+                return future.result()
+            except (TimeoutError, ExternalServiceError) as e:
+                error = e
+        raise error
+
+    def get(self, url: str, **kwargs) -> httpx.Response:
+        return self.request('GET', url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> httpx.Response:
+        return self.request('HEAD', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> httpx.Response:
+        return self.request('POST', url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> httpx.Response:
+        return self.request('PUT', url, **kwargs)
+
+    def patch(self, url: str, **kwargs) -> httpx.Response:
+        return self.request('PATCH', url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> httpx.Response:
+        return self.request('DELETE', url, **kwargs)
+
+    def close(self) -> None:
+        """Close every pooled connection and the hedging executor."""
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            executor, self._executor = self._executor, None
+        for client in clients:
+            client.close()
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+# Global client instance shared by the worker
+outbound_client = OutboundHTTPClient()
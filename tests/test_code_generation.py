@@ -1,23 +1,55 @@
 """
 Tests for code generation functionality.
 """
+import base64
+import json
 import os
 import tempfile
 import shutil
+import subprocess
+import sys
+import time
+import types
 from unittest.mock import patch, mock_open, MagicMock
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Group
+from django.test import RequestFactory, TestCase, override_settings
 from django.core.management import call_command
+from django.db import connection
+from django.utils import timezone
 from django.core.management.base import CommandError
 from io import StringIO
 import pytest
+from rest_framework import serializers
+from rest_framework.test import APIRequestFactory
 
 from core.code_generation.generators import (
     ModelGenerator,
     ViewGenerator,
     SerializerGenerator,
-    CodeGenerationError
+    CodeGenerationError,
+    CodeGeneratorManager,
+    build_crud_configs,
+    generate_crud_set
 )
-from core.code_generation.templates import TemplateManager
+from core.code_generation.cache import RenderCache
+from core.code_generation.exceptions import TemplateNotFoundError
+from core.code_generation.formatting import CodeFormattingStage
+from core.code_generation.indexing import plan_indexes
+from core.code_generation.introspection import SchemaIntrospector, build_model_configs
+from core.code_generation.jobs import (
+    FINISHED_STATUSES,
+    DatabaseJobStore,
+    GenerationJobService,
+    LocalJobBackend,
+    job_summary
+)
+from core.code_generation.models import GenerationJob, GenerationJobFile
+from core.code_generation.specs import expand_spec
+from core.code_generation.templates import BUILTIN_TEMPLATES, TemplateManager, get_template_manager
+from core.code_generation.validation import validate_batch
+from core.code_generation.views import job_create, job_detail, job_events
+from core.code_generation.writers import BatchWriter, stream_write, write_if_changed
 
 
 class TestModelGenerator(TestCase):
@@ -89,11 +121,16 @@ class TestModelGenerator(TestCase):
             ]
         }
         
-        file_path = os.path.join(self.temp_dir, 'models.py')
+        file_path = os.path.join(self.temp_dir, 'app', 'models.py')
+        
+        self.assertTrue(self.generator.save_to_file(model_config, file_path))
+        with open(file_path, encoding='utf-8') as f:
+            self.assertIn('class TestModel(models.Model):', f.read())
+        mtime = os.stat(file_path).st_mtime_ns
         
-        with patch('builtins.open', mock_open()) as mock_file:
-            self.generator.save_to_file(model_config, file_path)
-            mock_file.assert_called_once_with(file_path, 'w', encoding='utf-8')
+        # Identical output is not rewritten
+        self.assertFalse(self.generator.save_to_file(model_config, file_path))
+        self.assertEqual(os.stat(file_path).st_mtime_ns, mtime)
 
 
 class TestViewGenerator(TestCase):
@@ -160,6 +197,132 @@ class TestViewGenerator(TestCase):
             self.generator.generate(invalid_config)
 
 
+class TestGeneratedAPIView(TestCase):
+    """Test cases for paginated, eager-loading and bulk APIViews."""
+    
+    def setUp(self):
+        # The test database is not migrated; create the auth tables the view touches
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE TABLE django_content_type (id INTEGER PRIMARY KEY, "
+                "app_label varchar(100) NOT NULL, model varchar(100) NOT NULL)"
+            )
+            cursor.execute("CREATE TABLE auth_group (id INTEGER PRIMARY KEY, name varchar(150) NOT NULL UNIQUE)")
+            cursor.execute(
+                "CREATE TABLE auth_permission (id INTEGER PRIMARY KEY, name varchar(255) NOT NULL, "
+                "content_type_id integer NOT NULL, codename varchar(100) NOT NULL)"
+            )
+            cursor.execute(
+                "CREATE TABLE auth_group_permissions (id INTEGER PRIMARY KEY, "
+                "group_id integer NOT NULL, permission_id integer NOT NULL)"
+            )
+        self.factory = APIRequestFactory()
+        self.config = build_crud_configs({
+            'name': 'Group',
+            'fields': [
+                {'name': 'name', 'type': 'CharField', 'max_length': 150},
+                {'name': 'permissions', 'type': 'ManyToManyField', 'to': 'auth.Permission'},
+            ]
+        }, 'generated_auth')['view']
+    
+    def load_view(self, **options):
+        """Render the APIView and execute it against django.contrib.auth's Group."""
+        code = ViewGenerator().generate(dict(self.config, **options))
+        
+        class GroupSerializer(serializers.ModelSerializer):
+            class Meta:
+                model = Group
+                fields = ['id', 'name', 'permissions']
+        
+        models_module = types.ModuleType('generated_auth.models')
+        models_module.Group = Group
+        serializers_module = types.ModuleType('generated_auth.serializers')
+        serializers_module.GroupSerializer = GroupSerializer
+        namespace = {}
+        with patch.dict(sys.modules, {
+            'generated_auth': types.ModuleType('generated_auth'),
+            'generated_auth.models': models_module,
+            'generated_auth.serializers': serializers_module,
+        }):
+            exec(compile(code, 'group_api_view.py', 'exec'), namespace)
+        return code, namespace['GroupAPIView'].as_view()
+    
+    def test_crud_view_options(self):
+        """Test CRUD views paginate and eager-load relations from the field specs."""
+        code, _ = self.load_view()
+        
+        self.assertIn("queryset = queryset.prefetch_related('permissions')", code)
+        self.assertIn('def paginate(self, request, queryset):', code)
+        self.assertIn('deleted, _ = Group.objects.filter(pk=pk).delete()', code)
+        self.assertNotIn('Group.objects.get(pk=pk)', code)
+        
+        with self.assertRaises(CodeGenerationError):
+            ViewGenerator().generate(dict(self.config, pagination='cursor'))
+    
+    def test_limit_offset_pagination(self):
+        """Test list pages are bounded and cost one query plus one prefetch."""
+        Group.objects.bulk_create([Group(name=f'group-{i:02d}') for i in range(30)])
+        _, view = self.load_view(page_size=10)
+        
+        with self.assertNumQueries(2):
+            response = view(self.factory.get('/', {'offset': 25}))
+            response.render()
+        self.assertEqual(len(response.data['results']), 5)
+        self.assertIsNone(response.data['next_offset'])
+        
+        response = view(self.factory.get('/', {'limit': 1000}))
+        self.assertEqual(len(response.data['results']), 30)
+        self.assertEqual(response.data['limit'], 100)
+    
+    def test_keyset_pagination(self):
+        """Test keyset pages follow the cursor and reject invalid cursors."""
+        Group.objects.bulk_create([Group(name=f'group-{i:02d}') for i in range(25)])
+        _, view = self.load_view(pagination='keyset', keyset_field='name', page_size=10, only=['id'])
+        
+        names = []
+        cursor = None
+        while True:
+            params = {'cursor': cursor} if cursor else {}
+            response = view(self.factory.get('/', params))
+            names.extend(item['name'] for item in response.data['results'])
+            cursor = response.data['next_cursor']
+            if cursor is None:
+                break
+        self.assertEqual(names, sorted(f'group-{i:02d}' for i in range(25)))
+        
+        _, view = self.load_view(pagination='keyset', page_size=10)
+        response = view(self.factory.get('/', {'cursor': 'not-a-pk'}))
+        self.assertEqual(response.status_code, 400)
+    
+    def test_bulk_endpoints(self):
+        """Test list payloads are created and updated in bulk."""
+        _, view = self.load_view(bulk=True)
+        
+        with patch.object(Group.objects, 'bulk_create', wraps=Group.objects.bulk_create) as bulk_create:
+            response = view(self.factory.post(
+                '/', [{'name': 'alpha', 'permissions': []}, {'name': 'beta', 'permissions': []}], format='json'
+            ))
+        self.assertEqual(response.status_code, 201)
+        bulk_create.assert_called_once()
+        
+        groups = list(Group.objects.order_by('name'))
+        response = view(self.factory.patch(
+            '/', [{'id': group.pk, 'name': group.name.upper()} for group in groups], format='json'
+        ))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(Group.objects.order_by('name').values_list('name', flat=True)), ['ALPHA', 'BETA'])
+        
+        response = view(self.factory.patch('/', [{'id': 0, 'name': 'missing'}], format='json'))
+        self.assertEqual(response.status_code, 404)
+        
+        response = view(self.factory.patch('/', [{'id': str(groups[0].pk), 'name': 'gamma'}], format='json'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Group.objects.get(pk=groups[0].pk).name, 'gamma')
+        
+        response = view(self.factory.patch('/', [{'id': 'not-an-id', 'name': 'invalid'}], format='json'))
+        self.assertEqual(response.status_code, 400)
+
+
 class TestSerializerGenerator(TestCase):
     """Test cases for DRF serializer code generation."""
     
@@ -219,6 +382,197 @@ class TestSerializerGenerator(TestCase):
         self.assertIn('product = ProductSerializer(read_only=True)', result)
 
 
+class TestReadSerializer(TestCase):
+    """Test cases for values()-based read serializers."""
+    
+    READ_FIELDS = ['id', 'username', 'email', 'is_active', 'date_joined', 'last_login']
+    
+    def setUp(self):
+        # The test database is not migrated; create the table the serializers read
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE TABLE users_user (id INTEGER PRIMARY KEY, password varchar(128) NOT NULL, "
+                "last_login datetime, is_superuser bool NOT NULL, username varchar(150) NOT NULL UNIQUE, "
+                "first_name varchar(150) NOT NULL, last_name varchar(150) NOT NULL, "
+                "email varchar(254) NOT NULL, is_staff bool NOT NULL, is_active bool NOT NULL, "
+                "date_joined datetime NOT NULL)"
+            )
+        User = get_user_model()
+        User.objects.bulk_create([
+            User(username=f'user{i}', email=f'user{i}@example.com', is_active=i % 2 == 0,
+                 last_login=timezone.now() if i % 3 else None)
+            for i in range(20)
+        ])
+        self.config = {
+            'name': 'UserSerializer',
+            'model': 'User',
+            'app_name': 'generated_users',
+            'fields': self.READ_FIELDS,
+            'read_serializer': True,
+            'model_fields': [
+                {'name': 'username', 'type': 'CharField'},
+                {'name': 'email', 'type': 'EmailField'},
+                {'name': 'is_active', 'type': 'BooleanField'},
+                {'name': 'date_joined', 'type': 'DateTimeField'},
+                {'name': 'last_login', 'type': 'DateTimeField'},
+                {'name': 'groups', 'type': 'ManyToManyField', 'to': 'auth.Group'},
+            ]
+        }
+    
+    def load(self, code, filename, modules):
+        namespace = {}
+        with patch.dict(sys.modules, modules):
+            exec(compile(code, filename, 'exec'), namespace)
+        return namespace
+    
+    def load_serializers(self):
+        models_module = types.ModuleType('generated_users.models')
+        models_module.User = get_user_model()
+        return self.load(SerializerGenerator().generate(dict(self.config)), 'serializers.py', {
+            'generated_users': types.ModuleType('generated_users'),
+            'generated_users.models': models_module,
+        })
+    
+    def test_read_serializer_matches_model_serializer(self):
+        """Test the read serializer reproduces the ModelSerializer output in one query."""
+        namespace = self.load_serializers()
+        queryset = get_user_model().objects.order_by('pk')
+        expected = namespace['UserSerializer'](queryset, many=True).data
+        
+        read_serializer = namespace['UserReadSerializer']
+        self.assertEqual(read_serializer.fields, tuple(self.READ_FIELDS))
+        with self.assertNumQueries(1):
+            data = read_serializer(read_serializer.project(queryset)).data
+        self.assertEqual(data, [dict(row) for row in expected])
+    
+    def test_list_view_uses_read_serializer(self):
+        """Test an APIView with read_serializer pages values() rows."""
+        serializers_module = types.ModuleType('generated_users.serializers')
+        for name, value in self.load_serializers().items():
+            setattr(serializers_module, name, value)
+        models_module = types.ModuleType('generated_users.models')
+        models_module.User = get_user_model()
+        code = ViewGenerator().generate({
+            'name': 'UserAPIView', 'type': 'APIView', 'model': 'User', 'app_name': 'generated_users',
+            'methods': ['GET'], 'pagination': 'keyset', 'page_size': 8, 'read_serializer': True
+        })
+        view = self.load(code, 'views.py', {
+            'generated_users': types.ModuleType('generated_users'),
+            'generated_users.models': models_module,
+            'generated_users.serializers': serializers_module,
+        })['UserAPIView'].as_view()
+        
+        with self.assertNumQueries(1):
+            response = view(APIRequestFactory().get('/'))
+        self.assertEqual(len(response.data['results']), 8)
+        self.assertEqual(response.data['next_cursor'], response.data['results'][-1]['pk'])
+        self.assertIn('UserReadSerializer.project(self.get_queryset(), ', code)
+    
+    def test_keyset_pages_rows_sharing_a_timestamp(self):
+        """Test a non-unique keyset field pages by (value, pk) without skipping or repeating rows."""
+        User = get_user_model()
+        shared = timezone.now().replace(microsecond=123456)
+        ids = list(User.objects.order_by('pk').values_list('pk', flat=True))
+        User.objects.filter(pk__in=ids[:10]).update(date_joined=shared)
+        for offset, pk in enumerate(ids[10:], 1):
+            # Sub-millisecond apart: a millisecond cursor would collide
+            User.objects.filter(pk=pk).update(date_joined=shared + timezone.timedelta(microseconds=offset))
+        expected = list(User.objects.order_by('-date_joined', '-pk').values_list('pk', flat=True))
+        
+        serializers_module = types.ModuleType('generated_users.serializers')
+        for name, value in self.load_serializers().items():
+            setattr(serializers_module, name, value)
+        models_module = types.ModuleType('generated_users.models')
+        models_module.User = User
+        for read_serializer in (False, True):
+            code = ViewGenerator().generate({
+                'name': 'UserAPIView', 'type': 'APIView', 'model': 'User', 'app_name': 'generated_users',
+                'methods': ['GET'], 'pagination': 'keyset', 'keyset_field': '-date_joined', 'page_size': 3,
+                'read_serializer': read_serializer
+            })
+            view = self.load(code, 'views.py', {
+                'generated_users': types.ModuleType('generated_users'),
+                'generated_users.models': models_module,
+                'generated_users.serializers': serializers_module,
+            })['UserAPIView'].as_view()
+            
+            seen = []
+            cursor = None
+            while True:
+                response = view(APIRequestFactory().get('/', {'cursor': cursor} if cursor else {}))
+                seen.extend(item['id'] for item in response.data['results'])
+                cursor = response.data['next_cursor']
+                if cursor is None:
+                    break
+            self.assertEqual(seen, expected)
+        
+        response = view(APIRequestFactory().get('/', {'cursor': 'no-separator'}))
+        self.assertEqual(response.status_code, 400)
+        response = view(APIRequestFactory().get('/', {'cursor': base64.urlsafe_b64encode(b'not-a-date|1').decode()}))
+        self.assertEqual(response.status_code, 400)
+    
+    def test_crud_set_adds_benchmark(self):
+        """Test a read serializer CRUD set also generates the rows/sec benchmark."""
+        configs = build_crud_configs(
+            {'name': 'Product', 'fields': [{'name': 'price', 'type': 'DecimalField'}]},
+            'shop', {'read_serializer': True}
+        )
+        
+        serializer_code = SerializerGenerator().generate(configs['serializer'])
+        self.assertIn("fields = ('id', 'price')", serializer_code)
+        self.assertIn('serializers.DecimalField(max_digits=10, decimal_places=2).to_representation', serializer_code)
+        
+        benchmark = CodeGeneratorManager().generate_code('serializer_benchmark', configs['serializer_benchmark'])
+        compile(benchmark, 'bench_product_serializers.py', 'exec')
+        self.assertIn('from shop.serializers import ProductReadSerializer, ProductSerializer', benchmark)
+        
+        with self.assertRaises(CodeGenerationError):
+            SerializerGenerator().generate(dict(self.config, read_fields=['id', 'groups']))
+
+
+class TestPerformanceTestGeneration(TestCase):
+    """Test cases for generated performance guardrail tests."""
+    
+    MODEL_CONFIG = {
+        'name': 'Product',
+        'fields': [
+            {'name': 'title', 'type': 'CharField', 'max_length': 200},
+            {'name': 'category', 'type': 'ForeignKey', 'to': 'shop.Category'},
+            {'name': 'tags', 'type': 'ManyToManyField', 'to': 'shop.Tag'},
+        ]
+    }
+    
+    def test_query_counts_follow_view_config(self):
+        """Test expected query counts come from the APIView's eager loading."""
+        configs = build_crud_configs(self.MODEL_CONFIG, 'shop', {'performance_tests': 500})
+        code = CodeGeneratorManager().generate_code('performance_test', configs['performance_test'])
+        
+        compile(code, 'test_product_performance.py', 'exec')
+        self.assertIn('from shop.views import ProductAPIView', code)
+        self.assertIn('ROWS = 500', code)
+        self.assertIn('LIST_QUERIES = 2', code)
+        self.assertIn('DETAIL_QUERIES = 2', code)
+        self.assertIn('def test_list_query_count(seeded, view, django_assert_num_queries):', code)
+        self.assertIn("check_latency_baseline('ProductAPIView.list', median_latency(view, request))", code)
+        
+        # Without prefetching the detail endpoint loads tags itself and the
+        # list keeps its single-query budget, so an N+1 fails the test
+        configs = build_crud_configs(self.MODEL_CONFIG, 'shop', {'performance_tests': True, 'prefetch_related': []})
+        code = CodeGeneratorManager().generate_code('performance_test', configs['performance_test'])
+        self.assertIn('ROWS = 200', code)
+        self.assertIn('LIST_QUERIES = 1', code)
+        self.assertIn('DETAIL_QUERIES = 2', code)
+    
+    def test_crud_set_includes_performance_tests(self):
+        """Test generate_crud_set emits performance tests only when asked to."""
+        self.assertNotIn('performance_test', generate_crud_set(self.MODEL_CONFIG, 'shop'))
+        
+        code_set = generate_crud_set(self.MODEL_CONFIG, 'shop', {'performance_tests': True, 'read_serializer': True})
+        self.assertIn('LIST_QUERIES = 1', code_set['performance_test'])
+        self.assertIn('class ProductReadSerializer:', code_set['serializer'])
+        self.assertNotIn('performance_tests', code_set['view'])
+
+
 class TestTemplateManager(TestCase):
     """Test cases for template management system."""
     
@@ -247,6 +601,840 @@ class TestTemplateManager(TestCase):
                 self.template_manager.load_template('nonexistent.txt')
 
 
+class TestTemplateCache(TestCase):
+    """Test cases for compiled-template caching in TemplateManager."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_builtin_templates_compiled_once(self):
+        """Test built-in templates are compiled once and reused."""
+        manager = TemplateManager()
+        
+        self.assertIs(manager.get_builtin_template('model'), manager.get_builtin_template('model'))
+    
+    def test_source_templates_cached_by_hash(self):
+        """Test ad-hoc template strings are cached by source hash."""
+        manager = TemplateManager()
+        
+        first = manager.get_source_template('Hello {{ name }}!')
+        second = manager.get_source_template('Hello {{ name }}!')
+        
+        self.assertIs(first, second)
+        self.assertIsNot(first, manager.get_source_template('Bye {{ name }}!'))
+    
+    def test_generators_share_template_manager(self):
+        """Test generators use the process-wide manager."""
+        self.assertIs(ModelGenerator().template_manager, get_template_manager())
+        self.assertIs(ViewGenerator().template_manager, SerializerGenerator().template_manager)
+    
+    def test_bytecode_cache_written_to_disk(self):
+        """Test the on-disk bytecode cache is populated by precompilation."""
+        manager = TemplateManager(bytecode_cache_dir=self.temp_dir)
+        
+        self.assertEqual(manager.precompile(), len(BUILTIN_TEMPLATES))
+        self.assertEqual(len(os.listdir(self.temp_dir)), len(BUILTIN_TEMPLATES))
+        
+        # A fresh manager (new worker process) renders from the bytecode cache
+        fresh = TemplateManager(bytecode_cache_dir=self.temp_dir)
+        result = ModelGenerator(template_manager=fresh).generate({
+            'name': 'Tag',
+            'fields': [{'name': 'label', 'type': 'CharField'}]
+        })
+        self.assertIn('class Tag(models.Model):', result)
+
+
+class TestTemplateRegistry(TestCase):
+    """Test cases for the indexed template file registry."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.temp_dir, 'app'))
+        self._write('greeting.j2', 'Hello {{ name }}!')
+        self._write('app/model.j2', '{% include "greeting.j2" %} ({{ model }})')
+        self._write('README.txt', 'not a template')
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def _write(self, name, content, mtime_offset=0):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        if mtime_offset:
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + mtime_offset))
+    
+    def test_frozen_registry_serves_lookups_from_memory(self):
+        """Test a frozen registry scans once and never touches the disk again."""
+        manager = TemplateManager(template_dir=self.temp_dir, auto_reload=False)
+        
+        self.assertEqual(manager.list_templates(), ['app/model.j2', 'greeting.j2'])
+        with patch('core.code_generation.templates.os.walk') as mock_walk, \
+                patch('builtins.open') as mock_open_file:
+            self.assertEqual(manager.load_template('README.txt'), 'not a template')
+            self.assertEqual(manager.render_template_file('app/model.j2', {'name': 'Ann', 'model': 'Tag'}), 'Hello Ann! (Tag)')
+            self.assertEqual(manager.render_template_file('app/model.j2', {'name': 'Bo', 'model': 'Tag'}), 'Hello Bo! (Tag)')
+            self.assertEqual(len(manager.get_template_hash('greeting.j2')), 64)
+        mock_walk.assert_not_called()
+        mock_open_file.assert_not_called()
+        
+        self._write('greeting.j2', 'Hi {{ name }}!', mtime_offset=10 ** 9)
+        self.assertEqual(manager.render_template_file('greeting.j2', {'name': 'Ann'}), 'Hello Ann!')
+        with self.assertRaises(TemplateNotFoundError):
+            manager.load_template('missing.j2')
+        
+        manager.refresh()
+        self.assertEqual(manager.render_template_file('greeting.j2', {'name': 'Ann'}), 'Hi Ann!')
+    
+    def test_auto_reload_rereads_only_changed_files(self):
+        """Test mtime polling picks up edits, new and deleted files."""
+        manager = TemplateManager(template_dir=self.temp_dir, auto_reload=True, poll_interval=0)
+        old_hash = manager.get_template_hash('greeting.j2')
+        self.assertEqual(manager.render_template_file('app/model.j2', {'name': 'Ann', 'model': 'Tag'}), 'Hello Ann! (Tag)')
+        
+        self._write('greeting.j2', 'Hi {{ name }}!', mtime_offset=10 ** 9)
+        self._write('new.j2', 'New {{ name }}')
+        os.remove(os.path.join(self.temp_dir, 'README.txt'))
+        with patch('builtins.open', wraps=open) as mock_open_file:
+            manager.refresh()
+        
+        self.assertEqual(
+            sorted(call.args[0] for call in mock_open_file.call_args_list),
+            [os.path.join(self.temp_dir, 'greeting.j2'), os.path.join(self.temp_dir, 'new.j2')]
+        )
+        self.assertNotEqual(manager.get_template_hash('greeting.j2'), old_hash)
+        self.assertEqual(manager.render_template_file('app/model.j2', {'name': 'Ann', 'model': 'Tag'}), 'Hi Ann! (Tag)')
+        self.assertEqual(manager.list_templates(), ['app/model.j2', 'greeting.j2', 'new.j2'])
+        with self.assertRaises(TemplateNotFoundError):
+            manager.get_template_hash('README.txt')
+
+
+class TestRenderCache(TestCase):
+    """Test cases for render memoization."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = RenderCache(max_entries=2)
+        self.generator = ModelGenerator(render_cache=self.cache)
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def _config(self, name='Product'):
+        return {'name': name, 'fields': [{'name': 'title', 'type': 'CharField'}]}
+    
+    def test_equal_configs_hit_the_cache(self):
+        """Test configs that normalize to the same context share an entry."""
+        first = self.generator.generate(self._config())
+        # Explicit default and different key order normalize to the same context
+        second = self.generator.generate({
+            'fields': [{'max_length': 200, 'type': 'CharField', 'name': 'title'}],
+            'name': 'Product'
+        })
+        
+        self.assertEqual(first, second)
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['entries']), (1, 1, 1))
+    
+    def test_template_change_misses(self):
+        """Test a changed template source is never served from the cache."""
+        self.generator.generate(self._config())
+        
+        with patch.object(TemplateManager, 'get_template_hash', return_value='changed'):
+            self.generator.generate(self._config())
+        
+        self.assertEqual(self.cache.stats()['misses'], 2)
+    
+    def test_lru_eviction_and_invalidation(self):
+        """Test the LRU bound and explicit invalidation."""
+        for name in ('A', 'B', 'C'):
+            self.generator.generate(self._config(name))
+        
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+        self.cache.invalidate()
+        self.assertEqual(self.cache.stats()['entries'], 0)
+    
+    def test_disk_cache_is_shared(self):
+        """Test a second cache instance reads renders from the cache directory."""
+        code = ModelGenerator(render_cache=RenderCache(cache_dir=self.temp_dir)).generate(self._config())
+        
+        cache = RenderCache(cache_dir=self.temp_dir)
+        self.assertEqual(ModelGenerator(render_cache=cache).generate(self._config()), code)
+        self.assertEqual(cache.stats()['disk_hits'], 1)
+    
+    def test_disk_cache_is_bounded(self):
+        """Test the cache directory is pruned to its entry limit, oldest entries first."""
+        cache = RenderCache(max_entries=1, cache_dir=self.temp_dir, disk_max_entries=5)
+        keys = [f'{index:02d}' + 'a' * 62 for index in range(6)]
+        for index, key in enumerate(keys[:5]):
+            cache.set(key, f'x = {index}\n')
+            os.utime(cache._disk_path(key), ns=(index * 10**9, index * 10**9))
+        RenderCache(cache_dir=self.temp_dir).get(keys[0])
+        
+        cache.set(keys[5], 'x = 5\n')
+        
+        self.assertEqual(cache.stats()['disk_evictions'], 2)
+        reader = RenderCache(cache_dir=self.temp_dir)
+        self.assertEqual(reader.get(keys[0]), 'x = 0\n')
+        self.assertIsNone(reader.get(keys[1]))
+        self.assertIsNone(reader.get(keys[2]))
+        self.assertEqual(reader.get(keys[5]), 'x = 5\n')
+
+
+class TestBatchGeneration(TestCase):
+    """Test cases for CodeGeneratorManager.generate_batch."""
+    
+    def setUp(self):
+        self.manager = CodeGeneratorManager()
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def _model_spec(self, name, output=None):
+        return {
+            'type': 'model',
+            'config': {'name': name, 'fields': [{'name': 'title', 'type': 'CharField'}]},
+            'output': output
+        }
+    
+    def test_generates_all_specs_and_writes_outputs(self):
+        """Test every spec is rendered and written."""
+        specs = [
+            self._model_spec(f'Model{i}', os.path.join(self.temp_dir, f'model_{i}.py'))
+            for i in range(20)
+        ]
+        
+        results = sorted(self.manager.generate_batch(specs, max_workers=4), key=lambda r: r['index'])
+        
+        self.assertEqual(len(results), 20)
+        self.assertTrue(all(result['success'] for result in results))
+        with open(os.path.join(self.temp_dir, 'model_7.py'), encoding='utf-8') as f:
+            self.assertIn('class Model7(models.Model):', f.read())
+        self.assertEqual(
+            sorted(os.listdir(self.temp_dir)), sorted(f'model_{i}.py' for i in range(20))
+        )
+    
+    def test_reports_item_errors_without_aborting(self):
+        """Test a failing spec is reported and the others still succeed."""
+        specs = [
+            self._model_spec('Good'),
+            {'type': 'model', 'config': {'name': '', 'fields': []}},
+            {'type': 'unknown', 'config': {'name': 'X'}},
+        ]
+        
+        results = {result['index']: result for result in self.manager.generate_batch(specs)}
+        
+        self.assertTrue(results[0]['success'])
+        self.assertFalse(results[1]['success'])
+        self.assertIn('Model name is required', results[1]['error'])
+        self.assertIn('Unknown generator type', results[2]['error'])
+    
+    def test_process_pool_renders_crud_sets(self):
+        """Test batch generation in a process pool."""
+        specs = []
+        for i in range(3):
+            configs = build_crud_configs(
+                {'name': f'Item{i}', 'fields': [{'name': 'name', 'type': 'CharField'}]}, 'shop'
+            )
+            specs.extend({'type': kind, 'config': config} for kind, config in configs.items())
+        
+        results = list(self.manager.generate_batch(specs, max_workers=2, use_processes=True))
+        
+        self.assertEqual(len(results), 9)
+        self.assertTrue(all(result['success'] for result in results))
+        codes = [result['code'] for result in results]
+        self.assertTrue(any('class Item2Serializer' in code for code in codes))
+
+
+class TestWriters(TestCase):
+    """Test cases for skip-unchanged atomic writers."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_write_if_changed_compares_content(self):
+        """Test only changed content is written."""
+        file_path = os.path.join(self.temp_dir, 'module.py')
+        
+        self.assertTrue(write_if_changed(file_path, 'x = 1\n'))
+        self.assertFalse(write_if_changed(file_path, 'x = 1\n'))
+        self.assertTrue(write_if_changed(file_path, 'x = 2\n'))
+        with open(file_path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'x = 2\n')
+        self.assertEqual(os.listdir(self.temp_dir), ['module.py'])
+    
+    def test_written_files_are_not_private(self):
+        """Test files created through a temporary file keep the default mode."""
+        file_path = os.path.join(self.temp_dir, 'module.py')
+        write_if_changed(file_path, 'x = 1\n')
+        
+        self.assertTrue(os.stat(file_path).st_mode & 0o044)
+    
+    def test_new_files_follow_umask_without_changing_it(self):
+        """Test new files get the umask-based mode and existing files keep theirs."""
+        file_path = os.path.join(self.temp_dir, 'module.py')
+        existing = os.path.join(self.temp_dir, 'script.py')
+        write_if_changed(existing, 'x = 1\n')
+        os.chmod(existing, 0o755)
+        previous = os.umask(0o027)
+        try:
+            with patch('os.umask') as umask:
+                write_if_changed(file_path, 'x = 1\n')
+                write_if_changed(existing, 'x = 2\n')
+        finally:
+            os.umask(previous)
+        
+        umask.assert_not_called()
+        self.assertEqual(os.stat(file_path).st_mode & 0o777, 0o640)
+        self.assertEqual(os.stat(existing).st_mode & 0o777, 0o755)
+    
+    def test_batch_writer_counts_and_commits(self):
+        """Test staged files appear only on commit and counts are reported."""
+        existing = os.path.join(self.temp_dir, 'existing.py')
+        write_if_changed(existing, 'same\n')
+        
+        with BatchWriter() as writer:
+            self.assertFalse(writer.write(existing, 'same\n'))
+            self.assertTrue(writer.write(os.path.join(self.temp_dir, 'pkg', 'new.py'), 'new\n'))
+            self.assertFalse(os.path.exists(os.path.join(self.temp_dir, 'pkg', 'new.py')))
+        
+        self.assertEqual(writer.stats, {'written': 1, 'skipped': 1})
+        self.assertEqual(os.listdir(os.path.join(self.temp_dir, 'pkg')), ['new.py'])
+    
+    def test_batch_writer_discards_on_error(self):
+        """Test a failing batch leaves targets and directory untouched."""
+        file_path = os.path.join(self.temp_dir, 'module.py')
+        
+        with self.assertRaises(RuntimeError):
+            with BatchWriter() as writer:
+                writer.write(file_path, 'x = 1\n')
+                raise RuntimeError('render failed')
+        
+        self.assertEqual(os.listdir(self.temp_dir), [])
+
+
+class TestStreamingGeneration(TestCase):
+    """Test cases for streaming rendering to files."""
+    
+    def setUp(self):
+        self.manager = CodeGeneratorManager()
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def _wide_model(self, field_count=2000):
+        return {
+            'name': 'Wide',
+            'fields': [{'name': f'field_{i}', 'type': 'IntegerField'} for i in range(field_count)]
+        }
+    
+    def test_stream_matches_rendered_code(self):
+        """Test streamed chunks join to the rendered module."""
+        chunks = list(self.manager.generate_stream('model', self._wide_model()))
+        
+        self.assertGreater(len(chunks), 1)
+        self.assertEqual(''.join(chunks), self.manager.generate_code('model', self._wide_model()))
+    
+    def test_save_code_streams_to_file(self):
+        """Test save_code(stream=True) writes the module and skips identical output."""
+        file_path = os.path.join(self.temp_dir, 'models.py')
+        
+        self.assertTrue(self.manager.save_code('model', self._wide_model(), file_path, stream=True))
+        with open(file_path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), self.manager.generate_code('model', self._wide_model()))
+        self.assertFalse(self.manager.save_code('model', self._wide_model(), file_path, stream=True))
+    
+    def test_failed_stream_leaves_target_untouched(self):
+        """Test a rendering error mid-stream keeps the previous file."""
+        file_path = os.path.join(self.temp_dir, 'models.py')
+        write_if_changed(file_path, 'previous\n')
+        
+        def chunks():
+            yield 'partial'
+            raise CodeGenerationError('render failed')
+        
+        with self.assertRaises(CodeGenerationError):
+            stream_write(file_path, chunks())
+        with open(file_path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'previous\n')
+        self.assertEqual(os.listdir(self.temp_dir), ['models.py'])
+    
+    def test_invalid_config_raises_before_streaming(self):
+        """Test configuration errors surface when the stream is created."""
+        with self.assertRaises(CodeGenerationError):
+            self.manager.generate_stream('model', {'name': '', 'fields': []})
+    
+    def test_command_streams_to_output(self):
+        """Test generate_code --stream writes the output file."""
+        file_path = os.path.join(self.temp_dir, 'models.py')
+        
+        out = StringIO()
+        call_command(
+            'generate_code', 'model', '--name=Item', '--fields=title:CharField',
+            '--stream', f'--output={file_path}', stdout=out
+        )
+        
+        self.assertIn('Model code saved to', out.getvalue())
+        with open(file_path, encoding='utf-8') as f:
+            self.assertIn('class Item(models.Model):', f.read())
+
+
+class TestIndexPlanning(TestCase):
+    """Test cases for index planning from declared query patterns."""
+    
+    def setUp(self):
+        self.config = {
+            'name': 'Product',
+            'fields': [
+                {'name': 'title', 'type': 'CharField', 'max_length': 200},
+                {'name': 'sku', 'type': 'CharField', 'max_length': 40},
+                {'name': 'price', 'type': 'DecimalField'},
+                {'name': 'is_active', 'type': 'BooleanField'},
+                {'name': 'stock', 'type': 'IntegerField'},
+                {'name': 'created_at', 'type': 'DateTimeField', 'auto_now_add': True},
+                {'name': 'category', 'type': 'ForeignKey', 'to': 'shop.Category'},
+                {'name': 'owner', 'type': 'ForeignKey', 'to': 'auth.User', 'db_index': False},
+            ],
+            'query_patterns': [
+                {'view': 'ProductListView', 'filter': ['category', 'is_active'], 'order_by': ['-created_at', 'id']},
+                {'view': 'CategoryView', 'filter': ['category_id']},
+                {'view': 'ActiveView', 'filter': ['category', 'is_active']},
+                {'view': 'SkuView', 'filter': ['sku']},
+                {'view': 'StockView', 'filter': ['stock__lte']},
+                {'view': 'PriceView', 'filter': ['price__gte'], 'include': ['title']},
+            ]
+        }
+    
+    def test_indexes_follow_query_patterns(self):
+        """Test equality filters lead, ordering follows and redundant indexes are dropped."""
+        plan = plan_indexes(self.config)
+        
+        self.assertEqual(plan['db_index'], ['sku', 'stock'])
+        self.assertEqual(
+            [(index['fields'], index.get('include')) for index in plan['indexes']],
+            [(['category', 'is_active', '-created_at'], None), (['price'], ['title'])]
+        )
+        for index in plan['indexes']:
+            self.assertLessEqual(len(index['name']), 30)
+        self.assertEqual(plan['warnings'], [])
+    
+    def test_generated_model_declares_indexes(self):
+        """Test planned indexes are rendered as db_index and Meta.indexes."""
+        code = ModelGenerator().generate(self.config)
+        
+        compile(code, 'product.py', 'exec')
+        self.assertIn('sku = models.CharField(max_length=40, db_index=True)', code)
+        self.assertIn('stock = models.IntegerField(db_index=True)', code)
+        self.assertIn("owner = models.ForeignKey(to='auth.User', on_delete=models.CASCADE, db_index=False)", code)
+        self.assertIn("models.Index(fields=['category', 'is_active', '-created_at'], name='product_categor_", code)
+        self.assertIn("include=['title']", code)
+        self.assertNotIn('title = models.CharField(max_length=200, db_index=True)', code)
+    
+    def test_unindexable_patterns_warn(self):
+        """Test unindexed ForeignKey filters and unservable lookups produce warnings."""
+        self.config['query_patterns'] = [
+            {'view': 'OwnerView', 'filter': ['owner', 'title__icontains']},
+            {'view': 'CategoryNameView', 'filter': ['category__name']},
+            {'view': 'RangeView', 'filter': ['price__lt'], 'order_by': ['title']},
+        ]
+        warnings = plan_indexes(self.config)['warnings']
+        
+        self.assertIn("OwnerView: ForeignKey 'owner' is filtered on but has db_index=False", warnings)
+        self.assertIn("OwnerView: 'title__icontains' cannot use a B-tree index", warnings)
+        self.assertTrue(any(warning.startswith("CategoryNameView: 'category__name' filters across")
+                            for warning in warnings))
+        self.assertTrue(any(warning.startswith('RangeView: ordering by title') for warning in warnings))
+        
+        with self.assertRaises(CodeGenerationError):
+            ModelGenerator().generate(dict(self.config, query_patterns=[{'view': 'Empty'}]))
+
+
+class TestSchemaIntrospection(TestCase):
+    """Test cases for model generation from a live database schema."""
+    
+    TABLE_COUNT = 200
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "CREATE TABLE syn_customer (id INTEGER PRIMARY KEY, email varchar(254) NOT NULL UNIQUE, "
+                "name varchar(100), balance decimal(12, 2) NOT NULL, created datetime NOT NULL)"
+            )
+            for i in range(self.TABLE_COUNT):
+                cursor.execute(
+                    f"CREATE TABLE syn_order_{i} (id INTEGER PRIMARY KEY, "
+                    f"customer_id integer NOT NULL REFERENCES syn_customer (id), "
+                    f"ReferredBy integer REFERENCES syn_customer (id), "
+                    f"status varchar(20) NOT NULL, total decimal(10, 2), note text, is_paid bool NOT NULL, "
+                    f"placed_on date NOT NULL)"
+                )
+                cursor.execute(f"CREATE INDEX syn_o{i}_status ON syn_order_{i} (status)")
+                cursor.execute(f"CREATE INDEX syn_o{i}_cs ON syn_order_{i} (customer_id, status)")
+                cursor.execute(f"CREATE UNIQUE INDEX syn_o{i}_cp ON syn_order_{i} (customer_id, placed_on)")
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_schema_is_read_in_bulk(self):
+        """Test the whole catalog is read in three queries regardless of table count."""
+        with self.assertNumQueries(3):
+            schema = SchemaIntrospector().get_schema(include=['syn_*'])
+        
+        self.assertEqual(len(schema), self.TABLE_COUNT + 1)
+        order = schema['syn_order_7']
+        self.assertEqual(order['primary_key'], ['id'])
+        self.assertEqual(order['foreign_keys']['customer_id'], ('syn_customer', 'id'))
+        self.assertIn({'name': 'syn_o7_cs', 'columns': ['customer_id', 'status'], 'unique': False}, order['indexes'])
+        self.assertEqual(schema['syn_customer']['unique'], [('email',)])
+    
+    def test_columns_map_to_model_fields(self):
+        """Test columns, constraints and indexes map to field configs."""
+        schema = SchemaIntrospector().get_schema(include=['syn_customer', 'syn_order_0'])
+        configs = {config['db_table']: config for config in build_model_configs(schema, 'shop')}
+        
+        customer = {field['name']: field for field in configs['syn_customer']['fields']}
+        self.assertNotIn('id', customer)
+        self.assertEqual(customer['email']['arguments'], 'max_length=254, unique=True')
+        self.assertEqual(customer['name']['arguments'], 'max_length=100, blank=True, null=True')
+        self.assertEqual(customer['balance']['arguments'], 'max_digits=12, decimal_places=2')
+        
+        order = configs['syn_order_0']
+        self.assertEqual(order['name'], 'SynOrder0')
+        self.assertFalse(order['managed'])
+        fields = {field['name']: field for field in order['fields']}
+        self.assertEqual(fields['customer']['type'], 'ForeignKey')
+        self.assertIn("'SynCustomer', on_delete=models.DO_NOTHING", fields['customer']['arguments'])
+        self.assertIn("db_column='ReferredBy'", fields['referredby']['arguments'])
+        self.assertIn('db_index=True', fields['status']['arguments'])
+        self.assertEqual(order['indexes'], [{'fields': ['customer', 'status'], 'name': 'syn_o0_cs'}])
+        self.assertEqual(order['unique_together'], [('customer', 'placed_on')])
+        
+        code = ModelGenerator().generate(order)
+        compile(code, 'syn_order_0.py', 'exec')
+        self.assertIn('status = models.CharField(max_length=20, db_index=True)', code)
+        self.assertIn('managed = False', code)
+    
+    def test_foreign_key_to_non_primary_column_sets_to_field(self):
+        """Test a reference to a unique column other than the primary key maps to to_field."""
+        with connection.cursor() as cursor:
+            cursor.execute("CREATE TABLE zz_country (id INTEGER PRIMARY KEY, code varchar(2) NOT NULL UNIQUE)")
+            cursor.execute(
+                "CREATE TABLE zz_city (id INTEGER PRIMARY KEY, "
+                "country_code varchar(2) NOT NULL REFERENCES zz_country (code), "
+                "capital_of integer REFERENCES zz_country (id))"
+            )
+        schema = SchemaIntrospector().get_schema(include=['zz_*'])
+        configs = {config['db_table']: config for config in build_model_configs(schema)}
+        
+        fields = {field['name']: field for field in configs['zz_city']['fields']}
+        self.assertEqual(
+            fields['country_code']['arguments'],
+            "'ZzCountry', on_delete=models.DO_NOTHING, to_field='code', "
+            "related_name='zz_city_country_code_set', db_column='country_code'"
+        )
+        self.assertNotIn('to_field', fields['capital_of']['arguments'])
+    
+    def test_foreign_key_to_excluded_table_is_a_plain_column(self):
+        """Test references to tables that are not generated map to plain columns."""
+        schema = SchemaIntrospector().get_schema(include=['syn_order_0'])
+        order = build_model_configs(schema)[0]
+        
+        fields = {field['name']: field for field in order['fields']}
+        self.assertEqual(fields['customer_id']['type'], 'IntegerField')
+        self.assertNotIn('customer', fields)
+        self.assertEqual(order['unique_together'], [('customer_id', 'placed_on')])
+        self.assertEqual(order['indexes'], [{'fields': ['customer_id', 'status'], 'name': 'syn_o0_cs'}])
+        compile(ModelGenerator().generate(order), 'syn_order_0.py', 'exec')
+    
+    def test_command_generates_models_package(self):
+        """Test generate_models_from_db writes one module per table and an __init__."""
+        out = StringIO()
+        call_command(
+            'generate_models_from_db', '--include=syn_*', f'--output={self.temp_dir}', '--jobs=4', stdout=out
+        )
+        
+        self.assertIn(f'{self.TABLE_COUNT + 1} models generated', out.getvalue())
+        self.assertEqual(len(os.listdir(self.temp_dir)), self.TABLE_COUNT + 2)
+        with open(os.path.join(self.temp_dir, '__init__.py'), encoding='utf-8') as f:
+            self.assertIn('from .syn_order12 import SynOrder12', f.read())
+
+
+class TestFormattingStage(TestCase):
+    """Test cases for the in-process formatting stage."""
+    
+    def setUp(self):
+        self.stage = CodeFormattingStage()
+    
+    def test_format_sorts_imports_and_applies_black(self):
+        """Test isort and black run in process."""
+        code = "import sys\nimport os\nx = {'a':1}\n"
+        
+        self.assertEqual(self.stage.format(code), 'import os\nimport sys\n\nx = {"a": 1}\n')
+    
+    def test_invalid_code_raises(self):
+        """Test unparsable code raises CodeGenerationError."""
+        with self.assertRaises(CodeGenerationError):
+            self.stage.format('def broken(:\n')
+    
+    @pytest.mark.skipif(not shutil.which('ruff'), reason='ruff is not installed')
+    def test_format_many_runs_ruff_once(self):
+        """Test one ruff run fixes and lints every module of a batch."""
+        codes = ['import os\nimport sys\n\nprint(sys)\n', 'print(undefined_name)\n']
+        
+        with patch('core.code_quality.tools.subprocess.run', wraps=subprocess.run) as mock_run:
+            results = self.stage.format_many(codes)
+        
+        self.assertEqual(mock_run.call_count, 1)
+        self.assertEqual(results[0], ('import sys\n\nprint(sys)\n', []))
+        self.assertEqual([issue['code'] for issue in results[1][1]], ['F821'])
+    
+    @pytest.mark.skipif(not shutil.which('ruff'), reason='ruff is not installed')
+    def test_format_many_applies_project_ruff_config(self):
+        """Test the ruff configuration of the project root applies to the temporary batch."""
+        project_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, project_root)
+        with open(os.path.join(project_root, 'ruff.toml'), 'w', encoding='utf-8') as f:
+            f.write('[lint]\nignore = ["F821"]\n')
+        output_dir = os.path.join(project_root, 'generated')
+        os.makedirs(output_dir)
+        
+        results = CodeFormattingStage(project_root=output_dir).format_many(['print(undefined_name)\n'])
+        
+        self.assertEqual(results, [('print(undefined_name)\n', [])])
+    
+    def test_batch_generation_formats_output(self):
+        """Test generate_batch(format_code=True) returns black-formatted modules."""
+        configs = build_crud_configs({'name': 'Item', 'fields': [{'name': 'name', 'type': 'CharField'}]}, 'shop')
+        specs = [{'type': kind, 'config': config} for kind, config in configs.items()]
+        
+        results = list(CodeGeneratorManager().generate_batch(specs, max_workers=2, format_code=True))
+        
+        self.assertTrue(all(result['success'] for result in results))
+        for result in results:
+            self.assertEqual(self.stage.format(result['code']), result['code'])
+
+
+class TestBatchValidation(TestCase):
+    """Test cases for in-process validation of generated modules."""
+    
+    def crud_items(self):
+        spec = {
+            'app_name': 'shop',
+            'crud': {'performance_tests': True},
+            'models': [
+                {'name': 'Category', 'fields': [{'name': 'title', 'type': 'CharField', 'max_length': 100}]},
+                {'name': 'Product', 'fields': [
+                    {'name': 'title', 'type': 'CharField', 'max_length': 200},
+                    {'name': 'category', 'type': 'ForeignKey', 'to': 'shop.Category'},
+                ]},
+            ]
+        }
+        manager = CodeGeneratorManager()
+        return [
+            {'code': manager.generate_code(item['type'], item['config']), 'output': item['output'], 'app_name': 'shop'}
+            for item in expand_spec(spec)
+        ]
+    
+    def test_generated_crud_app_is_valid(self):
+        """Test a generated app resolves its imports and model references within the batch."""
+        results = validate_batch(self.crud_items())
+        
+        self.assertEqual([result['errors'] for result in results if not result['success']], [])
+        self.assertIn('shop.views.product_api_view', [result['module'] for result in results])
+    
+    def test_errors_are_reported_per_module(self):
+        """Test syntax errors, unbound names and unresolved batch references."""
+        items = [
+            {'module': 'shop.models.product', 'code': (
+                "from django.db import models\n\n"
+                "class Product(models.Model):\n"
+                "    tags = models.ManyToManyField('Tag')\n"
+            )},
+            {'module': 'shop.views', 'code': 'from shop.models import Product, Missing\nprint(Product, helper)\n'},
+            {'module': 'shop.broken', 'code': 'def broken(:\n'},
+            {'module': 'shop.other', 'code': 'import not_a_real_package_xyz\n'},
+        ]
+        
+        results = validate_batch(items)
+        
+        self.assertEqual(results[0]['errors'], [{'line': 4, 'message': "Model 'shop.Tag' is not generated in this batch"}])
+        self.assertEqual([error['message'] for error in results[1]['errors']], [
+            "Cannot import name 'Missing' from 'shop.models' (not generated in this batch)",
+            "Undefined name 'helper'",
+        ])
+        self.assertEqual(results[2]['errors'][0]['line'], 1)
+        self.assertTrue(results[2]['errors'][0]['message'].startswith('SyntaxError'))
+        self.assertEqual(results[3]['errors'], [{'line': 1, 'message': "No module named 'not_a_real_package_xyz'"}])
+    
+    def test_process_pool_matches_serial(self):
+        """Test large batches validated in a process pool give the same results."""
+        items = self.crud_items()
+        items.append({'module': 'shop.extra', 'code': 'from shop.serializers import Nope\n'})
+        
+        self.assertEqual(
+            validate_batch(items, max_workers=2, use_processes=True),
+            validate_batch(items, use_processes=False)
+        )
+
+
+class TestGenerationJobs(TestCase):
+    """Test cases for the code generation job service and its endpoints."""
+    
+    SPEC = {
+        'app_name': 'shop',
+        'crud': True,
+        'models': [{'name': 'Product', 'fields': [{'name': 'title', 'type': 'CharField'}]}]
+    }
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.factory = RequestFactory()
+        self.staff = get_user_model()(username='admin', is_staff=True, is_active=True)
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def _wait(self, service, job_id):
+        for _ in range(200):
+            job = service.get(job_id)
+            if job['status'] in FINISHED_STATUSES:
+                return job_summary(job)
+            time.sleep(0.05)
+        self.fail('Generation job did not finish')
+    
+    def test_worker_pool_writes_outputs_with_per_file_status(self):
+        """Test a job runs on the local worker pool and records each file."""
+        service = GenerationJobService(backend=LocalJobBackend(max_workers=2), output_root=self.temp_dir)
+        
+        queued = service.enqueue_spec(self.SPEC)
+        self.assertEqual(queued['total'], 3)
+        job = self._wait(service, queued['id'])
+        
+        self.assertEqual(job['status'], 'succeeded')
+        self.assertEqual(job['progress'], 100)
+        self.assertEqual({file['status'] for file in job['files']}, {'written'})
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, 'shop', 'models', 'product.py')))
+        
+        job = self._wait(service, service.enqueue_spec(self.SPEC)['id'])
+        self.assertEqual({file['status'] for file in job['files']}, {'unchanged'})
+    
+    def test_failed_file_fails_job_but_not_batch(self):
+        """Test a failing spec is reported per file while the others complete."""
+        service = GenerationJobService(backend=LocalJobBackend(max_workers=0))
+        
+        job = service.enqueue([
+            {'type': 'view', 'config': {'name': 'BrokenView'}},
+            {'type': 'model', 'config': {'name': 'Tag', 'fields': [{'name': 'label', 'type': 'CharField'}]}},
+        ])
+        
+        self.assertEqual(job['status'], 'failed')
+        self.assertEqual([file['status'] for file in job['files']], ['failed', 'generated'])
+        self.assertTrue(job['files'][0]['error'])
+        self.assertIn('class Tag(models.Model):', service.get(job['id'])['files'][1]['code'])
+    
+    def test_outputs_must_stay_inside_output_root(self):
+        """Test jobs cannot write outside the configured output root."""
+        service = GenerationJobService(backend=MagicMock(), output_root=self.temp_dir)
+        
+        with self.assertRaises(CodeGenerationError):
+            service.enqueue([{'type': 'model', 'config': {'name': 'Tag'}, 'output': '../tag.py'}])
+        with self.assertRaises(CodeGenerationError):
+            service.enqueue([{'type': 'model', 'config': {'name': 'Tag'}}], output_dir='../elsewhere')
+        with self.assertRaises(CodeGenerationError):
+            GenerationJobService(backend=MagicMock()).enqueue(
+                [{'type': 'model', 'config': {'name': 'Tag'}}], output_dir='shop'
+            )
+    
+    def test_database_store_persists_jobs(self):
+        """Test the database store records jobs and per-file results."""
+        editor = connection.schema_editor()
+        with connection.cursor() as cursor:
+            for model in (GenerationJob, GenerationJobFile):
+                sql, params = editor.table_sql(model)
+                cursor.execute(sql, params)
+        service = GenerationJobService(store=DatabaseJobStore(), backend=LocalJobBackend(max_workers=0))
+        
+        job = service.enqueue_spec(self.SPEC)
+        
+        self.assertEqual(job['status'], 'succeeded')
+        record = GenerationJob.objects.get(pk=job['id'])
+        self.assertIsNotNone(record.finished_at)
+        self.assertEqual(
+            list(record.files.values_list('output', 'status')),
+            [
+                ('models/product.py', 'generated'),
+                ('views/product_api_view.py', 'generated'),
+                ('serializers/product_serializer.py', 'generated'),
+            ]
+        )
+        self.assertIsNone(service.get('not-a-uuid'))
+    
+    def test_endpoints_enqueue_poll_and_stream(self):
+        """Test the create, HTMX polling and SSE endpoints."""
+        service = GenerationJobService(backend=MagicMock())
+        request = self.factory.post('/code-generation/jobs/', data=json.dumps({'spec': self.SPEC}), content_type='application/json')
+        request.user = self.staff
+        
+        with patch('core.code_generation.views.get_job_service', return_value=service):
+            response = job_create(request)
+            self.assertEqual(response.status_code, 202)
+            job_id = json.loads(response.content)['id']
+            self.assertEqual(response['Location'], f'/code-generation/jobs/{job_id}/')
+            
+            request = self.factory.get(response['Location'], HTTP_HX_REQUEST='true')
+            request.user = self.staff
+            fragment = job_detail(request, job_id).content.decode()
+            self.assertIn('hx-trigger="every 1s"', fragment)
+            self.assertIn('0 of 3 files', fragment)
+            
+            service.run(job_id)
+            fragment = job_detail(request, job_id).content.decode()
+            self.assertNotIn('hx-trigger', fragment)
+            self.assertIn('<li class="job-file job-file-generated">models/product.py', fragment)
+            
+            request = self.factory.get(f'/code-generation/jobs/{job_id}/events/')
+            request.user = self.staff
+            response = job_events(request, job_id)
+            events = b''.join(response.streaming_content).decode()
+            self.assertEqual(response['Content-Type'], 'text/event-stream')
+            self.assertTrue(events.startswith('retry: 1000\n\nid: '))
+            self.assertIn('\nevent: done\ndata: ', events)
+            self.assertEqual(json.loads(events.split('data: ', 1)[1])['completed'], 3)
+        
+        request = self.factory.get(f'/code-generation/jobs/{job_id}/')
+        request.user = get_user_model()(username='user', is_active=True)
+        self.assertEqual(job_detail(request, job_id).status_code, 302)
+    
+    @override_settings(CODE_GENERATION_JOB_STREAM_TIMEOUT=0)
+    def test_event_stream_is_short_and_resumable(self):
+        """Test the SSE stream ends quickly and a reconnect skips progress already sent."""
+        service = GenerationJobService(backend=MagicMock())
+        job_id = service.enqueue_spec(self.SPEC)['id']
+        
+        with patch('core.code_generation.views.get_job_service', return_value=service):
+            request = self.factory.get(f'/code-generation/jobs/{job_id}/events/')
+            request.user = self.staff
+            events = b''.join(job_events(request, job_id).streaming_content).decode()
+            self.assertTrue(events.startswith('retry: 1000\n\n'))
+            self.assertIn('\nevent: progress\n', events)
+            event_id = events.split('id: ', 1)[1].split('\n', 1)[0]
+            
+            request = self.factory.get(f'/code-generation/jobs/{job_id}/events/', HTTP_LAST_EVENT_ID=event_id)
+            request.user = self.staff
+            events = b''.join(job_events(request, job_id).streaming_content).decode()
+            self.assertEqual(events, 'retry: 1000\n\n')
+
+
 class TestCodeGenerationManagementCommand(TestCase):
     """Test cases for Django management command."""
     
@@ -292,6 +1480,120 @@ class TestCodeGenerationManagementCommand(TestCase):
             call_command('generate_code', 'invalid_type')
 
 
+class TestSpecGeneration(TestCase):
+    """Test cases for incremental generation from a spec file."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.spec_path = os.path.join(self.temp_dir, 'shop.json')
+        self.spec = {
+            'app_name': 'shop',
+            'crud': True,
+            'models': [
+                {'name': 'Product', 'fields': [{'name': 'title', 'type': 'CharField'}]},
+            ]
+        }
+        self._write_spec()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def _write_spec(self):
+        with open(self.spec_path, 'w', encoding='utf-8') as f:
+            json.dump(self.spec, f)
+
+    def _run(self, *args):
+        out = StringIO()
+        call_command('generate_code', f'--spec={self.spec_path}', *args, stdout=out)
+        return out.getvalue()
+
+    def _output(self, rel_path):
+        return os.path.join(self.temp_dir, 'shop', rel_path)
+
+    def test_generates_app_and_skips_unchanged_specs(self):
+        """Test the first run writes every file and the second run renders nothing."""
+        self.assertIn('3 written, 0 unchanged, 0 skipped, 0 failed', self._run())
+        with open(self._output('models/product.py'), encoding='utf-8') as f:
+            self.assertIn('class Product(models.Model):', f.read())
+        self.assertTrue(os.path.exists(self._output('views/product_api_view.py')))
+        self.assertTrue(os.path.exists(self._output('serializers/product_serializer.py')))
+
+        with patch('core.code_generation.generators.ModelGenerator.generate') as mock_generate:
+            self.assertIn('0 written, 0 unchanged, 3 skipped, 0 failed', self._run())
+            mock_generate.assert_not_called()
+
+    def test_regenerates_only_changed_specs(self):
+        """Test a changed entry is regenerated while the others are skipped."""
+        self._run()
+        self.spec['models'][0]['fields'].append({'name': 'price', 'type': 'DecimalField'})
+        self._write_spec()
+
+        self.assertIn('1 written, 0 unchanged, 2 skipped, 0 failed', self._run())
+        with open(self._output('models/product.py'), encoding='utf-8') as f:
+            self.assertIn('price = models.DecimalField', f.read())
+
+    def test_template_change_does_not_rewrite_identical_output(self):
+        """Test a template change re-renders but leaves identical files untouched."""
+        self._run()
+        model_path = self._output('models/product.py')
+        mtime = os.stat(model_path).st_mtime_ns
+
+        with patch.object(TemplateManager, 'get_template_hash', return_value='changed'):
+            self.assertIn('0 written, 3 unchanged, 0 skipped, 0 failed', self._run())
+        self.assertEqual(os.stat(model_path).st_mtime_ns, mtime)
+
+    def test_validate_checks_rendered_output_against_skipped_files(self):
+        """Test --validate resolves imports against unchanged outputs and blocks invalid modules."""
+        self._run()
+        self.spec['views'] = [{'name': 'TagListView', 'type': 'ListView', 'model': 'Tag'}]
+        self._write_spec()
+        err = StringIO()
+
+        with self.assertRaises(CommandError):
+            call_command('generate_code', f'--spec={self.spec_path}', '--validate', stdout=StringIO(), stderr=err)
+
+        self.assertIn(
+            "views/tag_list_view.py:3: Cannot import name 'Tag' from 'shop.models' (not generated in this batch)",
+            err.getvalue()
+        )
+        self.assertFalse(os.path.exists(self._output('views/tag_list_view.py')))
+
+    def test_manifest_outside_output_dir(self):
+        """Test outputs are checked in the output directory when --manifest lives elsewhere."""
+        manifest_path = os.path.join(self.temp_dir, 'state', 'manifest.json')
+        os.makedirs(os.path.dirname(manifest_path))
+
+        self.assertIn('3 written', self._run(f'--manifest={manifest_path}'))
+        self.assertIn('0 written, 0 unchanged, 3 skipped, 0 failed', self._run(f'--manifest={manifest_path}'))
+        with open(self._output('models/product.py'), 'w', encoding='utf-8') as f:
+            f.write('# edited\n')
+        self.assertIn('1 written, 0 unchanged, 2 skipped, 0 failed', self._run(f'--manifest={manifest_path}'))
+
+    def test_edited_output_is_regenerated(self):
+        """Test a hand-edited output file is restored."""
+        self._run()
+        with open(self._output('models/product.py'), 'w', encoding='utf-8') as f:
+            f.write('# edited\n')
+
+        self.assertIn('1 written, 0 unchanged, 2 skipped, 0 failed', self._run())
+
+    def test_formatted_spec_output_is_stable(self):
+        """Test --format output is formatted and skipped on the next run."""
+        self.assertIn('3 written', self._run('--format'))
+        with open(self._output('models/product.py'), encoding='utf-8') as f:
+            code = f.read()
+        self.assertEqual(CodeFormattingStage().format(code), code)
+        
+        self.assertIn('0 written, 0 unchanged, 3 skipped, 0 failed', self._run('--format'))
+        # Dropping --format is an input change
+        self.assertIn('3 written, 0 unchanged, 0 skipped, 0 failed', self._run())
+
+    def test_generator_type_required_without_spec(self):
+        """Test the generator type is still required when no spec is given."""
+        with self.assertRaises(CommandError):
+            call_command('generate_code', '--name=Product')
+
+
 @pytest.mark.integration
 class TestCodeGenerationIntegration(TestCase):
     """Integration tests for code generation system."""
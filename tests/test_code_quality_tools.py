@@ -0,0 +1,515 @@
+"""
+Tests for the code quality tool wrappers in core.code_quality.tools.
+"""
+import os
+import shutil
+import subprocess
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+import pytest
+from django.conf import settings
+from django.core.management import call_command
+from django.test import TestCase
+
+from core.code_quality.cache import QualityCache, get_quality_cache
+from core.code_quality.tools import (
+    CodeFormatter,
+    CodeLinter,
+    CodeQualityError,
+    CodeQualityManager,
+    ImportSorter,
+    iter_source_files
+)
+from core.resilience.deadline import deadline_scope
+from core.resilience.exceptions import DeadlineExceededError
+
+
+UNFORMATTED = "import sys\nimport os\nx = {'a':1}\n"
+
+
+class TestInProcessFormatting(TestCase):
+    """Test cases for the in-process black and isort engine."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_formats_and_sorts_without_subprocesses(self):
+        """Test black and isort run as libraries."""
+        with patch('core.code_quality.tools.subprocess.run') as mock_run:
+            code = ImportSorter().sort_imports(UNFORMATTED)
+            code = CodeFormatter().format_code(code)
+        
+        mock_run.assert_not_called()
+        self.assertEqual(code, 'import os\nimport sys\n\nx = {"a": 1}\n')
+        self.assertTrue(CodeFormatter().check_formatting(code))
+        self.assertTrue(ImportSorter().check_import_sorting(code))
+    
+    def test_mode_and_config_are_shared(self):
+        """Test Mode/Config objects are built once per settings combination."""
+        self.assertIs(CodeFormatter().mode, CodeFormatter().mode)
+        self.assertIs(ImportSorter().config, ImportSorter().config)
+        self.assertIsNot(CodeFormatter(line_length=100).mode, CodeFormatter().mode)
+    
+    def test_invalid_code_raises(self):
+        """Test unparsable code raises CodeQualityError."""
+        with self.assertRaises(CodeQualityError):
+            CodeFormatter().format_code('def broken(:\n')
+        self.assertFalse(CodeFormatter().check_formatting('def broken(:\n'))
+    
+    def test_format_file_rewrites_only_changed_files(self):
+        """Test file formatting in process, with a failure result for invalid code."""
+        path = os.path.join(self.temp_dir, 'module.py')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(UNFORMATTED)
+        
+        self.assertTrue(ImportSorter().sort_file_imports(path))
+        self.assertTrue(CodeFormatter().format_file(path))
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'import os\nimport sys\n\nx = {"a": 1}\n')
+        
+        mtime = os.stat(path).st_mtime_ns
+        self.assertTrue(CodeFormatter().format_file(path))
+        self.assertEqual(os.stat(path).st_mtime_ns, mtime)
+        
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('def broken(:\n')
+        self.assertFalse(CodeFormatter().format_file(path))
+    
+    def test_format_file_writes_atomically(self):
+        """Test a failed write leaves the original file intact."""
+        path = os.path.join(self.temp_dir, 'module.py')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(UNFORMATTED)
+        
+        with patch('core.code_generation.writers.os.replace', side_effect=OSError('disk full')):
+            with self.assertRaises(CodeQualityError):
+                CodeFormatter().format_file(path)
+        
+        with open(path, encoding='utf-8') as f:
+            self.assertEqual(f.read(), UNFORMATTED)
+        self.assertEqual(os.listdir(self.temp_dir), ['module.py'])
+    
+    def test_expired_deadline_stops_in_process_tools(self):
+        """Test an expired request deadline is honoured before formatting."""
+        with deadline_scope(0):
+            with self.assertRaises(DeadlineExceededError):
+                CodeFormatter().format_code(UNFORMATTED)
+            with self.assertRaises(DeadlineExceededError):
+                ImportSorter().sort_imports(UNFORMATTED)
+    
+    def test_falls_back_to_subprocess_without_libraries(self):
+        """Test the command-line tools are used when black/isort cannot be imported."""
+        with patch('core.code_quality.tools.black', None), patch('core.code_quality.tools.isort', None):
+            formatter = CodeFormatter()
+            sorter = ImportSorter()
+        
+        self.assertFalse(formatter.in_process)
+        self.assertFalse(sorter.in_process)
+        with patch('core.code_quality.tools._run_tool') as mock_run:
+            mock_run.return_value.returncode = 0
+            self.assertEqual(formatter.format_code(UNFORMATTED), UNFORMATTED)
+            sorter.sort_imports(UNFORMATTED)
+        
+        self.assertEqual([call.args[0][0] for call in mock_run.call_args_list], ['black', 'isort'])
+
+
+@pytest.mark.skipif(not shutil.which('ruff'), reason='ruff is not installed')
+class TestRuffLinter(TestCase):
+    """Test cases for stdin-based and batched ruff runs."""
+    
+    def setUp(self):
+        self.linter = CodeLinter()
+        self.temp_dir = tempfile.mkdtemp()
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def test_snippets_go_through_stdin(self):
+        """Test lint_code and fix_code pass code on stdin without temporary files."""
+        with patch('core.code_quality.tools.tempfile.NamedTemporaryFile') as mock_temp, \
+                patch('core.code_quality.tools.subprocess.run', wraps=subprocess.run) as mock_run:
+            issues = self.linter.lint_code('print(undefined_name)\n')
+            fixed = self.linter.fix_code('import os\nimport sys\n\nprint(sys)\n')
+        
+        mock_temp.assert_not_called()
+        self.assertEqual([issue['code'] for issue in issues], ['F821'])
+        self.assertEqual(fixed, 'import sys\n\nprint(sys)\n')
+        self.assertIn('--stdin-filename', mock_run.call_args.args[0])
+        self.assertEqual(mock_run.call_args.kwargs['input'], 'import os\nimport sys\n\nprint(sys)\n')
+    
+    def test_fix_and_lint_code_uses_one_process(self):
+        """Test fixed code and remaining issues come from a single ruff run."""
+        with patch('core.code_quality.tools.subprocess.run', wraps=subprocess.run) as mock_run:
+            code, issues = self.linter.fix_and_lint_code('import os\nprint(undefined_name)\n')
+        
+        self.assertEqual(mock_run.call_count, 1)
+        self.assertEqual(code, 'print(undefined_name)\n')
+        self.assertEqual([issue['code'] for issue in issues], ['F821'])
+    
+    def test_batch_of_snippets_uses_one_process(self):
+        """Test lint_many/fix_many map one ruff run's results back to each snippet."""
+        codes = ['import os\n', 'print(1)\n', 'print(undefined_name)\n']
+        
+        with patch('core.code_quality.tools.subprocess.run', wraps=subprocess.run) as mock_run:
+            issues = self.linter.lint_many(codes)
+            fixed = self.linter.fix_many(codes)
+        
+        self.assertEqual(mock_run.call_count, 2)
+        self.assertEqual([[issue['code'] for issue in found] for found in issues], [['F401'], [], ['F821']])
+        self.assertEqual([code for code, _ in fixed], ['', 'print(1)\n', 'print(undefined_name)\n'])
+        self.assertEqual([[issue['code'] for issue in found] for _, found in fixed], [[], [], ['F821']])
+    
+    def test_lint_files_keys_results_by_given_path(self):
+        """Test file batches are chunked and keyed by the paths passed in."""
+        paths = []
+        for index, code in enumerate(['import os\n', 'print(1)\n', 'print(undefined_name)\n']):
+            path = os.path.join(self.temp_dir, f'module_{index}.py')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(code)
+            paths.append(path)
+        
+        with patch.object(CodeLinter, 'MAX_BATCH_FILES', 2), \
+                patch('core.code_quality.tools.subprocess.run', wraps=subprocess.run) as mock_run:
+            issues = self.linter.lint_files(paths)
+            remaining = self.linter.fix_files(paths[:1])
+        
+        self.assertEqual(mock_run.call_count, 3)
+        self.assertEqual({path: [issue['code'] for issue in found] for path, found in issues.items()}, {
+            paths[0]: ['F401'], paths[1]: [], paths[2]: ['F821']
+        })
+        self.assertEqual(remaining, {paths[0]: []})
+        with open(paths[0], encoding='utf-8') as f:
+            self.assertEqual(f.read(), '')
+
+
+class TestDirectoryProcessing(TestCase):
+    """Test cases for parallel, streaming directory processing."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        for rel_path, content in {
+            'app/models.py': 'import sys\nimport os\nprint(os,sys)\n',
+            'app/generated/schema.py': UNFORMATTED,
+            'app/.gitignore': 'generated/\n',
+            'app/notes.txt': 'notes',
+            'scripts/tool.py': 'print(1)\n',
+            'scripts/local_settings.py': 'DEBUG = True\n',
+            '.gitignore': 'local_*.py\n',
+            '.git/hooks/pre-commit.py': 'print(1)\n',
+            'venv/lib/site.py': 'print(1)\n',
+            'node_modules/pkg/index.py': 'print(1)\n',
+            'migrations/0001_initial.py': 'print(1)\n',
+        }.items():
+            path = os.path.join(self.temp_dir, rel_path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(content)
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def _relative(self, paths):
+        return sorted(os.path.relpath(path, self.temp_dir) for path in paths)
+    
+    def test_source_files_skip_excluded_and_gitignored_paths(self):
+        """Test discovery prunes VCS, virtualenvs, excludes and nested .gitignore rules."""
+        self.assertEqual(
+            self._relative(iter_source_files(self.temp_dir, exclude=['migrations'])),
+            ['app/models.py', 'scripts/tool.py']
+        )
+        self.assertEqual(
+            self._relative(iter_source_files(self.temp_dir, respect_gitignore=False)),
+            ['app/generated/schema.py', 'app/models.py', 'migrations/0001_initial.py',
+             'scripts/local_settings.py', 'scripts/tool.py']
+        )
+    
+    def test_results_stream_while_files_are_consumed_lazily(self):
+        """Test results are yielded before the file iterator is exhausted."""
+        consumed = []
+        
+        def paths():
+            for index in range(1000):
+                consumed.append(index)
+                yield f'module_{index}.py'
+        
+        with patch.object(CodeQualityManager, 'process_file', side_effect=lambda path: {'file_path': path}):
+            results = CodeQualityManager().iter_process_files(paths(), max_workers=2)
+            first = [next(results) for _ in range(3)]
+            results.close()
+        
+        self.assertEqual(len(first), 3)
+        self.assertLess(len(consumed), 20)
+    
+    def test_thread_workers_run_under_the_request_deadline(self):
+        """Test the caller's deadline is visible in worker threads."""
+        path = os.path.join(self.temp_dir, 'app', 'models.py')
+        
+        with deadline_scope(0):
+            with self.assertRaises(DeadlineExceededError):
+                list(CodeQualityManager().iter_process_files([path], max_workers=2))
+    
+    @pytest.mark.skipif(not shutil.which('ruff'), reason='ruff is not installed')
+    def test_process_directory_in_worker_processes(self):
+        """Test files are processed in a process pool and results sorted by path."""
+        results = CodeQualityManager().process_directory(self.temp_dir, max_workers=2, use_processes=True)
+        
+        self.assertEqual(self._relative(result['file_path'] for result in results), [
+            'app/models.py', 'migrations/0001_initial.py', 'scripts/tool.py'
+        ])
+        self.assertTrue(all(result['success'] for result in results))
+        self.assertTrue(results[0]['changed'])
+        with open(os.path.join(self.temp_dir, 'app', 'models.py'), encoding='utf-8') as f:
+            self.assertEqual(f.read(), 'import os\nimport sys\n\nprint(os, sys)\n')
+    
+    @pytest.mark.skipif(not shutil.which('ruff'), reason='ruff is not installed')
+    def test_management_command_reports_progress(self):
+        """Test the command prints one progress line per file and a summary."""
+        out = StringIO()
+        
+        call_command(
+            'process_code_quality', self.temp_dir, '--exclude=migrations', '-j', '2', '--timings', stdout=out
+        )
+        
+        output = out.getvalue()
+        self.assertIn('[1/2] ', output)
+        self.assertIn('[2/2] ', output)
+        self.assertIn(f"{os.path.join('app', 'models.py')}: reformatted", output)
+        self.assertIn('2 files processed: 1 reformatted, 0 lint issues, 0 failed', output)
+        self.assertIn('Stage timings: isort ', output)
+
+
+class TestQualityCache(TestCase):
+    """Test cases for the content-hash result cache."""
+    
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = QualityCache(os.path.join(self.temp_dir, 'cache'))
+    
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+    
+    def _manager(self, **kwargs):
+        return CodeQualityManager(cache=self.cache, **kwargs)
+    
+    @staticmethod
+    def _pipeline(code, fix=True, filename=None):
+        result = {'code': 'x = 1\n', 'lint_issues': [], 'timings': {}, 'reused': []}
+        if not fix:
+            result.update(code=code, is_formatted=True, imports_sorted=True)
+        return result
+    
+    def test_unchanged_code_skips_the_tools(self):
+        """Test a second run over the same code is served from the cache."""
+        manager = self._manager()
+        with patch.object(CodeQualityManager, 'run_pipeline', side_effect=self._pipeline) as pipeline:
+            first = manager.process_code('x=1\n')
+            second = manager.process_code('x=1\n')
+            # The processed output is cached too, so re-reading a reformatted file hits
+            third = manager.process_code('x = 1\n')
+            checks = [manager.check_code_quality('x = 1\n') for _ in range(2)]
+        
+        self.assertEqual(first, ('x = 1\n', []))
+        self.assertEqual(second, first)
+        self.assertEqual(third, first)
+        self.assertEqual(checks[0]['quality_score'], 100.0)
+        self.assertEqual(checks[1]['quality_score'], 100.0)
+        self.assertEqual(pipeline.call_count, 2)
+    
+    def test_configuration_changes_the_key(self):
+        """Test line length and ruff configuration are part of the cache key."""
+        config = os.path.join(self.temp_dir, 'ruff.toml')
+        with open(config, 'w', encoding='utf-8') as f:
+            f.write('line-length = 88\n')
+        namespace = self._manager(ruff_config=config).cache_namespace
+        
+        self.assertNotEqual(self._manager(line_length=100, ruff_config=config).cache_namespace, namespace)
+        self.assertEqual(self._manager(ruff_config=config).cache_namespace, namespace)
+        with open(config, 'w', encoding='utf-8') as f:
+            f.write('line-length = 100\n')
+        self.assertNotEqual(self._manager(ruff_config=config).cache_namespace, namespace)
+    
+    @pytest.mark.skipif(not shutil.which('ruff'), reason='ruff is not installed')
+    def test_nested_ruff_config_applies_to_files(self):
+        """Test a file is linted with, and cached under, its closest ruff configuration."""
+        package = os.path.join(self.temp_dir, 'package')
+        os.makedirs(package)
+        path = os.path.join(package, 'module.py')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('print(undefined_name)\n')
+        
+        first = self._manager().process_file(path)
+        with open(os.path.join(package, 'ruff.toml'), 'w', encoding='utf-8') as f:
+            f.write('[lint]\nignore = ["F821"]\n')
+        second = self._manager().process_file(path)
+        
+        self.assertEqual([issue['code'] for issue in first['lint_issues']], ['F821'])
+        self.assertFalse(second['cached'])
+        self.assertEqual(second['lint_issues'], [])
+    
+    def test_shared_cache_is_off_by_default(self):
+        """Test library code does not use the shared cache unless it is enabled."""
+        with self.settings():
+            del settings.CODE_QUALITY_CACHE
+            self.assertIsNone(get_quality_cache())
+            self.assertIsNone(CodeQualityManager().cache)
+    
+    def test_least_recently_used_entries_are_evicted(self):
+        """Test the cache is pruned below its entry limit, oldest entries first."""
+        cache = QualityCache(os.path.join(self.temp_dir, 'bounded'), max_entries=5)
+        for index in range(5):
+            cache.set(f'{index:02d}', {'index': index})
+            os.utime(cache._path(f'{index:02d}'), ns=(index * 10**9, index * 10**9))
+        cache.get('00')
+        
+        cache.set('05', {'index': 5})
+        
+        stats = cache.stats()
+        self.assertEqual(stats['entries'], 4)
+        self.assertEqual(stats['evictions'], 2)
+        self.assertEqual(cache.get('00'), {'index': 0})
+        self.assertIsNone(cache.get('01'))
+        self.assertIsNone(cache.get('02'))
+    
+    def test_disabled_cache_runs_the_tools(self):
+        """Test use_cache=False bypasses the cache."""
+        manager = CodeQualityManager(use_cache=False, cache=self.cache)
+        with patch.object(CodeQualityManager, 'run_pipeline', side_effect=self._pipeline) as pipeline:
+            manager.process_code('x=1\n')
+            manager.process_code('x=1\n')
+        
+        self.assertIsNone(manager.cache)
+        self.assertEqual(pipeline.call_count, 2)
+        self.assertEqual(self.cache.stats()['entries'], 0)
+    
+    @pytest.mark.skipif(not shutil.which('ruff'), reason='ruff is not installed')
+    def test_process_file_reports_cache_hits(self):
+        """Test a reformatted file is a cache hit on the next run."""
+        path = os.path.join(self.temp_dir, 'module.py')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(UNFORMATTED.replace('x =', 'print(os, sys)\nx ='))
+        manager = self._manager()
+        
+        first = manager.process_file(path)
+        second = manager.process_file(path)
+        
+        self.assertTrue(first['changed'])
+        self.assertFalse(first['cached'])
+        self.assertFalse(second['changed'])
+        self.assertTrue(second['cached'])
+    
+    @pytest.mark.skipif(not shutil.which('ruff'), reason='ruff is not installed')
+    def test_management_command_no_cache(self):
+        """Test --no-cache processes files without the cache."""
+        path = os.path.join(self.temp_dir, 'module.py')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('print(1)\n')
+        
+        with self.settings(CODE_QUALITY_CACHE=True), \
+                patch('core.management.commands.process_code_quality.get_quality_cache', return_value=self.cache):
+            out = StringIO()
+            call_command('process_code_quality', self.temp_dir, '--exclude=cache', stdout=out)
+            self.assertIn('(0 from cache)', out.getvalue())
+            out = StringIO()
+            call_command('process_code_quality', self.temp_dir, '--exclude=cache', stdout=out)
+            self.assertIn('(1 from cache)', out.getvalue())
+            out = StringIO()
+            call_command('process_code_quality', self.temp_dir, '--exclude=cache', '--no-cache', stdout=out)
+            self.assertNotIn('from cache', out.getvalue())
+
+
+class TestQualityPipeline(TestCase):
+    """Test cases for the memoized quality pipeline."""
+    
+    CODE = "import sys\nimport os\n\nprint(os, sys)\n"
+    
+    def setUp(self):
+        self.manager = CodeQualityManager(use_cache=False)
+    
+    @pytest.mark.skipif(not shutil.which('ruff'), reason='ruff is not installed')
+    def test_pipeline_matches_the_individual_tools(self):
+        """Test the pipeline gives the same results as running each tool."""
+        expected = self.manager.import_sorter.sort_imports(self.CODE)
+        expected = self.manager.formatter.format_code(expected)
+        expected = self.manager.linter.fix_code(expected)
+        
+        result = self.manager.run_pipeline(self.CODE)
+        check = self.manager.run_pipeline(self.CODE, fix=False)
+        
+        self.assertEqual(result['code'], expected)
+        self.assertEqual(result['lint_issues'], self.manager.linter.lint_code(expected))
+        self.assertEqual(set(result['timings']), {'isort', 'black', 'ruff --fix'})
+        self.assertFalse(check['imports_sorted'])
+        self.assertTrue(check['is_formatted'])
+    
+    def test_fix_reuses_the_check_results(self):
+        """Test a fix after a check of clean code runs no tool again."""
+        with patch.object(self.manager.linter, 'lint_code', return_value=[]) as lint, \
+                patch.object(self.manager.linter, 'fix_and_lint_code') as fix:
+            check = self.manager.run_pipeline('x = 1\n', fix=False)
+            result = self.manager.run_pipeline('x = 1\n')
+        
+        self.assertTrue(check['is_formatted'] and check['imports_sorted'])
+        self.assertEqual(lint.call_count, 1)
+        fix.assert_not_called()
+        self.assertEqual(result['code'], 'x = 1\n')
+        self.assertEqual(result['reused'], ['isort', 'black', 'ruff --fix'])
+        self.assertEqual(result['timings'], {})
+    
+    def test_formatting_stages_are_skipped_on_reuse(self):
+        """Test isort and black run once for a check followed by two fixes of the same code."""
+        with patch.object(self.manager.import_sorter, 'sort_imports', wraps=self.manager.import_sorter.sort_imports) as isort_stage, \
+                patch.object(self.manager.formatter, 'format_code', wraps=self.manager.formatter.format_code) as black_stage, \
+                patch.object(self.manager.linter, 'lint_code', return_value=[]), \
+                patch.object(self.manager.linter, 'fix_and_lint_code', return_value=('x = 1\n', [])) as fix:
+            self.manager.run_pipeline('x=1\n', fix=False)
+            first = self.manager.run_pipeline('x=1\n')
+            second = self.manager.run_pipeline('x=1\n')
+        
+        self.assertEqual(isort_stage.call_count, 1)
+        self.assertEqual(black_stage.call_count, 1)
+        self.assertEqual(fix.call_count, 1)
+        self.assertEqual(first['reused'], ['isort', 'black'])
+        self.assertEqual(set(first['timings']), {'ruff --fix'})
+        self.assertEqual(second['reused'], ['isort', 'black', 'ruff --fix'])
+        self.assertEqual(second['code'], 'x = 1\n')
+    
+    @pytest.mark.skipif(not shutil.which('ruff'), reason='ruff is not installed')
+    def test_remembered_lint_results_follow_config_edits(self):
+        """Test a long-lived manager does not reuse lint results after the ruff configuration changes."""
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        path = os.path.join(temp_dir, 'module.py')
+        code = 'print(undefined_name)\n'
+        
+        before = self.manager.run_pipeline(code, fix=False, filename=path)
+        with open(os.path.join(temp_dir, 'ruff.toml'), 'w', encoding='utf-8') as f:
+            f.write('[lint]\nignore = ["F821"]\n')
+        after = self.manager.run_pipeline(code, fix=False, filename=path)
+        
+        self.assertEqual([issue['code'] for issue in before['lint_issues']], ['F821'])
+        self.assertEqual(after['lint_issues'], [])
+        self.assertNotIn('ruff', after['reused'])
+    
+    def test_fixable_issues_are_not_reused(self):
+        """Test lint results with fixes still go through ruff --fix."""
+        issue = {'code': 'F401', 'fix': {'applicability': 'safe'}}
+        with patch.object(self.manager.linter, 'lint_code', return_value=[issue]), \
+                patch.object(self.manager.linter, 'fix_and_lint_code', return_value=('x = 1\n', [])) as fix:
+            self.manager.run_pipeline('x = 1\n', fix=False)
+            result = self.manager.run_pipeline('x = 1\n')
+        
+        fix.assert_called_once_with('x = 1\n', filename=None)
+        self.assertEqual(result['reused'], ['isort', 'black'])
+    
+    def test_check_reports_rejected_code(self):
+        """Test code the formatters cannot parse is reported as unformatted."""
+        with patch.object(self.manager.linter, 'lint_code', return_value=[]):
+            result = self.manager.check_code_quality('def f(:\n')
+        
+        self.assertFalse(result['is_formatted'])
+        self.assertIn('black', result['timings'])
@@ -28,6 +28,7 @@ from core.error_handling.handlers import (
 from core.error_handling.middleware import (
     ErrorHandlingMiddleware,
     APIErrorHandlingMiddleware,
+    ErrorLogSampler,
     RequestLoggingErrorMiddleware
 )
 
@@ -109,6 +110,55 @@ class TestAntmanBaseException(TestCase):
         self.assertEqual(error.limit, 100)
         self.assertEqual(error.retry_after, 1800)
 
+    def test_details_and_timestamp_are_lazy(self):
+        """Test details and timestamp are only materialized on access."""
+        error = AntmanValidationError("Invalid value")
+        
+        self.assertIsNone(error._details)
+        self.assertIsNone(error._timestamp)
+        self.assertEqual(error.details, {})
+        self.assertIsNotNone(error.timestamp)
+        self.assertIs(error.timestamp, error.timestamp)
+    
+    def test_to_dict_includes_subclass_fields(self):
+        """Test to_dict appends declared fields that hold a value."""
+        data = ResourceNotFoundError("User not found", resource_type="User", resource_id=0).to_dict()
+        
+        self.assertEqual(data['error_code'], "RESOURCE_NOT_FOUND")
+        self.assertEqual(data['details'], {})
+        self.assertEqual(data['resource_type'], "User")
+        self.assertEqual(data['resource_id'], 0)
+        self.assertNotIn('field_errors', AntmanValidationError("Invalid").to_dict())
+    
+    def test_to_dict_does_not_allocate_lazy_dicts(self):
+        """Test to_dict leaves unset details and field errors unallocated."""
+        error = AntmanValidationError("Invalid")
+        
+        data = error.to_dict()
+        
+        self.assertIsNone(error._details)
+        self.assertIsNone(error._field_errors)
+        self.assertEqual(data['details'], {})
+        self.assertEqual(RateLimitExceededError().status_code, 429)
+    
+    def test_legacy_base_attributes(self):
+        """Test the former base class API is kept as deprecated aliases."""
+        with self.assertWarns(DeprecationWarning):
+            error = AntmanBaseException("Failed", code="LEGACY", extra_data={'id': 1})
+        
+        self.assertEqual(error.code, "LEGACY")
+        self.assertEqual(error.error_code, "LEGACY")
+        self.assertEqual(error.extra_data, {'id': 1})
+        data = error.to_dict()
+        self.assertIs(data['error'], True)
+        self.assertEqual(data['details'], {'id': 1})
+    
+    def test_base_module_exports_unified_class(self):
+        """Test the legacy base module points at the unified hierarchy."""
+        from core.error_handling import base
+        
+        self.assertIs(base.AntmanBaseException, AntmanBaseException)
+
 
 class TestErrorHandlers(TestCase):
     """Test cases for error handler classes."""
@@ -202,6 +252,76 @@ class TestRequestLoggingMiddleware(TestCase):
         self.assertIn('/api/test/', call_args)
 
 
+class TestRequestLoggingErrorCapture(TestCase):
+    """Test cases for the bounded capture policy of RequestLoggingErrorMiddleware."""
+    
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.middleware = RequestLoggingErrorMiddleware(get_response=MagicMock())
+    
+    def _raise(self, message="boom"):
+        try:
+            raise ValueError(message)
+        except ValueError as e:
+            return e
+    
+    @patch('core.error_handling.middleware.logger')
+    def test_captures_only_allowlisted_headers(self, mock_logger):
+        """Test sensitive and unlisted headers are not copied."""
+        request = self.factory.get('/api/test/', HTTP_AUTHORIZATION='secret', HTTP_X_REQUEST_ID='abc')
+        
+        self.middleware.process_exception(request, self._raise())
+        
+        request_data = mock_logger.error.call_args[1]['extra']['request_data']
+        self.assertEqual(request_data['headers'], {'x-request-id': 'abc'})
+    
+    @override_settings(ERROR_LOG_BODY_BYTES=8)
+    @patch('core.error_handling.middleware.logger')
+    def test_logs_prefix_of_loaded_body(self, mock_logger):
+        """Test only the configured prefix of a loaded body is logged."""
+        middleware = RequestLoggingErrorMiddleware(get_response=MagicMock())
+        request = self.factory.post('/api/test/', data=b'x' * 10000, content_type='text/plain')
+        request.body
+        
+        middleware.process_exception(request, self._raise())
+        
+        request_data = mock_logger.error.call_args[1]['extra']['request_data']
+        self.assertEqual(request_data['body'], 'x' * 8)
+    
+    @patch('core.error_handling.middleware.logger')
+    def test_body_stays_readable_after_logging(self, mock_logger):
+        """Test logging an exception does not consume an unread request body."""
+        request = self.factory.post('/api/test/', data=b'{"name": "x"}', content_type='application/json')
+        
+        self.middleware.process_exception(request, self._raise())
+        
+        request_data = mock_logger.error.call_args[1]['extra']['request_data']
+        self.assertEqual(request_data['body'], '<body not loaded>')
+        self.assertEqual(request.body, b'{"name": "x"}')
+    
+    @override_settings(ERROR_LOG_SAMPLE_LIMIT=2)
+    @patch('core.error_handling.middleware.logger')
+    def test_samples_repeated_fingerprints(self, mock_logger):
+        """Test repeated exceptions from one location are sampled."""
+        middleware = RequestLoggingErrorMiddleware(get_response=MagicMock())
+        
+        for _ in range(5):
+            middleware.process_exception(self.factory.get('/'), self._raise())
+        
+        self.assertEqual(mock_logger.error.call_count, 2)
+    
+    def test_sampler_reports_suppressed_count(self):
+        """Test suppressed occurrences are reported when the window rolls over."""
+        now = [0.0]
+        sampler = ErrorLogSampler(window=10, limit=1, clock=lambda: now[0])
+        
+        self.assertEqual(sampler.sample('fp'), (True, 0))
+        self.assertEqual(sampler.sample('fp'), (False, 0))
+        self.assertEqual(sampler.sample('fp'), (False, 0))
+        now[0] = 10
+        self.assertEqual(sampler.sample('fp'), (True, 2))
+
+
 class TestAPIErrorHandlingMiddleware(TestCase):
     """Test cases for API error handling middleware."""
     
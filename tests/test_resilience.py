@@ -0,0 +1,539 @@
+"""
+Tests for circuit breakers, bulkheads, outbound HTTP and request deadlines.
+"""
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import httpx
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from core.error_handling.exceptions import ExternalServiceError, ValidationError
+from core.middleware.deadline import DeadlineMiddleware
+from core.resilience.circuit_breaker import (
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    circuit_breaker,
+    circuit_breakers
+)
+from core.resilience.deadline import (
+    Deadline,
+    deadline_scope,
+    get_current_deadline,
+    install_query_deadline_guard,
+    remaining_timeout
+)
+from core.resilience.exceptions import BulkheadFullError, CircuitOpenError, DeadlineExceededError
+from core.resilience.http_client import OutboundHTTPClient, RetryPolicy
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Minimal HTTP handler standing in for an external dependency."""
+
+    def do_GET(self):
+        self.send_response(200)
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer:
+    """Local HTTP server that can be stopped to simulate an outage."""
+
+    def __init__(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+        self.port = self.server.server_address[1]
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.running = True
+
+    def stop(self):
+        if self.running:
+            self.server.shutdown()
+            self.server.server_close()
+            self.running = False
+
+
+def fetch(port):
+    """Open a raw connection to the stand-in server and read the response."""
+    with socket.create_connection(('127.0.0.1', port), timeout=1) as conn:
+        conn.sendall(b'GET / HTTP/1.0\r\n\r\n')
+        return conn.recv(1024)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCircuitBreaker(TestCase):
+    """Test cases for CircuitBreaker state transitions."""
+
+    def setUp(self):
+        self.server = StandInServer()
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(
+            'stand-in',
+            failure_rate_threshold=0.5,
+            minimum_calls=4,
+            window_size=4,
+            reset_timeout=10,
+            clock=self.clock
+        )
+
+    def tearDown(self):
+        self.server.stop()
+
+    def test_successful_calls_keep_circuit_closed(self):
+        """Test calls to a healthy target pass through."""
+        for _ in range(5):
+            self.assertIn(b'200', self.breaker.call(fetch, self.server.port))
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_opens_after_failure_rate_exceeded_and_fails_fast(self):
+        """Test the circuit opens once the target is down."""
+        port = self.server.port
+        self.breaker.call(fetch, port)
+        self.breaker.call(fetch, port)
+        self.server.stop()
+
+        for _ in range(2):
+            with self.assertRaises(ConnectionError):
+                self.breaker.call(fetch, port)
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+        with self.assertRaises(CircuitOpenError) as ctx:
+            self.breaker.call(fetch, port)
+        self.assertIsInstance(ctx.exception, ExternalServiceError)
+        self.assertEqual(ctx.exception.service_name, 'stand-in')
+        self.assertEqual(ctx.exception.retry_after, 10)
+
+    def test_half_open_trial_closes_circuit(self):
+        """Test a successful trial call after the reset timeout closes the circuit."""
+        for _ in range(4):
+            with self.assertRaises(TimeoutError):
+                self.breaker.call(self._timeout)
+
+        self.clock.now = 10
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+
+        self.breaker.call(fetch, self.server.port)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_half_open_trial_failure_reopens_circuit(self):
+        """Test a failed trial call re-opens the circuit."""
+        for _ in range(4):
+            with self.assertRaises(TimeoutError):
+                self.breaker.call(self._timeout)
+
+        self.clock.now = 10
+        with self.assertRaises(TimeoutError):
+            self.breaker.call(self._timeout)
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.OPEN)
+
+    def test_unrelated_errors_do_not_trip(self):
+        """Test application errors are not counted as target failures."""
+        for _ in range(6):
+            with self.assertRaises(ValidationError):
+                self.breaker.call(self._invalid)
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(self.breaker.snapshot()['failures'], 0)
+
+    def test_stale_call_does_not_decide_half_open_state(self):
+        """Test a slow call admitted while closed is ignored after the circuit trips."""
+        slow = self.breaker.guard()
+        slow.__enter__()
+        for _ in range(4):
+            with self.assertRaises(TimeoutError):
+                self.breaker.call(self._timeout)
+        self.clock.now = 10
+        trial = self.breaker.guard()
+        trial.__enter__()
+
+        # The slow call finishes during the half-open trial
+        slow.__exit__(None, None, None)
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.HALF_OPEN)
+        with self.assertRaises(CircuitOpenError):
+            self.breaker.call(fetch, self.server.port)
+        trial.__exit__(None, None, None)
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    def test_nested_rejections_are_not_failures(self):
+        """Test CircuitOpenError and BulkheadFullError from a nested breaker do not trip."""
+        def rejected():
+            raise CircuitOpenError("nested circuit open", service_name='nested')
+
+        for _ in range(6):
+            with self.assertRaises(CircuitOpenError):
+                self.breaker.call(rejected)
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(self.breaker.snapshot()['calls'], 0)
+
+    def test_expired_deadline_is_not_a_failure(self):
+        """Test the caller's DeadlineExceededError does not count against the target."""
+        def expired():
+            raise DeadlineExceededError("request budget exhausted")
+
+        for _ in range(6):
+            with self.assertRaises(DeadlineExceededError):
+                self.breaker.call(expired)
+
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(self.breaker.snapshot()['failures'], 0)
+
+    def _timeout(self):
+        raise TimeoutError("timed out")
+
+    def _invalid(self):
+        raise ValidationError("bad input")
+
+
+class TestBulkhead(TestCase):
+    """Test cases for the per-target concurrency bulkhead."""
+
+    def test_rejects_calls_over_limit(self):
+        """Test calls beyond max_concurrent fail fast."""
+        breaker = CircuitBreaker('bulkhead', max_concurrent=2)
+        started = threading.Barrier(3)
+        release = threading.Event()
+
+        def slow_call():
+            started.wait()
+            release.wait(timeout=5)
+
+        workers = [threading.Thread(target=breaker.call, args=(slow_call,)) for _ in range(2)]
+        for worker in workers:
+            worker.start()
+        started.wait()
+
+        with self.assertRaises(BulkheadFullError) as ctx:
+            breaker.call(lambda: None)
+        self.assertEqual(ctx.exception.max_concurrent, 2)
+
+        release.set()
+        for worker in workers:
+            worker.join()
+        self.assertIsNone(breaker.call(lambda: None))
+
+
+class TestCircuitBreakerRegistry(TestCase):
+    """Test cases for the shared breaker registry."""
+
+    def tearDown(self):
+        circuit_breakers.clear()
+
+    def test_same_breaker_shared_across_threads(self):
+        """Test every thread receives the same breaker for a target."""
+        registry = CircuitBreakerRegistry()
+        results = []
+
+        def lookup():
+            results.append(registry.get('gitlab'))
+
+        threads = [threading.Thread(target=lookup) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len({id(breaker) for breaker in results}), 1)
+
+    @override_settings(CIRCUIT_BREAKERS={'gitlab': {'reset_timeout': 5, 'max_concurrent': 3}})
+    def test_settings_configure_breaker(self):
+        """Test per-target options are read from settings."""
+        breaker = circuit_breakers.get('gitlab')
+
+        self.assertEqual(breaker.reset_timeout, 5)
+        self.assertEqual(breaker.max_concurrent, 3)
+
+    def test_decorator_uses_shared_breaker(self):
+        """Test the decorator routes calls through the registry."""
+        @circuit_breaker('website', minimum_calls=1, window_size=1)
+        def ping():
+            raise ConnectionError("refused")
+
+        with self.assertRaises(ConnectionError):
+            ping()
+        with self.assertRaises(CircuitOpenError):
+            ping()
+        self.assertEqual(circuit_breakers.snapshot()['website']['state'], CircuitBreaker.OPEN)
+
+
+class TestOutboundHTTPClient(TestCase):
+    """Test cases for the shared outbound HTTP client."""
+
+    def _client(self, handler, **kwargs):
+        kwargs.setdefault('sleep', self.delays.append)
+        client = OutboundHTTPClient(transport=httpx.MockTransport(handler), **kwargs)
+        self.addCleanup(client.close)
+        return client
+
+    def setUp(self):
+        self.delays = []
+
+    def tearDown(self):
+        circuit_breakers.clear()
+
+    def test_retries_idempotent_request_on_retryable_status(self):
+        """Test GET is retried with backoff until it succeeds."""
+        statuses = [503, 502, 200]
+
+        def handler(request):
+            return httpx.Response(statuses.pop(0))
+
+        response = self._client(handler).get('http://gitlab.local/api/v4/projects')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(self.delays), 2)
+        self.assertTrue(all(delay <= 2.0 for delay in self.delays))
+
+    def test_does_not_retry_non_idempotent_request(self):
+        """Test POST is not retried and gets the retryable response back with its body."""
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(503, json={'message': 'maintenance'})
+
+        response = self._client(handler).post('http://gitlab.local/api/v4/projects')
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.json(), {'message': 'maintenance'})
+
+    def test_bulkhead_rejection_is_not_retried(self):
+        """Test a full bulkhead is raised at once instead of being retried."""
+        breaker = circuit_breakers.get('gitlab', max_concurrent=1)
+        calls = []
+
+        def handler(request):
+            calls.append(request)
+            return httpx.Response(200)
+
+        with breaker.guard():
+            with self.assertRaises(BulkheadFullError):
+                self._client(handler).get('http://gitlab.local/api/v4/projects', service_name='gitlab')
+
+        self.assertEqual(calls, [])
+        self.assertEqual(self.delays, [])
+
+    def test_timeout_maps_to_timeout_error(self):
+        """Test a final timeout is raised as TimeoutError."""
+        def handler(request):
+            raise httpx.ReadTimeout("timed out", request=request)
+
+        with self.assertRaises(TimeoutError):
+            self._client(handler).get('http://db-docs.local/')
+
+        self.assertEqual(len(self.delays), 2)
+
+    def test_connection_error_maps_to_external_service_error(self):
+        """Test transport errors are raised as ExternalServiceError."""
+        def handler(request):
+            raise httpx.ConnectError("refused", request=request)
+
+        client = self._client(handler, retry_policy=RetryPolicy(max_attempts=1))
+        with self.assertRaises(ExternalServiceError) as ctx:
+            client.get('http://website.local/')
+
+        self.assertEqual(ctx.exception.service_name, 'website.local')
+
+    def test_retry_budget_limits_retries(self):
+        """Test retries stop once the host's budget is spent."""
+        def handler(request):
+            return httpx.Response(503)
+
+        client = self._client(handler, retry_policy=RetryPolicy(max_attempts=5))
+        client._budget_for('flaky.local')._tokens = 1
+
+        with self.assertRaises(ExternalServiceError):
+            client.get('http://flaky.local/')
+
+        self.assertEqual(len(self.delays), 1)
+
+    def test_hedged_request_uses_faster_mirror(self):
+        """Test a slow primary is hedged to a mirror and the first response wins."""
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def handler(request):
+            if request.url.host == 'slow.local':
+                release.wait(timeout=5)
+            return httpx.Response(200, text=request.url.host)
+
+        client = self._client(handler, hedge_after=0.05)
+        response = client.get('http://slow.local/archive', mirrors=['http://mirror.local/archive'])
+
+        self.assertEqual(response.text, 'mirror.local')
+
+    def test_pools_one_client_per_host(self):
+        """Test clients are reused per host."""
+        client = self._client(lambda request: httpx.Response(200))
+
+        first = client._client_for(httpx.URL('http://gitlab.local/a'))
+        second = client._client_for(httpx.URL('http://gitlab.local/b'))
+        other = client._client_for(httpx.URL('http://website.local/'))
+
+        self.assertIs(first, second)
+        self.assertIsNot(first, other)
+
+    def test_circuit_breaker_guards_attempts(self):
+        """Test failures open the named circuit and later calls fail fast."""
+        circuit_breakers.get('gitlab', minimum_calls=2, window_size=2)
+
+        def handler(request):
+            return httpx.Response(503)
+
+        client = self._client(handler)
+        with self.assertRaises(ExternalServiceError):
+            client.get('http://gitlab.local/', service_name='gitlab')
+        with self.assertRaises(CircuitOpenError):
+            client.get('http://gitlab.local/', service_name='gitlab')
+
+
+class TestDeadline(TestCase):
+    """Test cases for request deadlines."""
+
+    def test_remaining_budget_and_expiry(self):
+        """Test a deadline reports its remaining budget and raises once expired."""
+        clock = FakeClock()
+        deadline = Deadline(5, clock=clock)
+
+        self.assertEqual(deadline.timeout_for(10), 5)
+        self.assertEqual(deadline.timeout_for(2), 2)
+        clock.now = 5
+        self.assertTrue(deadline.expired)
+        with self.assertRaises(DeadlineExceededError):
+            deadline.check('query')
+
+    def test_remaining_timeout_without_deadline(self):
+        """Test callers keep their own timeout when no deadline is active."""
+        self.assertIsNone(get_current_deadline())
+        self.assertEqual(remaining_timeout(10), 10)
+
+    def test_scope_only_tightens_budget(self):
+        """Test nested scopes keep the earlier expiry."""
+        with deadline_scope(1) as outer:
+            with deadline_scope(60) as inner:
+                self.assertIs(inner, outer)
+                self.assertLessEqual(remaining_timeout(30), 1)
+        self.assertIsNone(get_current_deadline())
+
+    def test_database_queries_refused_after_deadline(self):
+        """Test the execute wrapper stops queries once the deadline has passed."""
+        install_query_deadline_guard()
+
+        with deadline_scope(0):
+            with self.assertRaises(DeadlineExceededError):
+                with connection.cursor() as cursor:
+                    cursor.execute("SELECT 1")
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+            self.assertEqual(cursor.fetchone(), (1,))
+
+    def test_outbound_timeout_capped_by_deadline(self):
+        """Test outbound requests use the remaining budget as their timeout."""
+        seen = []
+
+        def handler(request):
+            seen.append(request.extensions['timeout']['read'])
+            return httpx.Response(200)
+
+        client = OutboundHTTPClient(timeout=10, transport=httpx.MockTransport(handler))
+        self.addCleanup(client.close)
+        with deadline_scope(2):
+            client.get('http://gitlab.local/')
+
+        self.assertLessEqual(seen[0], 2)
+
+    def test_outbound_request_not_started_after_deadline(self):
+        """Test an expired deadline cancels the outbound call."""
+        client = OutboundHTTPClient(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+        self.addCleanup(client.close)
+
+        with deadline_scope(0):
+            with self.assertRaises(DeadlineExceededError):
+                client.get('http://gitlab.local/')
+
+
+@override_settings(REQUEST_DEADLINE_SECONDS=30, REQUEST_DEADLINE_ROUTES={'/api/reports/': 120})
+class TestDeadlineMiddleware(TestCase):
+    """Test cases for DeadlineMiddleware."""
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def _run(self, request, view):
+        middleware = DeadlineMiddleware(view)
+        return middleware(request)
+
+    def test_route_policy_and_header(self):
+        """Test the route policy applies and the client header can shorten it."""
+        middleware = DeadlineMiddleware(lambda request: HttpResponse())
+
+        self.assertEqual(middleware._resolve_timeout(self.factory.get('/api/reports/1/')), 120)
+        self.assertEqual(middleware._resolve_timeout(self.factory.get('/api/users/')), 30)
+        request = self.factory.get('/api/reports/1/', HTTP_X_REQUEST_TIMEOUT='4.5')
+        self.assertEqual(middleware._resolve_timeout(request), 4.5)
+
+    def test_deadline_exposed_to_view_and_cleared(self):
+        """Test the view sees the deadline through the request and context."""
+        seen = {}
+
+        def view(request):
+            seen['request'] = request.deadline
+            seen['context'] = get_current_deadline()
+            return HttpResponse()
+
+        self._run(self.factory.get('/api/users/'), view)
+
+        self.assertIs(seen['request'], seen['context'])
+        self.assertIsNone(get_current_deadline())
+
+    def test_response_middleware_runs_after_the_deadline(self):
+        """Test outer middleware can still query the database once the budget has expired."""
+        install_query_deadline_guard()
+
+        def view(request):
+            request.deadline.expires_at = 0
+            return HttpResponse('done')
+
+        def save_session(request):
+            response = DeadlineMiddleware(view)(request)
+            # Like SessionMiddleware.process_response saving the session
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+            return response
+
+        response = save_session(self.factory.get('/api/users/'))
+
+        self.assertEqual(response.content, b'done')
+        self.assertGreater(
+            settings.MIDDLEWARE.index('core.middleware.deadline.DeadlineMiddleware'),
+            settings.MIDDLEWARE.index('django.contrib.sessions.middleware.SessionMiddleware')
+        )
+
+    def test_deadline_exceeded_renders_timeout_response(self):
+        """Test cooperative cancellation surfaces as the timeout error response."""
+        middleware = DeadlineMiddleware(lambda request: HttpResponse())
+        request = self.factory.get('/api/users/')
+
+        response = middleware.process_exception(request, DeadlineExceededError(timeout=30))
+
+        self.assertEqual(response.status_code, 502)
+        self.assertIn('Operation timed out', response.content.decode())